@@ -1,5 +1,4 @@
 import os
-from google import genai
 from dotenv import load_dotenv
 
 # Load environment variables explicitly
@@ -12,13 +11,18 @@ class AIClient:
     @classmethod
     def get_client(cls):
         if cls._instance is None:
+            # google.genai takes ~0.5 s to import, so it is only loaded when a client is first needed
+            from google import genai
             api_key = os.getenv("GEMINI_API_KEY")
+            # Point the SDK at another endpoint (e.g. the load-test fake) instead of Google's API
+            base_url = os.getenv("GEMINI_BASE_URL")
             
             # Debugging
             if api_key:
                 print(f"DEBUG: AI Client loading key... Found key length: {len(api_key)}")
                 try:
-                    cls.client = genai.Client(api_key=api_key)
+                    http_options = {"base_url": base_url} if base_url else None
+                    cls.client = genai.Client(api_key=api_key, http_options=http_options)
                     print("DEBUG: Gemini Client Initialized Globally")
                 except Exception as e:
                     print(f"CRITICAL: Failed to initialize Gemini Client: {e}")
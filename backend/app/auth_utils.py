@@ -1,11 +1,15 @@
-from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timedelta
+import asyncio
 from typing import Optional
-from jose import JWTError, jwt
+from jose import JWTError  # jose.jwt (~50 ms to import) is loaded on first use
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import os
 from dotenv import load_dotenv
+from .utils.ttl_cache import TTLCache
+from .utils.metrics import register_cache
 
 load_dotenv()
 
@@ -14,14 +18,59 @@ SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey") # Change this in producti
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Resolved users keyed by token subject, so most requests skip the users lookup
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 10000))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 60))
+# When enabled, tokens carrying a "uid" claim are trusted without any DB read. A deleted
+# user then stays authenticated until the token expires (ACCESS_TOKEN_EXPIRE_MINUTES).
+AUTH_TRUST_TOKEN_CLAIMS = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+
+principal_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+register_cache("auth_principals", principal_cache)
+
+# Argon2 cost parameters (defaults match passlib's). Existing hashes are upgraded on login
+# when these change.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 3))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 65536))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 4))
+# Hashing threads per worker; argon2-cffi releases the GIL, so these run truly in parallel
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """passlib and its argon2 backend are loaded on first use, not at import."""
+    from passlib.context import CryptContext
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__time_cost=ARGON2_TIME_COST,
+        argon2__memory_cost=ARGON2_MEMORY_COST,
+        argon2__parallelism=ARGON2_PARALLELISM,
+    )
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="argon2")
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+async def run_password_task(fn, *args):
+    """Runs a slow, memory-hard hashing call on the bounded executor instead of the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+
+async def hash_password_async(password: str) -> str:
+    return await run_password_task(get_pwd_context().hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str):
+    """
+    Returns (is_valid, new_hash). `new_hash` is set when the stored hash was made with
+    outdated argon2 parameters and should replace it.
+    """
+    return await run_password_task(get_pwd_context().verify_and_update, plain_password, hashed_password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -30,9 +79,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def invalidate_cached_user(email: str):
+    """Call after any change to a User so the next request re-reads it."""
+    principal_cache.invalidate(email)
+
+def user_from_claims(payload: dict):
+    """Lightweight User built from token claims (id + email only, never saved)."""
+    from beanie import PydanticObjectId
+    from .models import User
+    return User.model_construct(id=PydanticObjectId(payload["uid"]), email=payload["sub"], password_hash="")
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,6 +100,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
+        from jose import jwt
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
@@ -47,10 +108,40 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
     
+    cached = principal_cache.get(email)
+    if cached is not None:
+        return cached
+    
+    if AUTH_TRUST_TOKEN_CLAIMS and payload.get("uid"):
+        user = user_from_claims(payload)
+        principal_cache.set(email, user)
+        return user
+    
     # We need to import User here to avoid circular imports? No, utils is leaf.
     # But User is in models. Let's import inside or ensure models don't import utils.
     from .models import User
     user = await User.find_one(User.email == email)
     if user is None:
         raise credentials_exception
+    principal_cache.set(email, user)
     return user
+
+# Comma-separated emails allowed to use the /admin endpoints and request profiling
+ADMIN_EMAILS = {e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()}
+
+def is_admin_token(authorization: Optional[str]) -> bool:
+    """True for an "Authorization: Bearer <token>" header carrying a valid admin token."""
+    if not ADMIN_EMAILS or not authorization or not authorization.startswith("Bearer "):
+        return False
+    try:
+        from jose import jwt
+        payload = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return False
+    return (payload.get("sub") or "").lower() in ADMIN_EMAILS
+
+async def get_current_admin(current_user = Depends(get_current_user)):
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
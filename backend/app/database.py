@@ -1,14 +1,47 @@
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
+from pymongo.errors import OperationFailure
+from .utils.metrics import MongoCommandListener
 # We will import models inside the init function or at top level if they don't import database
 # Models are defined in models.py.
 # To avoid circular imports, models.py should NOT import from database.py anymore.
 
-async def init_db():
-    # Import models here to avoid circular imports if models import anything from here (they shouldn't now)
-    from .models import Profile, JobApplication, User
-    
+# Drop indexes that are no longer declared in a model's Settings. Off by default: it also
+# drops any index created by hand (migrate_indexes.py drops the superseded ones explicitly)
+MONGO_ALLOW_INDEX_DROPPING = os.getenv("MONGO_ALLOW_INDEX_DROPPING", "false").lower() in ("1", "true", "yes")
+
+# Index builds that fail on existing data: duplicate keys, or an older index on the same keys
+INDEX_BUILD_ERRORS = {11000: "DuplicateKey", 85: "IndexOptionsConflict", 86: "IndexKeySpecsConflict"}
+
+
+def get_database():
     mongo_url = os.getenv("MONGODB_URI") or os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-    client = AsyncIOMotorClient(mongo_url)
-    await init_beanie(database=client.career_agent, document_models=[Profile, JobApplication, User])
\ No newline at end of file
+    db_name = os.getenv("MONGODB_DB", "career_agent")
+    client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandListener()])
+    return client[db_name]
+
+
+def document_models():
+    # Import models here to avoid circular imports if models import anything from here (they shouldn't now)
+    from .models import Profile, JobApplication, User, OutboxEmail
+    return [Profile, JobApplication, User, OutboxEmail]
+
+
+async def init_db():
+    database = get_database()
+    # Creates the indexes declared in each model's Settings. On a database that predates
+    # the unique indexes (duplicate applications or emails), the build fails: start without
+    # building indexes rather than not at all, until migrate_indexes.py has been run.
+    try:
+        await init_beanie(
+            database=database,
+            document_models=document_models(),
+            allow_index_dropping=MONGO_ALLOW_INDEX_DROPPING
+        )
+    except OperationFailure as e:
+        if e.code not in INDEX_BUILD_ERRORS:
+            raise
+        print(f"DEBUG: Index build failed ({INDEX_BUILD_ERRORS[e.code]}: {e}). "
+              f"Starting without index checks; run `python migrate_indexes.py` to fix the data.")
+        await init_beanie(database=database, document_models=document_models(), skip_indexes=True)
@@ -1,19 +1,48 @@
-from fastapi import FastAPI
+import os
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 from .database import init_db
-from app.routes import auth, profile, roadmap, jobs, apply, resume
+from .services.job_source import JobSourceClient
+from .services.job_index import job_index, job_ingestor
+from .services.pdf_extractor import PDF_UPLOAD_MAX_BODY, PDFPool
+from .services.email_service import email_outbox
+from .services.warmup import start_warmup
+from .utils.metrics import MetricsMiddleware, loop_lag_monitor, registry
+from .utils.tracing import TracingMiddleware
+from .utils.body_limit import BodySizeLimitMiddleware
+from .auth_utils import is_admin_token
+from app.routes import auth, profile, roadmap, jobs, apply, resume, admin
 
 load_dotenv()
 
+# When set, /metrics requires "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    loop_lag_monitor.start()
     await init_db()
+    job_index.load()
+    job_ingestor.start()
+    email_outbox.start()
+    warmup_task = await start_warmup()
     yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await email_outbox.stop()
+    await job_ingestor.stop()
+    await JobSourceClient.close()
+    PDFPool.shutdown()
+    await loop_lag_monitor.stop()
 
 app = FastAPI(lifespan=lifespan)
 
+# Oversized resume uploads are refused before Starlette buffers the multipart body
+app.add_middleware(BodySizeLimitMiddleware, limits={"/resume/analyze": PDF_UPLOAD_MAX_BODY})
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -21,6 +50,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(TracingMiddleware, is_admin=is_admin_token)
+# Outermost, so latency covers CORS handling and the full (possibly streamed) response
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router)
 app.include_router(resume.router)
@@ -28,4 +60,11 @@ app.include_router(resume.router)
 app.include_router(roadmap.router)
 app.include_router(profile.router)
 app.include_router(jobs.router)
-app.include_router(apply.router)
\ No newline at end of file
+app.include_router(apply.router)
+app.include_router(admin.router)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,7 +1,8 @@
 from typing import List, Optional, Dict, Any
-from beanie import Document, PydanticObjectId 
+from beanie import Document, PydanticObjectId, after_event, Save, Replace, Update, SaveChanges, Delete
 from pydantic import BaseModel, Field, EmailStr
 from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class User(Document):
     email: EmailStr
@@ -13,7 +14,15 @@ class User(Document):
 
     class Settings:
         name = "users"
-        indexes = ["email"]
+        indexes = [
+            IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        ]
+
+    @after_event(Save, Replace, Update, SaveChanges, Delete)
+    def invalidate_principal_cache(self):
+        # Cached principals must not outlive a change to the user
+        from .auth_utils import invalidate_cached_user
+        invalidate_cached_user(self.email)
 
 class Profile(Document):
     user_id: Optional[PydanticObjectId] = None
@@ -30,6 +39,10 @@ class Profile(Document):
 
     class Settings:
         name = "profiles"
+        indexes = [
+            # /profile/me, /profile/save and /apply/* all look profiles up by user
+            IndexModel([("user_id", ASCENDING)], name="user_id"),
+        ]
 
 class JobApplication(Document):
     user_id: Optional[PydanticObjectId] = None
@@ -39,4 +52,41 @@ class JobApplication(Document):
     applied_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Settings:
-        name = "job_applications"
\ No newline at end of file
+        name = "job_applications"
+        indexes = [
+            # Rejects duplicate applications server-side, even from concurrent requests
+            IndexModel([("user_id", ASCENDING), ("job_id", ASCENDING)], unique=True, name="user_job_unique"),
+            # /apply/status pages through a user's applications newest first
+            IndexModel([("user_id", ASCENDING), ("applied_at", DESCENDING), ("_id", DESCENDING)], name="user_applied_at"),
+        ]
+
+class ApplicationStatusView(BaseModel):
+    """Projection of JobApplication used by /apply/status (only the fields it returns)."""
+    id: PydanticObjectId = Field(alias="_id")
+    job_id: Any
+    status: str
+    applied_at: datetime
+
+class OutboxEmail(Document):
+    to: str
+    subject: str
+    body: str
+    user_id: Optional[PydanticObjectId] = None
+    profile_id: Optional[PydanticObjectId] = None
+    job_id: Any = None
+    status: str = "queued"  # queued -> sending -> sent | failed
+    attempts: int = 0
+    last_error: Optional[str] = None
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    claimed_at: Optional[datetime] = None
+    claim_token: Optional[str] = None  # set by the sender that holds the claim
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
+
+    class Settings:
+        name = "email_outbox"
+        indexes = [
+            # The sender polls for due messages by status and time
+            IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt"),
+        ]
+
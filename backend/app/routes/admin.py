@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from ..models import User
+from ..auth_utils import get_current_admin
+from ..utils.tracing import get_trace, recent_traces
+from ..utils.profiler import get_profile
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.get("/traces")
+async def list_traces(limit: int = 50, min_duration_ms: float = 0, admin: User = Depends(get_current_admin)):
+    """Most recent sampled traces first, optionally only the slow ones."""
+    return recent_traces(limit=limit, min_duration_ms=min_duration_ms)
+
+@router.get("/traces/{trace_id}")
+async def read_trace(trace_id: str, admin: User = Depends(get_current_admin)):
+    trace = get_trace(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found (not sampled, or already evicted)")
+    return trace.to_dict()
+
+@router.get("/profiles/{profile_id}")
+async def read_profile(profile_id: str, format: str = "collapsed", admin: User = Depends(get_current_admin)):
+    """
+    Profile of one request sent with "X-Profile: 1" by an admin. format=collapsed returns
+    folded stacks for flamegraph.pl / speedscope; format=json returns them structured.
+    """
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "json":
+        return profile.to_dict()
+    return PlainTextResponse(profile.collapsed())
@@ -1,16 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from typing import List, Any
+from typing import List, Any, Optional, Union
 from datetime import datetime
-from ..models import JobApplication, Profile, User
-from ..services.email_service import send_job_application_email
+import base64
+import json
+from ..models import JobApplication, Profile, User, ApplicationStatusView
+from ..services.email_service import build_application_email, email_configured, email_outbox
 from ..auth_utils import get_current_user
 from beanie import PydanticObjectId
+from beanie.operators import In
+from beanie.operators import Or, And
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+DUPLICATE_KEY_ERROR = 11000
+STATUS_PAGE_SIZE = 100
+STATUS_MAX_PAGE_SIZE = 500
+# Application statuses that mean an email was already queued or sent for it
+EMAIL_PENDING_STATUSES = ["Email Queued", "Email Sent"]
 
 router = APIRouter(prefix="/apply", tags=["Applications"])
 
 class ApplyRequest(BaseModel):
-    job_ids: List[Any] # Accept any ID type (int/str)
+    # Adzuna ids are ints or strings; objects/arrays are rejected (422) since ids must be hashable
+    job_ids: List[Union[int, str]]
 
 class EmailApplyRequest(BaseModel):
     job_id: Any
@@ -25,29 +39,44 @@ async def apply_to_jobs(data: ApplyRequest, current_user: User = Depends(get_cur
     if not profile:
         raise HTTPException(status_code=400, detail="User profile not found. Please create a profile first.")
 
-    applied_jobs = []
+    # Duplicate ids within one request are applied once
+    job_ids = list(dict.fromkeys(data.job_ids))
+    outcomes = {job_id: "applied" for job_id in job_ids}
+    
+    # One $in lookup for jobs this user already applied to
+    existing = await JobApplication.find(
+        JobApplication.user_id == current_user.id,
+        In(JobApplication.job_id, job_ids)
+    ).to_list()
+    for application in existing:
+        outcomes[application.job_id] = "already_applied"
     
-    for job_id in data.job_ids:
-        # Check if already applied
-        existing = await JobApplication.find_one(
-            JobApplication.user_id == current_user.id,
-            JobApplication.job_id == job_id
+    new_applications = [
+        JobApplication(
+            user_id=current_user.id,
+            profile_id=profile.id,
+            job_id=job_id,
+            status="Applied"
         )
-        
-        if not existing:
-            application = JobApplication(
-                user_id=current_user.id,
-                profile_id=profile.id,
-                job_id=job_id,
-                status="Applied"
-            )
-            await application.insert()
-            applied_jobs.append(job_id)
+        for job_id in job_ids if outcomes[job_id] == "applied"
+    ]
+    
+    if new_applications:
+        # One unordered bulk insert; the unique (user_id, job_id) index rejects races
+        try:
+            await JobApplication.insert_many(new_applications, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                job_id = new_applications[error["index"]].job_id
+                outcomes[job_id] = "already_applied" if error.get("code") == DUPLICATE_KEY_ERROR else "failed"
+    
+    applied_jobs = [job_id for job_id in job_ids if outcomes[job_id] == "applied"]
     
     return {
         "message": "Applications submitted successfully",
         "applied_count": len(applied_jobs),
-        "job_ids": applied_jobs
+        "job_ids": applied_jobs,
+        "results": [{"job_id": job_id, "status": outcomes[job_id]} for job_id in job_ids]
     }
 
 @router.post("/email")
@@ -60,43 +89,130 @@ async def apply_via_email(data: EmailApplyRequest, current_user: User = Depends(
     if not profile:
         return {"success": False, "message": "Profile not found"}
     
-    # Send email
-    result = send_job_application_email(
-        company_email=data.company_email,
+    if not email_configured():
+        return {"success": False, "message": "Email credentials not configured"}
+
+    # Record the application first: the unique (user_id, job_id) index makes this the one
+    # atomic check, so a double-click cannot queue the email twice
+    application = JobApplication(
+        user_id=current_user.id,
+        profile_id=profile.id,
+        job_id=data.job_id,
+        status="Email Queued"
+    )
+    try:
+        await application.insert()
+    except DuplicateKeyError:
+        # Already applied through /apply (or an earlier email failed): queue it now.
+        # An application already emailed, or being emailed, is left alone.
+        result = await JobApplication.get_pymongo_collection().update_one(
+            {"user_id": current_user.id, "job_id": data.job_id, "status": {"$nin": EMAIL_PENDING_STATUSES}},
+            {"$set": {"status": "Email Queued"}}
+        )
+        if result.modified_count == 0:
+            return {"success": True, "message": "Application email already queued"}
+
+    # The outbox sender delivers it over a pooled SMTP connection and flips the
+    # application to "Email Sent"
+    subject, body = build_application_email(
         job_title=data.job_title,
         company_name=data.company_name,
         applicant_name=profile.name,
         applicant_email=profile.email if profile.email else current_user.email,
-        applicant_skills=profile.skills
+        applicant_skills=profile.technical_skills
     )
-    
-    # Save application record
-    if result["success"]:
-        application = JobApplication(
-            user_id=current_user.id,
-            profile_id=profile.id,
-            job_id=data.job_id,
-            status="Email Sent"
-        )
-        await application.insert()
-    
-    return result
+    email = await email_outbox.enqueue(
+        to=data.company_email,
+        subject=subject,
+        body=body,
+        user_id=current_user.id,
+        profile_id=profile.id,
+        job_id=data.job_id
+    )
+
+    return {"success": True, "message": "Application email queued", "email_id": str(email.id)}
+
+def encode_cursor(application: ApplicationStatusView) -> str:
+    raw = f"{application.applied_at.isoformat()}|{application.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        applied_at, app_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(applied_at), PydanticObjectId(app_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def serialize_application(application: ApplicationStatusView) -> dict:
+    return {
+        "job_id": application.job_id,
+        "status": application.status,
+        "applied_at": application.applied_at
+    }
+
+def job_id_values(job_ids: List[str]) -> list:
+    """Query-string job ids as stored: Adzuna ids may have been saved as ints or strings."""
+    values = []
+    for job_id in job_ids:
+        values.append(job_id)
+        if job_id.isdigit():
+            values.append(int(job_id))
+    return values
+
+def status_query(user_id, cursor: Optional[str] = None, job_ids: Optional[List[str]] = None):
+    """Projected query over a user's applications, newest first (served by the user_applied_at index)."""
+    conditions = [JobApplication.user_id == user_id]
+    if job_ids:
+        # Status of specific jobs only (served by the user_job_unique index)
+        conditions.append(In(JobApplication.job_id, job_id_values(job_ids)))
+    if cursor:
+        applied_at, app_id = decode_cursor(cursor)
+        # Keyset pagination: strictly after the last item of the previous page
+        conditions.append(Or(
+            JobApplication.applied_at < applied_at,
+            And(JobApplication.applied_at == applied_at, JobApplication.id < app_id)
+        ))
+    return JobApplication.find(*conditions).sort(
+        (JobApplication.applied_at, -1), (JobApplication.id, -1)
+    ).project(ApplicationStatusView)
 
 @router.get("/status")
-async def get_application_status(current_user: User = Depends(get_current_user)):
-    applications = await JobApplication.find(
-        JobApplication.user_id == current_user.id
-    ).to_list()
+async def get_application_status(
+    cursor: Optional[str] = None,
+    limit: int = Query(STATUS_PAGE_SIZE, ge=1, le=STATUS_MAX_PAGE_SIZE),
+    job_ids: Optional[List[str]] = Query(None, max_length=STATUS_MAX_PAGE_SIZE),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    One page of the user's applications, newest first. Pass `next_cursor` back as `cursor`
+    for the next page. `total_applications` is only counted for the first page (it is null
+    on later ones). `format=ndjson` streams every application (one JSON object per line)
+    without holding them in memory. `job_ids` (repeatable) limits the result to those
+    jobs, so a client can look up the jobs it shows without paging through its history.
+    """
+    if format == "ndjson":
+        async def export():
+            async for application in status_query(current_user.id, cursor, job_ids):
+                yield json.dumps(jsonable_encoder(serialize_application(application))) + "\n"
+        return StreamingResponse(export(), media_type="application/x-ndjson")
+    
+    # Fetch one extra item to know whether there is a next page
+    applications = await status_query(current_user.id, cursor, job_ids).limit(limit + 1).to_list()
+    has_more = len(applications) > limit
+    applications = applications[:limit]
+    
+    total = None
+    if cursor is None:
+        # Counted on the same index as the page; later pages keep the client's first value
+        total = len(applications) if not has_more else await status_query(
+            current_user.id, job_ids=job_ids
+        ).count()
     
     return {
         "user_id": str(current_user.id),
-        "total_applications": len(applications),
-        "applications": [
-            {
-                "job_id": app.job_id,
-                "status": app.status,
-                "applied_at": app.applied_at
-            }
-            for app in applications
-        ]
-    }
\ No newline at end of file
+        "total_applications": total,
+        "count": len(applications),
+        "next_cursor": encode_cursor(applications[-1]) if has_more else None,
+        "applications": [serialize_application(app) for app in applications]
+    }
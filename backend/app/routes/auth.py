@@ -3,13 +3,14 @@ from fastapi.security import OAuth2PasswordRequestForm
 from datetime import datetime, timedelta
 from ..models import User
 from ..auth_utils import (
-    get_password_hash,
-    verify_password,
+    hash_password_async,
+    verify_and_update_password,
     create_access_token,
     ACCESS_TOKEN_EXPIRE_MINUTES,
     get_current_user
 )
 from pydantic import BaseModel, EmailStr, Field
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -32,14 +33,21 @@ async def register(user_data: UserCreate):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     new_user = User(email=user_data.email, password_hash=hashed_password)
-    await new_user.insert()
+    try:
+        await new_user.insert()
+    except DuplicateKeyError:
+        # A concurrent registration for the same email won the race (email_unique index)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
     # Generate token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": new_user.email}, expires_delta=access_token_expires
+        data={"sub": new_user.email, "uid": str(new_user.id)}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -47,21 +55,29 @@ async def register(user_data: UserCreate):
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     # Find user
     user = await User.find_one(User.email == form_data.username)
-    if not user or not verify_password(form_data.password, user.password_hash):
+    is_valid, new_hash = (False, None)
+    if user:
+        is_valid, new_hash = await verify_and_update_password(form_data.password, user.password_hash)
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Transparently upgrade hashes made with outdated argon2 parameters
+    if new_hash:
+        user.password_hash = new_hash
+        user.updated_at = datetime.utcnow()
+    
     # Update last login
     user.last_login = datetime.utcnow()
-    await user.save()
+    await user.save()  # also evicts the cached principal (User after_event hook)
     
     # Generate token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "uid": str(user.id)}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -1,56 +1,27 @@
 from fastapi import APIRouter, HTTPException
 from typing import Optional
-import requests
 import os
 from dotenv import load_dotenv
 from ..models import Profile
+from ..services.job_source import job_search_cache
+from ..services.job_index import job_index, job_ingestor
+from ..services.job_scoring import JobScoringEngine
+from ..utils.tracing import span
 from beanie import PydanticObjectId
 
 load_dotenv()
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
-ADZUNA_APP_ID = "679d6946"
-ADZUNA_API_KEY = "34a6b99b5aa3f77e94d96629aacbdbef"
+# Below this many indexed candidates, the query is ingested from the sources first
+JOB_INDEX_MIN_RESULTS = int(os.getenv("JOB_INDEX_MIN_RESULTS", 20))
+JOB_INDEX_CANDIDATES = int(os.getenv("JOB_INDEX_CANDIDATES", 200))
 
-def fetch_adzuna_jobs(query: str, location: str = "in", results_per_page: int = 20):
-    url = f"https://api.adzuna.com/v1/api/jobs/{location}/search/1"
-    
-    params = {
-        "app_id": ADZUNA_APP_ID,
-        "app_key": ADZUNA_API_KEY,
-        "results_per_page": results_per_page,
-        "what": query,
-        "content-type": "application/json"
-    }
-    
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        jobs = []
-        for idx, job in enumerate(data.get("results", []), 1):
-            description = job.get("description", "")
-            
-            jobs.append({
-                "id": job.get("id", f"adzuna_{idx}"),
-                "title": job.get("title"),
-                "company": job.get("company", {}).get("display_name", "Company Name"),
-                "location": job.get("location", {}).get("display_name", "Remote"),
-                "salary_min": job.get("salary_min"),
-                "salary_max": job.get("salary_max"),
-                "description": description[:500] if description else "No description",
-                "apply_link": job.get("redirect_url"),
-                "posted_date": job.get("created"),
-                "contract_type": job.get("contract_type"),
-                "category": job.get("category", {}).get("label", "General"),
-            })
-        
-        return jobs
-    except Exception as e:
-        print(f"Error fetching Adzuna jobs: {e}")
-        return []
+# Fields of a normalized posting (job_source.normalize_adzuna_job) returned to clients
+PUBLIC_JOB_FIELDS = (
+    "id", "title", "company", "location", "salary_min", "salary_max", "description",
+    "apply_link", "posted_date", "contract_type", "category",
+)
 
 from ..models import User
 from ..auth_utils import get_current_user
@@ -58,8 +29,12 @@ from fastapi import APIRouter, HTTPException, Depends
 
 # ...
 
+@router.get("/cache/stats")
+async def get_job_cache_stats(current_user: User = Depends(get_current_user)):
+    return {"adzuna_cache": job_search_cache.stats(), "job_index": job_index.stats()}
+
 @router.get("/matched/{profile_id}")
-async def get_matched_jobs(profile_id: str, current_user: User = Depends(get_current_user)):
+async def get_matched_jobs(profile_id: str, limit: Optional[int] = None, current_user: User = Depends(get_current_user)):
     try:
         # Check if profile_id is a valid ObjectId structure if needed, or let Beanie handle it
         profile = await Profile.get(PydanticObjectId(profile_id))
@@ -75,42 +50,42 @@ async def get_matched_jobs(profile_id: str, current_user: User = Depends(get_cur
     
     search_query = f"{job_role} {' '.join(primary_skills)}"
     
-    # This part remains synchronous as it uses 'requests'. 
-    # In a fully async app, we should use 'httpx', but for now keeping it simple is fine.
-    # We can run it in a threadpool if it blocks too much, but for low traffic it's ok.
-    real_jobs = fetch_adzuna_jobs(search_query, location="in")
+    # Serve from the local job index; only ingest from the sources when it has too few candidates
+    search_terms = [job_role, *profile.technical_skills]
+    job_index.record_query(search_query, "in")
+    with span("jobs.index_search", terms=len(search_terms)) as search_span:
+        real_jobs = job_index.search(search_terms, location="in", limit=JOB_INDEX_CANDIDATES)
+        if search_span is not None:
+            search_span.attributes["candidates"] = len(real_jobs)
+    if len(real_jobs) < JOB_INDEX_MIN_RESULTS:
+        with span("jobs.ingest", query=search_query):
+            await job_ingestor.ingest(search_query, location="in")
+        real_jobs = job_index.search(search_terms, location="in", limit=JOB_INDEX_CANDIDATES)
     
+    # Add the postings most similar to the profile as a whole, which keyword search misses
+    # when they word the same skills differently
+    with span("jobs.semantic_search") as semantic_span:
+        profile_vector = job_index.embed_query(f"{job_role} {' '.join(profile.technical_skills)}")
+        seen = {(job.get("source"), job.get("id")) for job in real_jobs}
+        similar = job_index.semantic_search(profile_vector, location="in", limit=JOB_INDEX_CANDIDATES)[0]
+        real_jobs += [job for job in similar if (job.get("source"), job.get("id")) not in seen]
+        if semantic_span is not None:
+            semantic_span.attributes["candidates"] = len(real_jobs)
+
     if not real_jobs:
         return []
     
-    user_skills = [skill.lower() for skill in profile.technical_skills]
+    # Vectorized scoring over the skill ids resolved at ingest; only the top `limit` jobs
+    # get their skill lists materialized. Exact skill overlap leads, text similarity re-ranks
+    with span("jobs.score", jobs=len(real_jobs)):
+        ranked = JobScoringEngine([profile.technical_skills]).rank(
+            real_jobs, top_k=limit, job_skill_ids=job_index.skill_ids_for(real_jobs),
+            similarity=job_index.similarities(profile_vector, real_jobs),
+        )[0]
     
     matched_jobs = []
-    for job in real_jobs:
-        job_text = (
-            str(job.get("title", "")) + " " + 
-            str(job.get("description", "")) + " " + 
-            str(job.get("category", ""))
-        ).lower()
-        
-        matching_skills = []
-        
-        for skill in user_skills:
-            if skill in job_text:
-                matching_skills.append(skill)
-        
-        total_user_skills = len(user_skills)
-        match_count = len(matching_skills)
-        match_percentage = int((match_count / total_user_skills) * 100) if total_user_skills > 0 else 0
-        
-        # Calculate missing skills (skills in user profile that were NOT found in job)
-        # Note: This is "skills the user has that aren't relevant". 
-        # Actually, usually "missing skills" means "skills the JOB matches but user doesn't have".
-        # But here we are searching *user skills* in *job text*.
-        # So `matching_skills` = Intersection.
-        # So we can only really show the intersection.
-        # But wait, looking at it from a "Match" perspective:
-        # We want to show which of the USER'S skills matched.
+    for result in ranked:
+        job = real_jobs[result["job_index"]]
         
         salary_display = "Not specified"
         s_min = job.get("salary_min")
@@ -121,14 +96,18 @@ async def get_matched_jobs(profile_id: str, current_user: User = Depends(get_cur
         elif s_min:
             salary_display = f"${s_min:,.0f}+"
         
+        description = job.get("description")
+        
         matched_jobs.append({
-            **job,
+            # Public posting fields only; the index's bookkeeping (source, last_seen...) stays internal
+            **{field: job.get(field) for field in PUBLIC_JOB_FIELDS},
+            "description": description[:500] if description else "No description",
             "salary": salary_display,
-            "match_percentage": match_percentage,
-            "matching_skills": matching_skills,
-            "missing_skills": list(set(user_skills) - set(matching_skills)) # Skills user has but job didn't mention
+            "match_percentage": result["match_percentage"],
+            "matching_skills": result["matching_skills"],
+            "related_skills": result["related_skills"],
+            "similarity": result["similarity"],
+            "missing_skills": result["missing_skills"] # Skills user has but job didn't mention
         })
     
-    matched_jobs.sort(key=lambda x: x["match_percentage"], reverse=True)
-    
-    return matched_jobs
\ No newline at end of file
+    return matched_jobs
@@ -1,5 +1,4 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-import PyPDF2
 import os
 import json
 from pydantic import BaseModel
@@ -8,41 +7,60 @@ from typing import List, Optional
 from ..models import User
 from ..auth_utils import get_current_user
 from ..utils.keyword_extractor import KeywordExtractor
+from ..services.resume_cache import resume_analysis_cache, resume_cache_key
+from ..services.pdf_extractor import extract_upload_text, PDFExtractionError
+from ..utils.metrics import ai_results
+from ..utils.tracing import span
 
 router = APIRouter(prefix="/resume", tags=["Resume"])
 
-def extract_text_from_pdf(file_file):
-    try:
-        reader = PyPDF2.PdfReader(file_file)
-        text = " ".join(page.extract_text() for page in reader.pages)
-        return text
-    except Exception as e:
-        print(f"PDF Error: {e}")
-        return ""
-
 @router.post("/analyze")
 async def analyze_resume(file: UploadFile = File(...), current_user: User = Depends(get_current_user)):
-    # 1. Extract Text
-    text = extract_text_from_pdf(file.file)
-    if not text:
+    # 1. Extract Text (process pool, bounded bytes/pages/time)
+    try:
+        with span("pdf.extract", filename=file.filename):
+            text = await extract_upload_text(file)
+    except PDFExtractionError as e:
+        print(f"PDF Error: {e}")
+        if e.status_code == 413:
+            raise HTTPException(status_code=413, detail=str(e))
+        text = ""
+    if not text.strip():
         raise HTTPException(status_code=400, detail="Could not read PDF file")
     
+    # Repeat uploads of the same resume skip the LLM entirely
+    cache_key = resume_cache_key(text)
+    cached = resume_analysis_cache.get(cache_key)
+    if cached is not None:
+        print("DEBUG: Resume analysis served from cache")
+        ai_results.inc("resume", "cache")
+        return cached
+    
     # 2. AI Analysis (Primary)
     try:
         from ..services.ai_resume import AIResumeParser
         print("DEBUG: Attempting AI Resume Parsing...")
-        data = AIResumeParser.parse_resume(text)
+        with span("resume.ai_parse", chars=len(text)):
+            data = await AIResumeParser.parse_resume(text)
         print("DEBUG: AI Parsing Successful")
+        data["parser"] = "ai"
+        ai_results.inc("resume", "ai")
+        resume_analysis_cache.set(cache_key, data)
         return data
     except Exception as e:
         print(f"WARNING: AI Parsing Failed ({e}). Falling back to Keyword Extraction.")
         
         # 3. Keyword Analysis (Fallback)
         try:
-            data = KeywordExtractor.process_resume(text)
+            # Fallback results are not cached, so the next upload retries the AI parser
+            with span("resume.keyword_fallback"):
+                data = KeywordExtractor.process_resume(text)
+            data["parser"] = "keyword"
+            ai_results.inc("resume", "keyword")
             return data
         except Exception as e:
             print(f"Keyword Extraction Failed: {e}")
+            ai_results.inc("resume", "none")
             return {
                 "name": "Candidate",
                 "email": "Not Found",
@@ -50,5 +68,6 @@ async def analyze_resume(file: UploadFile = File(...), current_user: User = Depe
                 "soft_skills": [],
                 "projects": ["Error parsing resume"],
                 "experience": "NIL",
-                "job_role": "Backend Developer"
+                "job_role": "Backend Developer",
+                "parser": "none"
             }
\ No newline at end of file
@@ -2,6 +2,7 @@ import os
 import json
 
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List
 
@@ -44,81 +45,164 @@ SKILL_RESOURCES = {
     # ... (Other skills would be here, truncated for brevity but functionality remains) ...
 }
 
-from google import genai
-
 # ... (other imports)
 
 # --------------------------
 # AI CONFIGURATION
 # --------------------------
-from ..ai_client import get_ai_client, MODEL_NAME
+from ..services.llm_gateway import LLMGateway
+from ..services.roadmap_cache import roadmap_cache, missing_skills_for, normalize_key, skill_cache_key
+from ..utils.json_stream import StreamingJSONParser
+from ..utils.metrics import ai_results
+from ..utils.single_flight import SingleFlight
+from ..utils.tracing import span
+
+# Concurrent requests needing the same Gemini answer share one call (and its failure)
+roadmap_calls = SingleFlight("roadmap")
+resource_calls = SingleFlight("roadmap_resources")
+
+def build_roadmap_prompt(job_role: str, user_skills: List[str]) -> str:
+    return f"""
+    Act as an elite senior career coach and technical mentor. 
+    Create a precise, structured learning roadmap for a user transitioning into the role of: "{job_role}".
+    
+    User's Current Technical Skills: {', '.join(user_skills)}
+    
+    Return ONLY a JSON object with this exact structure (no markdown formatting, just raw JSON):
+    {{
+        "required_skills": ["List of 5-8 most critical skills for this exact role. DO NOT include skills that are completely irrelevant to {job_role}."],
+        "missing_skills": ["List of skills the user lacks from the required list (difference between required and current)."],
+        "learning_roadmap": {{
+            "missing_skill_name": {{
+                "roadmap": ["Step 1: Specific Topic", "Step 2: Practical Project Idea", "Step 3: Advanced Concept"],
+                "websites": ["Link to Official Documentation or highly-regarded written course (e.g., freeCodeCamp, MDN)"],
+                "youtube": ["Link to a specific, high-quality YouTube tutorial or full course video. Format: 'URL - Title of Video'"]
+            }}
+        }}
+    }}
 
-client = get_ai_client()
+    IMPORTANT RULES: 
+    1. Ensure JSON is completely valid.
+    2. The courses and links MUST BE PROPER, recognizable resources (e.g., official docs, freeCodeCamp, Traversy Media, Programming with Mosh, etc.). Focus on quality over generic searches.
+    3. Do not invent fake URLs. If a specific video URL is unknown, provide a highly specific search query formatted like a proper course link: 'https://www.youtube.com/results?search_query=full+course+topic - Topic Full Course'
+    """
 
-def generate_ai_roadmap(job_role: str, user_skills: List[str]):
-    """Attempts to generate roadmap using Gemini. Returns None on ANY failure."""
-    if not client:
+def build_resources_prompt(job_role: str, skills: List[str]) -> str:
+    """Prompt for learning resources only, used when the role's required skills are already cached."""
+    return f"""
+    Act as an elite senior career coach and technical mentor.
+    A user is transitioning into the role of: "{job_role}" and needs to learn these skills: {', '.join(skills)}
+    
+    Return ONLY a JSON object with this exact structure (no markdown formatting, just raw JSON), with one entry per skill listed above:
+    {{
+        "learning_roadmap": {{
+            "skill_name": {{
+                "roadmap": ["Step 1: Specific Topic", "Step 2: Practical Project Idea", "Step 3: Advanced Concept"],
+                "websites": ["Link to Official Documentation or highly-regarded written course (e.g., freeCodeCamp, MDN)"],
+                "youtube": ["Link to a specific, high-quality YouTube tutorial or full course video. Format: 'URL - Title of Video'"]
+            }}
+        }}
+    }}
+
+    IMPORTANT RULES: 
+    1. Ensure JSON is completely valid.
+    2. The courses and links MUST BE PROPER, recognizable resources (e.g., official docs, freeCodeCamp, Traversy Media, Programming with Mosh, etc.). Focus on quality over generic searches.
+    3. Do not invent fake URLs. If a specific video URL is unknown, provide a highly specific search query formatted like a proper course link: 'https://www.youtube.com/results?search_query=full+course+topic - Topic Full Course'
+    """
+
+def parse_model_json(text: str) -> dict:
+    return json.loads(text.replace("```json", "").replace("```", "").strip())
+
+async def generate_ai_roadmap(job_role: str, user_skills: List[str]):
+    """
+    Attempts to generate roadmap using Gemini. Returns None on ANY failure.
+    Cached role requirements and per-skill resources are reused; Gemini is only asked
+    for the parts that are not cached yet. Concurrent requests for an uncached role share
+    one roadmap call, and requests missing the same uncached skills share one resources call.
+    """
+    if not LLMGateway.is_available():
         return None
     
     try:
-        prompt = f"""
-        Act as an elite senior career coach and technical mentor. 
-        Create a precise, structured learning roadmap for a user transitioning into the role of: "{job_role}".
-        
-        User's Current Technical Skills: {', '.join(user_skills)}
+        required_skills = roadmap_cache.required_skills(job_role)
+        if required_skills is None:
+            own_call = False
+
+            async def request_roadmap():
+                nonlocal own_call
+                own_call = True
+                response = await LLMGateway.generate_content(build_roadmap_prompt(job_role, user_skills))
+                result = parse_model_json(response.text)
+                roadmap_cache.store(job_role, result)
+                return result
+
+            result = await roadmap_calls.do(normalize_key(job_role), request_roadmap)
+            # The gap is recomputed against the taxonomy, so "k8s" covers a required "Kubernetes"
+            missing_skills = missing_skills_for(result.get("required_skills", []), user_skills)
+            if own_call:
+                learning_roadmap = result.get("learning_roadmap") or {}
+                return {
+                    **result,
+                    "missing_skills": missing_skills,
+                    "learning_roadmap": {s: learning_roadmap[s] for s in missing_skills if s in learning_roadmap}
+                }
+            # Joined another user's call, whose prompt listed that user's skills: this user's
+            # gaps are filled from what it cached, plus a resources call for the rest
+            required_skills = result.get("required_skills", [])
         
-        Return ONLY a JSON object with this exact structure (no markdown formatting, just raw JSON):
-        {{
-            "required_skills": ["List of 5-8 most critical skills for this exact role. DO NOT include skills that are completely irrelevant to {job_role}."],
-            "missing_skills": ["List of skills the user lacks from the required list (difference between required and current)."],
-            "learning_roadmap": {{
-                "missing_skill_name": {{
-                    "roadmap": ["Step 1: Specific Topic", "Step 2: Practical Project Idea", "Step 3: Advanced Concept"],
-                    "websites": ["Link to Official Documentation or highly-regarded written course (e.g., freeCodeCamp, MDN)"],
-                    "youtube": ["Link to a specific, high-quality YouTube tutorial or full course video. Format: 'URL - Title of Video'"]
-                }}
-            }}
-        }}
+        missing_skills = missing_skills_for(required_skills, user_skills)
+        learning_roadmap, uncached = roadmap_cache.resources_for(missing_skills)
+        if uncached:
+            async def request_resources():
+                response = await LLMGateway.generate_content(build_resources_prompt(job_role, uncached))
+                generated = parse_model_json(response.text).get("learning_roadmap", {})
+                generated = {skill_cache_key(skill): resources for skill, resources in generated.items()}
+                for skill in uncached:
+                    resources = generated.get(skill_cache_key(skill))
+                    if resources:
+                        roadmap_cache.store_resources(skill, resources)
+                return generated
 
-        IMPORTANT RULES: 
-        1. Ensure JSON is completely valid.
-        2. The courses and links MUST BE PROPER, recognizable resources (e.g., official docs, freeCodeCamp, Traversy Media, Programming with Mosh, etc.). Focus on quality over generic searches.
-        3. Do not invent fake URLs. If a specific video URL is unknown, provide a highly specific search query formatted like a proper course link: 'https://www.youtube.com/results?search_query=full+course+topic - Topic Full Course'
-        """
+            key = (normalize_key(job_role), tuple(sorted({skill_cache_key(skill) for skill in uncached})))
+            generated = await resource_calls.do(key, request_resources)
+            for skill in uncached:
+                resources = generated.get(skill_cache_key(skill))
+                if resources:
+                    learning_roadmap[skill] = resources
         
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt
-        )
-        text = response.text.replace("```json", "").replace("```", "").strip()
-        return json.loads(text)
+        return {
+            "required_skills": required_skills,
+            "missing_skills": missing_skills,
+            "learning_roadmap": {s: learning_roadmap[s] for s in missing_skills if s in learning_roadmap}
+        }
     
     except Exception as e:
         print(f"AI Generation Failed: {e}")
         return None
 
+def manual_skill_resources(skill: str) -> dict:
+    """Learning resources for one skill from the hardcoded data, or generic search links."""
+    resources = SKILL_RESOURCES.get(skill_cache_key(skill))
+    if resources is not None:
+        return resources
+    return {
+        "roadmap": ["Basics", "Intermediate Concepts", "Projects", "Interviews"],
+        "websites": [f"https://www.google.com/search?q={skill}+tutorial"],
+        "youtube": [f"https://www.youtube.com/results?search_query={skill}+tutorial"]
+    }
+
 def generate_manual_roadmap(job_role: str, user_skills: List[str]):
     """Generates roadmap using hardcoded dictionaries (Fallback)."""
     job_role_lower = job_role.lower()
-    user_skills_lower = [s.lower() for s in user_skills]
     
     required_skills = JOB_SKILLS.get(job_role_lower, [])
     # If role not found, default to generic dev skills
     if not required_skills:
         required_skills = ["git", "communication", "problem solving", "python"]
 
-    missing_skills = [skill for skill in required_skills if skill not in user_skills_lower]
+    missing_skills = missing_skills_for(required_skills, user_skills)
     
-    learning_roadmap = {}
-    for skill in missing_skills:
-        if skill in SKILL_RESOURCES:
-            learning_roadmap[skill] = SKILL_RESOURCES[skill]
-        else:
-            learning_roadmap[skill] = {
-                "roadmap": ["Basics", "Intermediate Concepts", "Projects", "Interviews"],
-                "websites": [f"https://www.google.com/search?q={skill}+tutorial"],
-                "youtube": [f"https://www.youtube.com/results?search_query={skill}+tutorial"]
-            }
+    learning_roadmap = {skill: manual_skill_resources(skill) for skill in missing_skills}
             
     return {
         "required_skills": required_skills,
@@ -132,15 +216,21 @@ from fastapi import APIRouter, Depends
 
 # ... (imports)
 
+@router.get("/cache/stats")
+async def get_roadmap_cache_stats(current_user: User = Depends(get_current_user)):
+    return roadmap_cache.stats()
+
 @router.post("/generate")
-def generate_roadmap(data: RoadmapRequest, current_user: User = Depends(get_current_user)):
+async def generate_roadmap(data: RoadmapRequest, current_user: User = Depends(get_current_user)):
     print(f"Generating roadmap for: {data.job_role}")
     
     # 1. Try AI Generation
-    ai_result = generate_ai_roadmap(data.job_role, data.technical_skills)
+    with span("roadmap.ai", job_role=data.job_role):
+        ai_result = await generate_ai_roadmap(data.job_role, data.technical_skills)
     
     if ai_result:
         print("Success: Generated using AI")
+        ai_results.inc("roadmap", "ai")
         return {
             "job_role": data.job_role,
             "current_skills": data.technical_skills,
@@ -151,7 +241,9 @@ def generate_roadmap(data: RoadmapRequest, current_user: User = Depends(get_curr
     
     # 2. Fallback to Manual Generation
     print("Fallback: Using manual data")
-    manual_result = generate_manual_roadmap(data.job_role, data.technical_skills)
+    ai_results.inc("roadmap", "manual")
+    with span("roadmap.manual"):
+        manual_result = generate_manual_roadmap(data.job_role, data.technical_skills)
     
     return {
         "job_role": data.job_role,
@@ -160,4 +252,102 @@ def generate_roadmap(data: RoadmapRequest, current_user: User = Depends(get_curr
         "missing_skills": manual_result["missing_skills"],
         "learning_roadmap": manual_result["learning_roadmap"],
         "note": "Generated using standard database (AI unavailable)"
-    }
\ No newline at end of file
+    }
+
+# --------------------------
+# STREAMING (Server-Sent Events)
+# --------------------------
+# Events: "meta", "required_skills", "missing_skills", one "learning_roadmap" per skill
+# ({"skill": ..., "resources": {...}}) and a final "done" ({"source": "ai" | "manual" | "ai+manual"}).
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_json_members(prompt: str):
+    """Yields (path, value) members of the streamed model JSON as they complete."""
+    parser = StreamingJSONParser(expand={"learning_roadmap"})
+    async for chunk in LLMGateway.generate_content_stream(prompt):
+        for member in parser.feed(chunk):
+            yield member
+    if not parser.done:
+        raise ValueError("Incomplete JSON in streamed roadmap")
+
+async def ai_roadmap_events(job_role: str, user_skills: List[str]):
+    """
+    Yields (event, data) pairs as soon as each part is parseable from the streamed model output.
+    Parts found in the roadmap cache are emitted immediately; streamed parts are cached as they arrive.
+    """
+    required_skills = roadmap_cache.required_skills(job_role)
+    if required_skills is None:
+        prompt = build_roadmap_prompt(job_role, user_skills)
+    else:
+        missing_skills = missing_skills_for(required_skills, user_skills)
+        yield "required_skills", required_skills
+        yield "missing_skills", missing_skills
+        cached, uncached = roadmap_cache.resources_for(missing_skills)
+        for skill, resources in cached.items():
+            yield "learning_roadmap", {"skill": skill, "resources": resources}
+        if not uncached:
+            return
+        prompt = build_resources_prompt(job_role, uncached)
+    
+    missing_keys = None  # canonical keys of the recomputed gap, once required_skills has streamed
+    async for path, value in stream_json_members(prompt):
+        if path[0] == "learning_roadmap":
+            roadmap_cache.store_resources(path[1], value)
+            if missing_keys is None or skill_cache_key(path[1]) in missing_keys:
+                yield "learning_roadmap", {"skill": path[1], "resources": value}
+        elif path[0] == "required_skills":
+            roadmap_cache.store_required_skills(job_role, value)
+            yield path[0], value
+            missing_skills = missing_skills_for(value, user_skills)
+            missing_keys = {skill_cache_key(s) for s in missing_skills}
+            yield "missing_skills", missing_skills
+        elif path[0] == "missing_skills" and missing_keys is None:
+            yield path[0], value
+
+def manual_roadmap_events(job_role: str, user_skills: List[str], sent: dict):
+    """Fallback events in the same format, skipping anything the AI stream already delivered."""
+    manual_result = generate_manual_roadmap(job_role, user_skills)
+    for key in ("required_skills", "missing_skills"):
+        if key not in sent:
+            sent[key] = manual_result[key]
+            yield key, manual_result[key]
+    for skill in sent["missing_skills"]:
+        if skill not in sent["learning_roadmap"]:
+            yield "learning_roadmap", {"skill": skill, "resources": manual_skill_resources(skill)}
+
+@router.post("/generate/stream")
+async def generate_roadmap_stream(data: RoadmapRequest, current_user: User = Depends(get_current_user)):
+    async def events():
+        yield sse_event("meta", {"job_role": data.job_role, "current_skills": data.technical_skills})
+        sent = {"learning_roadmap": set()}
+        source = "manual"
+        
+        # 1. Try AI Generation (streamed)
+        if LLMGateway.is_available():
+            try:
+                async for event, payload in ai_roadmap_events(data.job_role, data.technical_skills):
+                    if event == "learning_roadmap":
+                        sent["learning_roadmap"].add(payload["skill"])
+                    else:
+                        sent[event] = payload
+                    source = "ai"
+                    yield sse_event(event, payload)
+            except Exception as e:
+                print(f"AI Streaming Failed: {e}")
+                source = "ai+manual" if source == "ai" else "manual"
+        
+        # 2. Fallback (or fill-in after a partial AI stream)
+        if source != "ai":
+            for event, payload in manual_roadmap_events(data.job_role, data.technical_skills, sent):
+                yield sse_event(event, payload)
+        
+        ai_results.inc("roadmap_stream", source)
+        yield sse_event("done", {"source": source})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
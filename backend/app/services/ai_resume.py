@@ -1,14 +1,26 @@
 import json
 import re
-from ..ai_client import get_ai_client, MODEL_NAME
+from .llm_gateway import LLMGateway
+from ..utils.single_flight import SingleFlight
+
+# Bump whenever the prompt changes so cached results from the old prompt are not reused
+PROMPT_VERSION = "1"
+
+# Duplicate uploads parsed at the same time share one Gemini call
+resume_calls = SingleFlight("resume")
 
 class AIResumeParser:
     @staticmethod
-    def parse_resume(text: str) -> dict:
-        client = get_ai_client()
-        if not client:
+    async def parse_resume(text: str) -> dict:
+        """Concurrent calls for the same (whitespace-normalized) resume share one parse and its failure."""
+        if not LLMGateway.is_available():
             raise Exception("AI Client not initialized")
+        key = " ".join(text[:10000].split())
+        data = await resume_calls.do(key, lambda: AIResumeParser._parse_resume(text))
+        return dict(data)  # callers annotate their copy
 
+    @staticmethod
+    async def _parse_resume(text: str) -> dict:
         prompt = f"""
         You are an expert Resume Parser. Analyze the following resume text and extract the details in strictly valid JSON format.
         
@@ -36,36 +48,27 @@ class AIResumeParser:
         7. Return ONLY the JSON string, no markdown formatting (no ```json).
         """
 
-        import time
-        
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = client.models.generate_content(
-                    model=MODEL_NAME,
-                    contents=prompt,
-                    config={
-                        'response_mime_type': 'application/json'
-                    }
-                )
-                
-                raw_text = response.text.strip()
-                # Clean up potential markdown code blocks
-                if raw_text.startswith("```json"):
-                    raw_text = raw_text[7:]
-                if raw_text.startswith("```"):
-                    raw_text = raw_text[3:]
-                if raw_text.endswith("```"):
-                    raw_text = raw_text[:-3]
-                    
-                data = json.loads(raw_text)
-                return data
-                
-            except Exception as e:
-                if "429" in str(e) and attempt < max_retries - 1:
-                    print(f"DEBUG: Rate limit hit (429). Retrying in {2**(attempt+1)} seconds...")
-                    time.sleep(2**(attempt+1))
-                    continue
+        # Retries with non-blocking backoff happen inside the gateway
+        try:
+            response = await LLMGateway.generate_content(
+                prompt,
+                config={
+                    'response_mime_type': 'application/json'
+                }
+            )
+            
+            raw_text = response.text.strip()
+            # Clean up potential markdown code blocks
+            if raw_text.startswith("```json"):
+                raw_text = raw_text[7:]
+            if raw_text.startswith("```"):
+                raw_text = raw_text[3:]
+            if raw_text.endswith("```"):
+                raw_text = raw_text[:-3]
                 
-                print(f"AI Parsing Error: {e}")
-                raise e
+            data = json.loads(raw_text)
+            return data
+            
+        except Exception as e:
+            print(f"AI Parsing Error: {e}")
+            raise e
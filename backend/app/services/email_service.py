@@ -1,4 +1,10 @@
+import asyncio
+import random
 import smtplib
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
@@ -6,36 +12,40 @@ from email import encoders
 import os
 from dotenv import load_dotenv
 
+from ..utils.metrics import record_dependency
+
 load_dotenv()
 
 SMTP_EMAIL = os.getenv("SMTP_EMAIL")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 30))
+SMTP_IDLE_CHECK = float(os.getenv("SMTP_IDLE_CHECK", 10))  # NOOP-probe connections idle longer than this
 
-def send_job_application_email(
-    company_email: str,
+# Outbox sender settings
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 50))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 5))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 5))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", 30))
+OUTBOX_STALE_SENDING = float(os.getenv("OUTBOX_STALE_SENDING", 300))  # reclaim crashed sends after this
+
+
+def email_configured() -> bool:
+    return bool(SMTP_EMAIL and SMTP_PASSWORD)
+
+
+def build_application_email(
     job_title: str,
     company_name: str,
     applicant_name: str,
     applicant_email: str,
-    applicant_skills: list,
-    resume_path: str = None
+    applicant_skills: list
 ):
-    """Send job application email"""
-    
-    if not SMTP_EMAIL or not SMTP_PASSWORD:
-        return {"success": False, "message": "Email credentials not configured"}
-    
-    try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = SMTP_EMAIL
-        msg['To'] = company_email
-        msg['Subject'] = f"Job Application - {job_title}"
-        
-        # Email body
-        body = f"""
+    """Returns (subject, body) of a job application email."""
+    subject = f"Job Application - {job_title}"
+    body = f"""
 Dear Hiring Manager at {company_name},
 
 I am writing to express my interest in the {job_title} position.
@@ -57,6 +67,42 @@ Best regards,
 ---
 This application was sent via Career Agent AI
 """
+    return subject, body
+
+
+def open_smtp_connection() -> smtplib.SMTP:
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+    server.ehlo()
+    if SMTP_STARTTLS:
+        server.starttls()
+        server.ehlo()  # STARTTLS discards the features advertised before it
+    if email_configured():
+        server.login(SMTP_EMAIL, SMTP_PASSWORD)
+    return server
+
+
+def send_job_application_email(
+    company_email: str,
+    job_title: str,
+    company_name: str,
+    applicant_name: str,
+    applicant_email: str,
+    applicant_skills: list,
+    resume_path: str = None
+):
+    """Send job application email immediately over a fresh connection (blocking)."""
+    
+    if not email_configured():
+        return {"success": False, "message": "Email credentials not configured"}
+    
+    try:
+        subject, body = build_application_email(job_title, company_name, applicant_name, applicant_email, applicant_skills)
+
+        # Create message
+        msg = MIMEMultipart()
+        msg['From'] = SMTP_EMAIL
+        msg['To'] = company_email
+        msg['Subject'] = subject
         
         msg.attach(MIMEText(body, 'plain'))
         
@@ -73,9 +119,7 @@ This application was sent via Career Agent AI
                 msg.attach(part)
         
         # Send email
-        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
-        server.starttls()
-        server.login(SMTP_EMAIL, SMTP_PASSWORD)
+        server = open_smtp_connection()
         text = msg.as_string()
         server.sendmail(SMTP_EMAIL, company_email, text)
         server.quit()
@@ -83,4 +127,222 @@ This application was sent via Career Agent AI
         return {"success": True, "message": "Email sent successfully"}
         
     except Exception as e:
-        return {"success": False, "message": str(e)}
\ No newline at end of file
+        return {"success": False, "message": str(e)}
+
+
+# --------------------------
+# OUTBOX (queued, pooled sending)
+# --------------------------
+class SMTPSender:
+    """
+    Keeps one authenticated SMTP connection open and reuses it for every message.
+    Only ever used from the outbox's single sender thread.
+    """
+
+    def __init__(self):
+        self._server = None
+        self._last_used = 0.0
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._server is not None:
+            # Only probe connections that sat idle; busy ones fall back to reconnect-on-disconnect
+            if time.monotonic() - self._last_used < SMTP_IDLE_CHECK:
+                return self._server
+            try:
+                self._server.noop()
+                return self._server
+            except smtplib.SMTPException:
+                self.close()
+        self._server = open_smtp_connection()
+        return self._server
+
+    def send(self, to: str, subject: str, body: str, message_id: str = None):
+        """Sends one message; returns an error string, or None on success."""
+        msg = MIMEText(body, "plain")
+        msg["From"] = SMTP_EMAIL
+        msg["To"] = to
+        msg["Subject"] = subject
+        if message_id:
+            # Stable across retries, so a message sent twice is recognisable as one
+            msg["Message-ID"] = message_id
+        try:
+            try:
+                self._connection().sendmail(SMTP_EMAIL, to, msg.as_string())
+            except smtplib.SMTPServerDisconnected:
+                # The server dropped an idle connection; reconnect once
+                self.close()
+                self._connection().sendmail(SMTP_EMAIL, to, msg.as_string())
+            self._last_used = time.monotonic()
+            return None
+        except Exception as e:
+            return str(e)
+
+    def send_batch(self, messages):
+        """Sends (to, subject, body) tuples; returns an error string (or None) per message."""
+        return [self.send(to, subject, body) for to, subject, body in messages]
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+
+# Oldest due message first (served by the status_next_attempt index)
+CLAIM_SORT = [("next_attempt_at", 1)]
+
+
+def claimable_filter(now: datetime) -> dict:
+    """Due queued messages, and 'sending' ones whose sender stopped (crashed) long ago."""
+    return {"$or": [
+        {"status": "queued", "next_attempt_at": {"$lte": now}},
+        {"status": "sending", "claimed_at": {"$lte": now - timedelta(seconds=OUTBOX_STALE_SENDING)}},
+    ]}
+
+
+def message_id(email) -> str:
+    domain = (SMTP_EMAIL or "localhost").rpartition("@")[2]
+    return f"<outbox.{email.id}@{domain}>"
+
+
+class EmailOutbox:
+    """
+    Persistent outbox (OutboxEmail documents) drained by a background sender.
+
+    `enqueue` returns as soon as the message is stored. The sender claims due messages in
+    batches, sends them over a reused SMTP connection in a dedicated thread and retries
+    failures with jittered exponential backoff, up to OUTBOX_MAX_ATTEMPTS.
+
+    Each message is marked sent right after its SMTP send, and a batch stops sending once
+    half of OUTBOX_STALE_SENDING has passed, so a claim never goes stale (and gets reclaimed
+    by another worker) while it is still being worked on. Only a crash between a send and
+    its marker can send a message twice; both copies carry the same Message-ID.
+    """
+
+    def __init__(self):
+        self._sender = SMTPSender()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp")
+        self._wakeup = None
+        self._task = None
+        self.sent = 0
+        self.failed = 0
+
+    async def enqueue(self, to: str, subject: str, body: str, user_id=None, profile_id=None, job_id=None):
+        from ..models import OutboxEmail
+        email = OutboxEmail(to=to, subject=subject, body=body, user_id=user_id, profile_id=profile_id, job_id=job_id)
+        await email.insert()
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return email
+
+    async def _claim_batch(self):
+        """
+        Moves up to OUTBOX_BATCH_SIZE due messages to 'sending' under a fresh claim token,
+        in three round trips: pick candidates, claim the ones still claimable (atomic per
+        message, so one claimed by another worker meanwhile is skipped), read them back.
+        """
+        from ..models import OutboxEmail
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        collection = OutboxEmail.get_pymongo_collection()
+        candidates = await collection.find(claimable_filter(now), {"_id": 1}).sort(
+            CLAIM_SORT
+        ).limit(OUTBOX_BATCH_SIZE).to_list(None)
+        if not candidates:
+            return []
+        ids = [candidate["_id"] for candidate in candidates]
+        await collection.update_many(
+            {"$and": [{"_id": {"$in": ids}}, claimable_filter(now)]},
+            {"$set": {"status": "sending", "claimed_at": now, "claim_token": token}}
+        )
+        return await OutboxEmail.find({"_id": {"$in": ids}, "claim_token": token}).sort("next_attempt_at").to_list()
+
+    async def _record_result(self, email, error):
+        """Stores the outcome of one send, unless the claim was lost to another worker."""
+        from ..models import JobApplication, OutboxEmail
+        now = datetime.utcnow()
+        update = {"claimed_at": None, "claim_token": None}
+        application_status = None
+        if error is None:
+            update.update(status="sent", sent_at=now)
+            self.sent += 1
+            application_status = "Email Sent"
+        else:
+            update["last_error"] = error
+            if email.attempts + 1 >= OUTBOX_MAX_ATTEMPTS:
+                update["status"] = "failed"
+                self.failed += 1
+                application_status = "Email Failed"
+            else:
+                delay = random.uniform(0.5, 1.0) * OUTBOX_BACKOFF_BASE * 2 ** email.attempts
+                update.update(status="queued", next_attempt_at=now + timedelta(seconds=delay))
+        await OutboxEmail.get_pymongo_collection().update_one(
+            {"_id": email.id, "claim_token": email.claim_token},
+            {"$set": update, "$inc": {"attempts": 1}}
+        )
+        if application_status and email.job_id is not None:
+            await JobApplication.find_one(
+                JobApplication.user_id == email.user_id,
+                JobApplication.job_id == email.job_id
+            ).update({"$set": {"status": application_status}})
+
+    async def _release(self, emails):
+        """Hands claimed but unsent messages back to the queue."""
+        from ..models import OutboxEmail
+        for email in emails:
+            await OutboxEmail.get_pymongo_collection().update_one(
+                {"_id": email.id, "claim_token": email.claim_token},
+                {"$set": {"status": "queued", "claimed_at": None, "claim_token": None}}
+            )
+
+    async def drain_once(self) -> int:
+        """Claims and sends one batch; returns how many messages were attempted."""
+        batch = await self._claim_batch()
+        if not batch:
+            return 0
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + OUTBOX_STALE_SENDING / 2
+        for i, email in enumerate(batch):
+            if time.monotonic() > deadline:
+                await self._release(batch[i:])
+                return i
+            start = time.perf_counter()
+            error = await loop.run_in_executor(
+                self._executor, self._sender.send, email.to, email.subject, email.body, message_id(email)
+            )
+            record_dependency("smtp", "sendmail", time.perf_counter() - start, error is None)
+            await self._record_result(email, error)
+        return len(batch)
+
+    async def _run(self):
+        while True:
+            try:
+                if await self.drain_once():
+                    continue  # keep draining while there is a backlog
+            except Exception as e:
+                print(f"Email outbox error: {e}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None and email_configured():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._sender.close)
+
+
+email_outbox = EmailOutbox()
@@ -0,0 +1,461 @@
+import asyncio
+import json
+import os
+import re
+import time
+from collections import Counter, OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no shared snapshot ownership, every process maintains its own
+    fcntl = None
+
+from ..utils.skill_matcher import normalize_text
+from ..utils.skill_taxonomy import get_taxonomy
+from ..utils.text_embedding import HashingEmbedder
+from ..utils.vector_index import VectorIndex
+from .job_scoring import job_text
+
+JOB_INDEX_PATH = os.getenv("JOB_INDEX_PATH", os.path.join(os.path.dirname(__file__), "..", "..", "data", "job_index.json"))
+JOB_INDEX_MAX_AGE = float(os.getenv("JOB_INDEX_MAX_AGE", 7 * 24 * 3600))  # drop postings not seen for a week
+JOB_INDEX_REFRESH_INTERVAL = float(os.getenv("JOB_INDEX_REFRESH_INTERVAL", 900))
+JOB_INDEX_HOT_QUERIES = int(os.getenv("JOB_INDEX_HOT_QUERIES", 200))
+# Hot queries re-fetched per refresh (most recently requested first); each costs ADZUNA_PAGES calls
+JOB_INDEX_REFRESH_QUERIES = int(os.getenv("JOB_INDEX_REFRESH_QUERIES", 20))
+# Embedding IDF is refitted once the corpus has grown (or shrunk) by this factor
+JOB_INDEX_REFIT_GROWTH = float(os.getenv("JOB_INDEX_REFIT_GROWTH", 1.5))
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*|\.[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(normalize_text(text))
+
+
+def embedding_text(job: dict) -> str:
+    """Text a posting is embedded from; the title is repeated so it outweighs boilerplate."""
+    return f"{job.get('title', '')} {job_text(job)}"
+
+
+class JobIndex:
+    """
+    Local job store with an inverted index (skill/token -> posting ids).
+
+    Each posting's skills are resolved to taxonomy ids once, at upsert, and kept in
+    `skill_ids` so matching does not rescan descriptions. Postings are upserted
+    incrementally by the ingestion pipeline, expire when they have not been seen for
+    JOB_INDEX_MAX_AGE seconds and are persisted to a JSON file on disk.
+
+    Postings are also embedded (hashed char n-gram TF-IDF) into a VectorIndex grouped by
+    location, for similarity search. Vectors are not persisted: they are rebuilt by
+    `refit_embeddings`, which the ingestor runs in the background after startup and whenever
+    the corpus has drifted by JOB_INDEX_REFIT_GROWTH since the last fit.
+    """
+
+    def __init__(self, path: Optional[str] = JOB_INDEX_PATH, max_age: float = JOB_INDEX_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.postings: Dict[str, dict] = {}        # posting id -> job
+        self.terms: Dict[str, Set[str]] = {}       # term -> posting ids
+        self._posting_terms: Dict[str, Set[str]] = {}
+        self.skill_ids: Dict[str, np.ndarray] = {}   # posting id -> taxonomy ids of its skills
+        self.hot_queries: "OrderedDict[tuple, float]" = OrderedDict()  # (query, location) -> last requested
+        self.dirty = False
+        self.embedder = HashingEmbedder()
+        self.vectors = VectorIndex(self.embedder.dim)
+        self.locations: Dict[str, int] = {}        # location -> vector group
+        self._changed_during_refit: Optional[Set[str]] = None  # postings upserted while a refit runs
+        self._loaded_mtime: Optional[float] = None  # of the snapshot file last loaded
+
+    def __len__(self):
+        return len(self.postings)
+
+    def _analyze(self, job: dict):
+        """(terms, skill ids) of a posting."""
+        text = job_text(job)
+        taxonomy = get_taxonomy()
+        skill_ids = taxonomy.find_ids(text)
+        terms = set(tokenize(text))
+        # Canonical skill names as single terms, so "k8s", "react native" or "c#" are searchable
+        terms.update(taxonomy.names(skill_ids.tolist()))
+        return terms, skill_ids
+
+    def _unlink(self, posting_id: str):
+        self.skill_ids.pop(posting_id, None)
+        for term in self._posting_terms.pop(posting_id, ()):
+            ids = self.terms.get(term)
+            if ids is not None:
+                ids.discard(posting_id)
+                if not ids:
+                    del self.terms[term]
+
+    def _embed(self, posting_ids: List[str]):
+        """(Re)computes the vectors of postings, in one batch (unweighted n-grams before the first fit)."""
+        if not posting_ids:
+            return
+        jobs = [self.postings[pid] for pid in posting_ids]
+        groups = [self.locations.setdefault(job["source_location"], len(self.locations)) for job in jobs]
+        self.vectors.add(posting_ids, self.embedder.embed([embedding_text(job) for job in jobs]), groups)
+
+    def upsert(self, job: dict, source: str = "adzuna", location: str = "in", seen_at: Optional[float] = None,
+               embed: bool = True):
+        posting_id = f"{source}:{job['id']}"
+        self._unlink(posting_id)
+        self.postings[posting_id] = {
+            **job,
+            "source": source,
+            "source_location": location,
+            "last_seen": seen_at if seen_at is not None else time.time(),
+        }
+        if self._changed_during_refit is not None:
+            self._changed_during_refit.add(posting_id)
+        terms, self.skill_ids[posting_id] = self._analyze(job)
+        self._posting_terms[posting_id] = terms
+        for term in terms:
+            self.terms.setdefault(term, set()).add(posting_id)
+        if embed:
+            self._embed([posting_id])
+        self.dirty = True
+
+    def upsert_many(self, jobs: Iterable[dict], source: str = "adzuna", location: str = "in") -> int:
+        now = time.time()
+        posting_ids = []
+        for job in jobs:
+            self.upsert(job, source, location, seen_at=now, embed=False)
+            posting_ids.append(f"{source}:{job['id']}")
+        self._embed(posting_ids)
+        return len(posting_ids)
+
+    def remove(self, posting_id: str):
+        self._unlink(posting_id)
+        self.vectors.remove(posting_id)
+        if self.postings.pop(posting_id, None) is not None:
+            self.dirty = True
+
+    def expire(self, now: Optional[float] = None) -> int:
+        cutoff = (now if now is not None else time.time()) - self.max_age
+        expired = [pid for pid, job in self.postings.items() if job["last_seen"] < cutoff]
+        for pid in expired:
+            self.remove(pid)
+        return len(expired)
+
+    def search(self, terms: Iterable[str], location: Optional[str] = None, limit: int = 200) -> List[dict]:
+        """Postings matching any of `terms` (aliases included), ordered by how many terms they match."""
+        taxonomy = get_taxonomy()
+        counts = Counter()
+        for term in dict.fromkeys(taxonomy.canonical(t) for t in terms):
+            ids = self.terms.get(term)
+            if ids is None and " " in term:
+                # Multi-word term outside the skill vocabulary: postings containing every word
+                word_sets = [self.terms.get(w, set()) for w in tokenize(term)]
+                ids = set.intersection(*word_sets) if word_sets else set()
+            counts.update(ids or ())
+        ranked = []
+        for pid, _ in counts.most_common():
+            job = self.postings[pid]
+            if location is None or job["source_location"] == location:
+                ranked.append(job)
+                if len(ranked) >= limit:
+                    break
+        return ranked
+
+    def skill_ids_for(self, jobs: Iterable[dict]) -> List[Optional[np.ndarray]]:
+        """Skill ids computed at ingest for postings returned by `search` (None if not indexed)."""
+        return [self.skill_ids.get(f"{job.get('source')}:{job.get('id')}") for job in jobs]
+
+    # --------------------------
+    # EMBEDDINGS
+    # --------------------------
+    def needs_refit(self) -> bool:
+        fitted, size = self.embedder.documents, len(self.postings)
+        if not fitted:
+            return size > 0
+        return size > fitted * JOB_INDEX_REFIT_GROWTH or size * JOB_INDEX_REFIT_GROWTH < fitted
+
+    @staticmethod
+    def _build_vectors(posting_ids: List[str], jobs: List[dict], locations: Dict[str, int]):
+        texts = [embedding_text(job) for job in jobs]
+        embedder = HashingEmbedder().fit(texts)
+        vectors = VectorIndex(embedder.dim, capacity=max(len(texts), 1024))
+        groups = [locations.setdefault(job["source_location"], len(locations)) for job in jobs]
+        vectors.add(posting_ids, embedder.embed(texts), groups)
+        return embedder, vectors
+
+    def _install_vectors(self, embedder: HashingEmbedder, vectors: VectorIndex, locations: Dict[str, int],
+                         changed: Iterable[str] = ()):
+        """
+        Swaps in vectors built from a snapshot, catching up with changes made meanwhile:
+        removed postings are dropped, new ones and those in `changed` (re-upserted, possibly
+        with new text) are embedded again.
+        """
+        for posting_id in [key for key in vectors.keys() if key not in self.postings]:
+            vectors.remove(posting_id)
+        self.embedder, self.vectors, self.locations = embedder, vectors, locations
+        changed = set(changed)
+        self._embed([pid for pid in self.postings if pid not in vectors or pid in changed])
+
+    def refit_embeddings(self):
+        """Refits the IDF weights on every posting and re-embeds them all."""
+        posting_ids = list(self.postings)
+        locations = dict(self.locations)
+        self._install_vectors(*self._build_vectors(posting_ids, [self.postings[pid] for pid in posting_ids], locations),
+                              locations)
+
+    async def refit_embeddings_async(self):
+        """`refit_embeddings` with the fitting and embedding done in a worker thread."""
+        posting_ids = list(self.postings)
+        jobs = [self.postings[pid] for pid in posting_ids]
+        locations = dict(self.locations)
+        started = time.perf_counter()
+        self._changed_during_refit = set()
+        try:
+            embedder, vectors = await asyncio.to_thread(self._build_vectors, posting_ids, jobs, locations)
+            self._install_vectors(embedder, vectors, locations, self._changed_during_refit)
+        finally:
+            self._changed_during_refit = None
+        print(f"DEBUG: Embedded {len(posting_ids)} job postings in {time.perf_counter() - started:.1f}s")
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """(dim,) vector of a free-text query (e.g. a profile's role and skills)."""
+        return self.embedder.embed([text])[0]
+
+    def semantic_search(self, queries: np.ndarray, location: Optional[str] = None,
+                        limit: int = 200) -> List[List[dict]]:
+        """For each query vector, the `limit` most similar postings, best first."""
+        queries = np.atleast_2d(queries)
+        if location is not None and location not in self.locations:
+            return [[] for _ in queries]
+        group = self.locations[location] if location is not None else None
+        return [
+            [self.postings[pid] for pid, _ in hits]
+            for hits in self.vectors.search(queries, limit, group=group)
+        ]
+
+    def similarities(self, query: np.ndarray, jobs: List[dict]) -> np.ndarray:
+        """Cosine similarity of `query` to each job; jobs without a stored vector are embedded now."""
+        if not len(jobs):
+            return np.zeros(0, dtype=np.float32)
+        keys = [f"{job.get('source')}:{job.get('id')}" for job in jobs]
+        matrix = self.vectors.vectors_for(keys)
+        missing = [i for i, key in enumerate(keys) if key not in self.vectors]
+        if missing:
+            matrix[missing] = self.embedder.embed([embedding_text(jobs[i]) for i in missing])
+        return matrix @ query
+
+    def record_query(self, query: str, location: str):
+        key = (normalize_text(query).strip(), location)
+        self.hot_queries[key] = time.time()
+        self.hot_queries.move_to_end(key)
+        while len(self.hot_queries) > JOB_INDEX_HOT_QUERIES:
+            self.hot_queries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "postings": len(self.postings),
+            "terms": len(self.terms),
+            "hot_queries": len(self.hot_queries),
+            "vectors": len(self.vectors),
+            "embedding_documents": self.embedder.documents,
+        }
+
+    # --------------------------
+    # PERSISTENCE
+    # --------------------------
+    def snapshot(self) -> dict:
+        return {
+            "postings": list(self.postings.values()),
+            "hot_queries": [[q, loc, ts] for (q, loc), ts in self.hot_queries.items()],
+        }
+
+    def save(self, snapshot: Optional[dict] = None):
+        if not self.path:
+            return
+        snapshot = snapshot if snapshot is not None else self.snapshot()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+
+    async def save_async(self):
+        """Writes a snapshot off the event loop. No-op if nothing changed since the last save."""
+        if not self.dirty:
+            return
+        snapshot = self.snapshot()
+        self.dirty = False
+        await asyncio.to_thread(self.save, snapshot)
+
+    def _read_snapshot(self) -> Optional[dict]:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path) as f:
+                snapshot = json.load(f)
+        except Exception as e:
+            print(f"WARNING: Could not load job index from {self.path}: {e}")
+            return None
+        self._loaded_mtime = mtime
+        return snapshot
+
+    def load(self):
+        snapshot = self._read_snapshot()
+        if snapshot is None:
+            return
+        for job in snapshot.get("postings", []):
+            # Embedded later in one batch by refit_embeddings
+            self.upsert(job, job["source"], job["source_location"], seen_at=job["last_seen"], embed=False)
+        for query, location, ts in snapshot.get("hot_queries", []):
+            self.hot_queries[(query, location)] = ts
+        self.expire()
+        self.dirty = False
+        print(f"DEBUG: Loaded job index ({len(self.postings)} postings)")
+
+    async def reload_async(self) -> int:
+        """
+        Catches up with a snapshot saved by another process since the last load: postings
+        that are new, or were seen more recently there, are upserted. Returns how many.
+        """
+        if not self.path or not os.path.exists(self.path) or os.path.getmtime(self.path) == self._loaded_mtime:
+            return 0
+        snapshot = await asyncio.to_thread(self._read_snapshot)
+        if snapshot is None:
+            return 0
+        posting_ids = []
+        for job in snapshot.get("postings", []):
+            posting_id = f"{job['source']}:{job['id']}"
+            current = self.postings.get(posting_id)
+            if current is None or job["last_seen"] > current["last_seen"]:
+                self.upsert(job, job["source"], job["source_location"], seen_at=job["last_seen"], embed=False)
+                posting_ids.append(posting_id)
+        self._embed(posting_ids)
+        self.dirty = False  # nothing this process would need to write back
+        return len(posting_ids)
+
+
+# A job source is any async callable (query, location) -> list of normalized jobs
+JobSource = Callable[[str, str], Awaitable[List[dict]]]
+
+
+class JobIngestor:
+    """
+    Populates a JobIndex from one or more job sources and keeps hot queries fresh.
+
+    Sources must fetch fresh results (not cached ones), since upserting a posting marks it
+    as seen now. With several worker processes sharing the snapshot file, one of them owns
+    it (an exclusive lock next to the file): only the owner re-fetches hot queries and saves,
+    the others reload its snapshot. Ownership is retried every interval, so another worker
+    takes over when the owner exits.
+    """
+
+    def __init__(self, index: JobIndex, sources: Dict[str, JobSource]):
+        self.index = index
+        self.sources = sources
+        self._task: Optional[asyncio.Task] = None
+        self._refit_task: Optional[asyncio.Task] = None
+        self._lock_file = None
+
+    def owns_snapshot(self) -> bool:
+        if self._lock_file is not None or not self.index.path or fcntl is None:
+            return True
+        os.makedirs(os.path.dirname(os.path.abspath(self.index.path)), exist_ok=True)
+        lock_file = open(f"{self.index.path}.lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _release_snapshot(self):
+        if self._lock_file is not None:
+            self._lock_file.close()  # releases the lock
+            self._lock_file = None
+
+    async def ingest(self, query: str, location: str = "in") -> int:
+        """Fetches `query` from every source concurrently and upserts the results."""
+        names = list(self.sources)
+        results = await asyncio.gather(
+            *(self.sources[name](query, location) for name in names), return_exceptions=True
+        )
+        count = 0
+        for name, jobs in zip(names, results):
+            if isinstance(jobs, Exception):
+                print(f"Error ingesting from {name}: {jobs}")
+                continue
+            count += self.index.upsert_many(jobs, source=name, location=location)
+        self.schedule_refit()
+        return count
+
+    def schedule_refit(self):
+        """Refits the index's embeddings in the background if the corpus has drifted (one refit at a time)."""
+        if (self._refit_task is None or self._refit_task.done()) and self.index.needs_refit():
+            self._refit_task = asyncio.create_task(self._refit())
+
+    async def _refit(self):
+        try:
+            await self.index.refit_embeddings_async()
+        except Exception as e:
+            print(f"Job embedding failed: {e}")
+
+    async def refresh(self):
+        """
+        One maintenance pass: re-ingest the most recent hot queries (up to
+        JOB_INDEX_REFRESH_QUERIES) and persist, or reload the owner's snapshot; then
+        expire old postings.
+        """
+        owner = self.owns_snapshot()
+        if owner:
+            for query, location in list(self.index.hot_queries)[-JOB_INDEX_REFRESH_QUERIES:]:
+                await self.ingest(query, location)
+        else:
+            reloaded = await self.index.reload_async()
+            if reloaded:
+                print(f"DEBUG: Reloaded {reloaded} job postings from the shared snapshot")
+        expired = self.index.expire()
+        if expired:
+            print(f"DEBUG: Expired {expired} job postings")
+        self.schedule_refit()
+        if owner:
+            await self.index.save_async()
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Job index refresh failed: {e}")
+
+    def start(self, interval: float = JOB_INDEX_REFRESH_INTERVAL):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+        self.schedule_refit()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._refit_task is not None:
+            self._refit_task.cancel()
+            self._refit_task = None
+        if self.owns_snapshot():
+            await self.index.save_async()
+        self._release_snapshot()
+
+
+async def _adzuna_source(query: str, location: str) -> List[dict]:
+    from .job_source import fetch_adzuna_jobs
+    return await fetch_adzuna_jobs(query, location=location, fresh=True)
+
+
+job_index = JobIndex()
+job_ingestor = JobIngestor(job_index, {"adzuna": _adzuna_source})
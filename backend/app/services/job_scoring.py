@@ -0,0 +1,235 @@
+import os
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from ..utils.skill_matcher import get_skill_matcher
+from ..utils.skill_taxonomy import EMPTY_IDS, SkillScope, SkillTaxonomy, get_taxonomy
+from ..utils.text_embedding import HashingEmbedder
+
+# A job skill whose name embedding is this close to a missing profile skill counts as related
+RELATED_SKILL_THRESHOLD = float(os.getenv("RELATED_SKILL_THRESHOLD", 0.6))
+# Fraction of an exact match a related skill is worth (0 disables related-skill credit)
+RELATED_SKILL_CREDIT = float(os.getenv("RELATED_SKILL_CREDIT", 0.5))
+# Share of the ranking taken by profile/job text similarity when one is given
+SEMANTIC_WEIGHT = float(os.getenv("SEMANTIC_WEIGHT", 0.3))
+
+_skill_embedder = HashingEmbedder()
+
+
+@lru_cache(maxsize=4096)
+def skill_vector(name: str) -> np.ndarray:
+    """Embedding of a skill name (unweighted n-grams: names are too short for IDF to help)."""
+    return _skill_embedder.embed([name])[0]
+
+
+@lru_cache(maxsize=4)
+def _static_skill_vectors(taxonomy: SkillTaxonomy) -> np.ndarray:
+    return _skill_embedder.embed(taxonomy.names(range(taxonomy.static_size)))
+
+
+def skill_vectors(ids: np.ndarray, scope: SkillScope) -> np.ndarray:
+    """(len(ids), dim) name embeddings of skill ids; the taxonomy's own skills are embedded once."""
+    static = _static_skill_vectors(scope.taxonomy)
+    out = static[np.minimum(ids, len(static) - 1)] if len(static) else np.zeros((len(ids), _skill_embedder.dim), np.float32)
+    for i in np.flatnonzero(ids >= len(static)).tolist():
+        out[i] = skill_vector(scope.name(int(ids[i])))
+    return out
+
+
+def job_text(job: dict) -> str:
+    """Text of a normalized job posting that skills are matched against."""
+    return " ".join(str(job.get(field, "")) for field in ("title", "description", "category"))
+
+
+class JobScoringEngine:
+    """
+    Scores many jobs against many profiles in one vectorized pass.
+
+    Skills are compared as taxonomy ids, so aliases match ("k8s" in a profile, "kubernetes"
+    in a posting). Profiles and jobs become boolean incidence matrices over a shared
+    vocabulary (the union of the profiles' skill ids). Overlap counts for every
+    (profile, job) pair come from a single matrix product; matching/missing skill lists are
+    only materialized for the top-k jobs of each profile.
+
+    Profile skills a job does not mention, but which are close (by name embedding) to a skill
+    it does mention, earn RELATED_SKILL_CREDIT of a match. Given a profile/job similarity,
+    ranking blends it in with SEMANTIC_WEIGHT; exact skill overlap still dominates.
+    """
+
+    def __init__(self, profile_skills: List[Iterable[str]], taxonomy: Optional[SkillTaxonomy] = None):
+        self.taxonomy = taxonomy or get_taxonomy()
+        # Profile skills outside the taxonomy get ids local to this engine
+        self.skills = SkillScope(self.taxonomy)
+        self.profile_ids = [self.skills.ids(skills) for skills in profile_skills]
+        all_ids = np.concatenate(self.profile_ids) if self.profile_ids else EMPTY_IDS
+        _, first = np.unique(all_ids, return_index=True)
+        self.vocabulary_ids = all_ids[np.sort(first)]
+        self.vocabulary: List[str] = self.skills.names(self.vocabulary_ids.tolist())
+        self._sorted_order = np.argsort(self.vocabulary_ids, kind="stable")
+        self._sorted_ids = self.vocabulary_ids[self._sorted_order]
+        # Every spelling of the vocabulary's skills -> id. Jobs without ids from ingest are
+        # scanned with an automaton over just these; skills outside the taxonomy are in neither
+        # the taxonomy's automaton nor the ingest ids, so they are always scanned for.
+        self.spelling_ids = {
+            spelling: skill_id
+            for skill_id in self.vocabulary_ids.tolist()
+            for spelling in self.skills.spellings(skill_id)
+        }
+        self.matcher = get_skill_matcher(self.spelling_ids)
+        dynamic = [name for skill_id, name in zip(self.vocabulary_ids.tolist(), self.vocabulary)
+                   if not self.skills.is_static(skill_id)]
+        self.dynamic_matcher = get_skill_matcher(dynamic) if dynamic else None
+        self.profiles = self.incidence(self.profile_ids)  # (M, V)
+        self.profile_sizes = self.profiles.sum(axis=1)
+
+    @staticmethod
+    def _flatten(id_lists: List[np.ndarray]):
+        """(all ids, row of each id) of a list of id arrays."""
+        if not id_lists:
+            return EMPTY_IDS, np.empty(0, dtype=np.int64)
+        return np.concatenate(id_lists), np.repeat(np.arange(len(id_lists)), [len(ids) for ids in id_lists])
+
+    def incidence(self, id_lists: List[np.ndarray], flattened=None) -> np.ndarray:
+        """(rows, V) matrix marking which vocabulary ids each row's id array contains."""
+        matrix = np.zeros((len(id_lists), len(self.vocabulary_ids)), dtype=bool)
+        if not len(self._sorted_ids) or not id_lists:
+            return matrix
+        flat, rows = flattened if flattened is not None else self._flatten(id_lists)
+        pos = np.minimum(np.searchsorted(self._sorted_ids, flat), len(self._sorted_ids) - 1)
+        hit = self._sorted_ids[pos] == flat
+        matrix[rows[hit], self._sorted_order[pos[hit]]] = True
+        return matrix
+
+    def job_skill_ids(self, jobs: List[dict], known: Optional[List[Optional[np.ndarray]]] = None) -> List[np.ndarray]:
+        """
+        Vocabulary skill ids per job: the ids precomputed at ingest (JobIndex) where given,
+        otherwise one text scan per job.
+        """
+        result = []
+        for i, job in enumerate(jobs):
+            ids = known[i] if known is not None else None
+            if ids is None:
+                found = self.matcher.find(job_text(job))
+                ids = np.array([self.spelling_ids[spelling] for spelling in found], dtype=np.int32)
+            elif self.dynamic_matcher is not None:
+                found = self.dynamic_matcher.find(job_text(job))
+                if found:
+                    ids = np.concatenate([ids, [self.spelling_ids[spelling] for spelling in found]]).astype(np.int32)
+            result.append(ids)
+        return result
+
+    def job_incidence(self, jobs: List[dict], known: Optional[List[Optional[np.ndarray]]] = None) -> np.ndarray:
+        """(N, V) matrix of which vocabulary skills each job mentions."""
+        return self.incidence(self.job_skill_ids(jobs, known))
+
+    def related_incidence(self, job_ids: List[np.ndarray], job_matrix: np.ndarray, flattened=None) -> np.ndarray:
+        """
+        (N, V) matrix of vocabulary skills a job does not mention but has a related skill for.
+        Only skills in `job_ids` are considered, so jobs scanned without ingest ids only relate
+        skills within the vocabulary.
+        """
+        related = np.zeros_like(job_matrix)
+        if RELATED_SKILL_CREDIT <= 0 or not len(self.vocabulary_ids) or not job_ids:
+            return related
+        flat, rows = flattened if flattened is not None else self._flatten(job_ids)
+        universe, columns = np.unique(flat, return_inverse=True)
+        if not len(universe):
+            return related
+        vocab_vectors = skill_vectors(self.vocabulary_ids, self.skills)
+        close = (vocab_vectors @ skill_vectors(universe, self.skills).T) >= RELATED_SKILL_THRESHOLD  # (V, U)
+        close &= self.vocabulary_ids[:, None] != universe[None, :]
+        if not close.any():
+            return related
+        jobs_universe = np.zeros((len(job_ids), len(universe)), dtype=np.float32)
+        jobs_universe[rows, columns] = 1
+        return ((jobs_universe @ close.T.astype(np.float32)) > 0) & ~job_matrix
+
+    def score_matrix(self, job_matrix: np.ndarray, related: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        (M, N) integer match percentages: share of each profile's skills found in each job,
+        related skills counting RELATED_SKILL_CREDIT each.
+        """
+        # float32 matmul goes through BLAS and is exact for counts far beyond any vocabulary size
+        profiles = self.profiles.astype(np.float32)
+        overlap = profiles @ job_matrix.T.astype(np.float32)
+        if related is not None:
+            overlap += RELATED_SKILL_CREDIT * (profiles @ related.T.astype(np.float32))
+        sizes = np.maximum(self.profile_sizes, 1)[:, None]
+        return np.where(self.profile_sizes[:, None] > 0, (overlap * 100) // sizes, 0).astype(np.int32)
+
+    @staticmethod
+    def blend(scores: np.ndarray, similarity: np.ndarray) -> np.ndarray:
+        """Ranking keys mixing match percentages with similarities (0-1, per job or per pair), in tenths of a percent."""
+        semantic = np.clip(np.broadcast_to(similarity, scores.shape), 0, 1) * 100
+        return np.rint(((1 - SEMANTIC_WEIGHT) * scores + SEMANTIC_WEIGHT * semantic) * 10).astype(np.int64)
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+        """
+        (M, k) job indices per profile, best first. Ties keep the original job order,
+        like the stable sort this replaces.
+        """
+        m, n = scores.shape
+        k = n if k is None else max(0, min(k, n))
+        # Unique composite key: higher score first, then lower job index
+        keys = scores.astype(np.int64) * n + (n - 1 - np.arange(n))
+        if k < n:
+            part = np.argpartition(-keys, k - 1, axis=1)[:, :k] if k else np.empty((m, 0), dtype=np.int64)
+        else:
+            part = np.broadcast_to(np.arange(n), (m, n))
+        order = np.argsort(-np.take_along_axis(keys, part, axis=1), axis=1)
+        return np.take_along_axis(part, order, axis=1)
+
+    def rank(self, jobs: List[dict], top_k: Optional[int] = None,
+             job_skill_ids: Optional[List[Optional[np.ndarray]]] = None,
+             similarity: Optional[np.ndarray] = None) -> List[List[dict]]:
+        """
+        For each profile, the top-k jobs as {"job_index", "match_percentage", "matching_skills",
+        "related_skills", "missing_skills"} (plus "similarity" when given).
+        `missing_skills` are the profile's skills the job neither mentions nor has a related
+        skill for (canonical names).
+        `job_skill_ids` optionally carries each job's skill ids from ingest, sparing the text scan.
+        `similarity` is a (N,) or (M, N) profile/job text similarity blended into the ranking.
+        """
+        if not jobs:
+            return [[] for _ in self.profile_ids]
+        job_ids = self.job_skill_ids(jobs, job_skill_ids)
+        flattened = self._flatten(job_ids)
+        job_matrix = self.incidence(job_ids, flattened)
+        related = self.related_incidence(job_ids, job_matrix, flattened)
+        scores = self.score_matrix(job_matrix, related)
+        if similarity is not None:
+            similarity = np.broadcast_to(np.asarray(similarity, dtype=np.float32), scores.shape)
+            best = self.top_k(self.blend(scores, similarity), top_k)
+        else:
+            best = self.top_k(scores, top_k)
+
+        vocab = np.array(self.vocabulary, dtype=object)
+        results = []
+        for m, job_indices in enumerate(best):
+            profile_row = self.profiles[m]
+            ranked = []
+            for n in job_indices:
+                hits = profile_row & job_matrix[n]
+                close = profile_row & related[n]
+                result = {
+                    "job_index": int(n),
+                    "match_percentage": int(scores[m, n]),
+                    "matching_skills": vocab[hits].tolist(),
+                    "related_skills": vocab[close].tolist(),
+                    "missing_skills": vocab[profile_row & ~hits & ~close].tolist(),
+                }
+                if similarity is not None:
+                    result["similarity"] = round(float(similarity[m, n]), 3)
+                ranked.append(result)
+            results.append(ranked)
+        return results
+
+
+def rank_jobs_for_profiles(profile_skills: List[Iterable[str]], jobs: List[dict], top_k: Optional[int] = None,
+                           job_skill_ids: Optional[List[Optional[np.ndarray]]] = None,
+                           similarity: Optional[np.ndarray] = None) -> List[List[dict]]:
+    """Batch entry point: scores a page of jobs against many profiles at once."""
+    return JobScoringEngine(profile_skills).rank(jobs, top_k, job_skill_ids, similarity)
@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+import os
+from typing import Dict, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from ..utils.ttl_cache import TTLCache
+from ..utils.metrics import register_cache, track_dependency
+
+load_dotenv()
+
+ADZUNA_APP_ID = os.getenv("ADZUNA_APP_ID", "679d6946")
+ADZUNA_API_KEY = os.getenv("ADZUNA_API_KEY", "34a6b99b5aa3f77e94d96629aacbdbef")
+ADZUNA_BASE_URL = os.getenv("ADZUNA_BASE_URL", "https://api.adzuna.com/v1/api/jobs")
+
+# Number of result pages fetched (concurrently) per search
+ADZUNA_PAGES = int(os.getenv("ADZUNA_PAGES", 3))
+
+# Connection pool settings, shared by every request on this worker
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 50))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", 20))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+HTTP_PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", 10))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 10))
+
+# Normalized search results keyed on (query, location, page, results_per_page)
+JOB_CACHE_SIZE = int(os.getenv("JOB_CACHE_SIZE", 2048))
+JOB_CACHE_TTL = float(os.getenv("JOB_CACHE_TTL", 600))
+JOB_CACHE_STALE_TTL = float(os.getenv("JOB_CACHE_STALE_TTL", 1800))
+
+job_search_cache = TTLCache(maxsize=JOB_CACHE_SIZE, ttl=JOB_CACHE_TTL, stale_ttl=JOB_CACHE_STALE_TTL,
+                            name="adzuna_page")
+register_cache("adzuna_search", job_search_cache)
+
+
+class JobSourceClient:
+    """Shared, pooled async HTTP client for external job APIs (keep-alive, bounded connections)."""
+    _client: Optional[httpx.AsyncClient] = None
+    _host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        if cls._client is None or cls._client.is_closed:
+            cls._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(HTTP_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return cls._client
+
+    @classmethod
+    def host_limit(cls, host: str) -> asyncio.Semaphore:
+        # httpx only bounds the pool as a whole, so cap in-flight requests per host ourselves
+        if host not in cls._host_limits:
+            cls._host_limits[host] = asyncio.Semaphore(HTTP_PER_HOST_LIMIT)
+        return cls._host_limits[host]
+
+    @classmethod
+    async def get_json(cls, url: str, params: dict = None) -> dict:
+        client = cls.get_client()
+        async with cls.host_limit(httpx.URL(url).host):
+            response = await client.get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    @classmethod
+    async def close(cls):
+        if cls._client is not None:
+            await cls._client.aclose()
+        cls._client = None
+        cls._host_limits = {}
+
+
+def fallback_job_id(job: dict) -> str:
+    """
+    Stable id for a posting Adzuna returned without one: the persistent job index keys
+    postings by id, so it must not depend on the result's position in a page.
+    """
+    identity = job.get("redirect_url") or "|".join((
+        str(job.get("title") or ""),
+        str((job.get("company") or {}).get("display_name") or ""),
+        str((job.get("location") or {}).get("display_name") or ""),
+    ))
+    return "adzuna_" + hashlib.sha1(identity.encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_adzuna_job(job: dict) -> dict:
+    description = job.get("description", "")
+    return {
+        "id": job["id"] if job.get("id") is not None else fallback_job_id(job),
+        "title": job.get("title"),
+        "company": job.get("company", {}).get("display_name", "Company Name"),
+        "location": job.get("location", {}).get("display_name", "Remote"),
+        "salary_min": job.get("salary_min"),
+        "salary_max": job.get("salary_max"),
+        # Full text is kept for indexing/matching; routes truncate it for display
+        "description": description if description else "No description",
+        "apply_link": job.get("redirect_url"),
+        "posted_date": job.get("created"),
+        "contract_type": job.get("contract_type"),
+        "category": job.get("category", {}).get("label", "General"),
+    }
+
+
+async def fetch_adzuna_page(query: str, location: str = "in", page: int = 1, results_per_page: int = 20) -> List[dict]:
+    """Fetches and normalizes a single Adzuna result page. Raises on HTTP errors."""
+    url = f"{ADZUNA_BASE_URL}/{location}/search/{page}"
+    params = {
+        "app_id": ADZUNA_APP_ID,
+        "app_key": ADZUNA_API_KEY,
+        "results_per_page": results_per_page,
+        "what": query,
+        "content-type": "application/json"
+    }
+    with track_dependency("adzuna", "search"):
+        data = await JobSourceClient.get_json(url, params=params)
+    return [normalize_adzuna_job(job) for job in data.get("results", [])]
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+async def fetch_adzuna_page_cached(query: str, location: str = "in", page: int = 1, results_per_page: int = 20) -> List[dict]:
+    """Cached `fetch_adzuna_page`: stale pages are served while one background refresh runs."""
+    query = normalize_query(query)
+    key = (query, location, page, results_per_page)
+    return await job_search_cache.get_or_load(
+        key, lambda: fetch_adzuna_page(query, location, page, results_per_page)
+    )
+
+
+async def fetch_adzuna_page_fresh(query: str, location: str = "in", page: int = 1, results_per_page: int = 20) -> List[dict]:
+    """Uncached `fetch_adzuna_page` (stale entries are not served); the result is cached for other readers."""
+    query = normalize_query(query)
+    jobs = await fetch_adzuna_page(query, location, page, results_per_page)
+    job_search_cache.set((query, location, page, results_per_page), jobs)
+    return jobs
+
+
+async def fetch_adzuna_jobs(query: str, location: str = "in", results_per_page: int = 20, pages: int = ADZUNA_PAGES,
+                            fresh: bool = False) -> List[dict]:
+    """
+    Fetches several Adzuna pages concurrently and merges them (deduplicated by job id).
+    With `fresh`, the cache is bypassed (the job index needs to know the postings are live).
+    """
+    fetch_page = fetch_adzuna_page_fresh if fresh else fetch_adzuna_page_cached
+    results = await asyncio.gather(
+        *(fetch_page(query, location, page, results_per_page) for page in range(1, pages + 1)),
+        return_exceptions=True,
+    )
+
+    jobs = []
+    seen_ids = set()
+    for page_result in results:
+        if isinstance(page_result, Exception):
+            print(f"Error fetching Adzuna jobs: {page_result}")
+            continue
+        for job in page_result:
+            if job["id"] in seen_ids:
+                continue
+            seen_ids.add(job["id"])
+            jobs.append(job)
+    return jobs
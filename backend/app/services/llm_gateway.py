@@ -0,0 +1,107 @@
+import asyncio
+import os
+import random
+
+from ..ai_client import get_ai_client, MODEL_NAME
+from ..utils.metrics import track_dependency
+from ..utils.tracing import span
+
+# Per-worker cap on concurrent in-flight Gemini calls
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 3))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 1.0))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", 8.0))
+
+RETRYABLE_CODES = {429, 500, 503}
+
+
+def is_retryable(error: Exception) -> bool:
+    code = getattr(error, "code", None)
+    if code in RETRYABLE_CODES:
+        return True
+    message = str(error)
+    return "429" in message or "RESOURCE_EXHAUSTED" in message or "UNAVAILABLE" in message
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(max, base * 2**attempt)]."""
+    return random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt))
+
+
+class LLMGateway:
+    """
+    Async access to the shared Gemini client (AIClient singleton).
+
+    Uses the SDK's async surface, bounds concurrent calls per worker and retries
+    rate-limit/unavailable errors with jittered backoff via asyncio.sleep, so a throttled
+    request never blocks the event loop. Backoff sleeps do not hold a concurrency slot.
+    """
+    _semaphore = None
+
+    @classmethod
+    def semaphore(cls) -> asyncio.Semaphore:
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        return cls._semaphore
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return get_ai_client() is not None
+
+    @classmethod
+    async def generate_content(cls, contents, config=None, model: str = MODEL_NAME):
+        client = get_ai_client()
+        if not client:
+            raise Exception("AI Client not initialized")
+
+        for attempt in range(LLM_MAX_RETRIES):
+            try:
+                async with cls.semaphore():
+                    with track_dependency("gemini", "generate_content"):
+                        return await client.aio.models.generate_content(
+                            model=model,
+                            contents=contents,
+                            config=config
+                        )
+            except Exception as e:
+                if is_retryable(e) and attempt < LLM_MAX_RETRIES - 1:
+                    delay = backoff_delay(attempt + 1)
+                    print(f"DEBUG: Gemini call failed ({e}). Retrying in {delay:.1f} seconds...")
+                    with span("gemini.backoff", attempt=attempt + 1, delay=round(delay, 3)):
+                        await asyncio.sleep(delay)
+                    continue
+                raise
+
+    @classmethod
+    async def generate_content_stream(cls, contents, config=None, model: str = MODEL_NAME):
+        """
+        Yields text chunks as Gemini produces them. Retries only happen before the first
+        chunk; an error mid-stream is raised to the caller.
+        """
+        client = get_ai_client()
+        if not client:
+            raise Exception("AI Client not initialized")
+
+        for attempt in range(LLM_MAX_RETRIES):
+            started = False
+            try:
+                async with cls.semaphore():
+                    with track_dependency("gemini", "generate_content_stream"):
+                        stream = await client.aio.models.generate_content_stream(
+                            model=model,
+                            contents=contents,
+                            config=config
+                        )
+                        async for chunk in stream:
+                            if chunk.text:
+                                started = True
+                                yield chunk.text
+                return
+            except Exception as e:
+                if not started and is_retryable(e) and attempt < LLM_MAX_RETRIES - 1:
+                    delay = backoff_delay(attempt + 1)
+                    print(f"DEBUG: Gemini stream failed ({e}). Retrying in {delay:.1f} seconds...")
+                    with span("gemini.backoff", attempt=attempt + 1, delay=round(delay, 3)):
+                        await asyncio.sleep(delay)
+                    continue
+                raise
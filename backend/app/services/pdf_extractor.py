@@ -0,0 +1,278 @@
+import asyncio
+import concurrent.futures
+import io
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", 10 * 1024 * 1024))
+# Whole multipart request body allowed for an upload: the PDF plus boundaries and headers
+PDF_UPLOAD_MAX_BODY = PDF_MAX_BYTES + 64 * 1024
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 50))        # pages beyond this are ignored
+PDF_TIMEOUT = float(os.getenv("PDF_TIMEOUT", 20))
+# Extra wait past PDF_TIMEOUT for a worker to stop by itself before the pool is recycled
+PDF_TIMEOUT_GRACE = float(os.getenv("PDF_TIMEOUT_GRACE", 2))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", min(4, os.cpu_count() or 1)))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 12))
+PDF_SPOOL_MAX_MEMORY = int(os.getenv("PDF_SPOOL_MAX_MEMORY", 1024 * 1024))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# A PDF is either held in memory (small uploads) or referenced by a temp file path
+PDFSource = Union[bytes, str]
+
+
+class PDFExtractionError(Exception):
+    status_code = 400
+
+
+class PDFTooLargeError(PDFExtractionError):
+    status_code = 413
+
+
+class PDFWorkerTimeout(Exception):
+    """Raised inside a pool worker when its extraction passes the request's deadline."""
+
+
+# --------------------------
+# WORKER FUNCTIONS (run in the process pool)
+# --------------------------
+def _open_reader(source: PDFSource):
+    import PyPDF2
+    stream = io.BytesIO(source) if isinstance(source, bytes) else open(source, "rb")
+    return PyPDF2.PdfReader(stream)
+
+
+def _warm_worker() -> int:
+    import PyPDF2  # noqa: F401 - pays the import in the worker before the first upload
+    return os.getpid()
+
+
+def _on_deadline(signum, frame):
+    raise PDFWorkerTimeout("PDF extraction passed its deadline")
+
+
+def _call_with_deadline(deadline: float, fn, *args):
+    """
+    Runs `fn` in the worker with a SIGALRM at the wall-clock `deadline`, so a hostile PDF stops
+    occupying the worker once the request has given up on it. Without SIGALRM (Windows) the
+    pool is recycled instead (see extract_pdf_text).
+    """
+    if not hasattr(signal, "setitimer"):
+        return fn(*args)
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise PDFWorkerTimeout("PDF extraction passed its deadline")
+    previous = signal.signal(signal.SIGALRM, _on_deadline)
+    signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        return fn(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _extract_range(source: PDFSource, start: int, end: int) -> str:
+    reader = _open_reader(source)
+    return " ".join(reader.pages[i].extract_text() or "" for i in range(start, end))
+
+
+def _extract_small(source: PDFSource, max_pages: int, parallel_min_pages: int):
+    """Extracts the whole document if it is short; otherwise only reports its page count."""
+    reader = _open_reader(source)
+    page_count = min(len(reader.pages), max_pages)
+    if page_count >= parallel_min_pages:
+        return None, page_count
+    return " ".join(reader.pages[i].extract_text() or "" for i in range(page_count)), page_count
+
+
+# --------------------------
+# POOL + UPLOAD HANDLING
+# --------------------------
+class _TrackedPool(ProcessPoolExecutor):
+    """ProcessPoolExecutor that knows its unfinished futures (see PDFPool.retire)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.inflight = set()
+        self._inflight_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = super().submit(fn, *args, **kwargs)
+        with self._inflight_lock:
+            self.inflight.add(future)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        with self._inflight_lock:
+            self.inflight.discard(future)
+
+    def unfinished(self) -> set:
+        with self._inflight_lock:
+            return set(self.inflight)
+
+
+class PDFPool:
+    _executor: Optional[_TrackedPool] = None
+    _lock = threading.Lock()  # the warm-up thread may create the pool concurrently with a request
+
+    @classmethod
+    def get_executor(cls) -> _TrackedPool:
+        with cls._lock:
+            if cls._executor is None:
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                cls._executor = _TrackedPool(
+                    max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn")
+                )
+            return cls._executor
+
+    @classmethod
+    def warm_up(cls):
+        """Spawns the workers and imports PyPDF2 in them (blocking)."""
+        executor = cls.get_executor()
+        futures = [executor.submit(_warm_worker) for _ in range(PDF_WORKERS)]
+        return {future.result() for future in futures}
+
+    @classmethod
+    def shutdown(cls):
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def retire(cls, executor: _TrackedPool, stuck):
+        """
+        Takes a pool with a stuck worker out of service without failing other requests: new
+        work goes to a fresh pool, while the old one finishes its other futures (each bounded
+        by its own deadline); then its processes, the stuck one included, are killed.
+        """
+        with cls._lock:
+            if cls._executor is executor:
+                cls._executor = None
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False)
+
+        def reap():
+            concurrent.futures.wait(executor.unfinished() - set(stuck), timeout=PDF_TIMEOUT + PDF_TIMEOUT_GRACE)
+            for process in processes:
+                process.terminate()
+
+        threading.Thread(target=reap, name="pdf-pool-reaper", daemon=True).start()
+
+
+class SpooledUpload:
+    """
+    Upload buffer that stays in memory up to PDF_SPOOL_MAX_MEMORY and then spills to a
+    named temp file, so pool workers can open large PDFs by path instead of receiving a copy.
+    """
+
+    def __init__(self, max_memory: int = PDF_SPOOL_MAX_MEMORY):
+        self.max_memory = max_memory
+        self.size = 0
+        self._buffer = io.BytesIO()
+        self._file = None
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self._file is None and self.size > self.max_memory:
+            self._file = tempfile.NamedTemporaryFile(prefix="resume_", suffix=".pdf", delete=False)
+            self._file.write(self._buffer.getvalue())
+            self._buffer = None
+        (self._file or self._buffer).write(chunk)
+
+    def source(self) -> PDFSource:
+        if self._file is None:
+            return self._buffer.getvalue()
+        self._file.flush()
+        return self._file.name
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            os.unlink(self._file.name)
+            self._file = None
+
+
+async def spool_upload(file, max_bytes: int = PDF_MAX_BYTES) -> SpooledUpload:
+    """
+    Streams an UploadFile in chunks, enforcing the byte limit without trusting Content-Length.
+    The request body as a whole is already capped by BodySizeLimitMiddleware (PDF_UPLOAD_MAX_BODY).
+    """
+    too_large = PDFTooLargeError(f"PDF exceeds the {max_bytes / (1024 * 1024):.1f} MB limit")
+    if (getattr(file, "size", None) or 0) > max_bytes:
+        raise too_large
+    spooled = SpooledUpload()
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            if spooled.size + len(chunk) > max_bytes:
+                raise too_large
+            spooled.write(chunk)
+    except Exception:
+        spooled.close()
+        raise
+    return spooled
+
+
+async def extract_pdf_text(source: PDFSource, max_pages: int = PDF_MAX_PAGES, timeout: float = PDF_TIMEOUT) -> str:
+    """
+    Extracts text in the process pool. Short documents are handled by one worker; longer ones
+    are split into page ranges extracted in parallel. Raises PDFExtractionError on failure or timeout.
+
+    Workers stop themselves at the deadline. If one is still busy PDF_TIMEOUT_GRACE seconds
+    later (stuck outside Python code), its pool is retired and replaced, so slow uploads cannot
+    hold every worker and make all later uploads time out; other requests' extractions on
+    the old pool still complete.
+    """
+    executor = PDFPool.get_executor()
+    deadline = time.time() + timeout
+    submitted = []
+
+    def submit(fn, *args):
+        future = executor.submit(_call_with_deadline, deadline, fn, *args)
+        submitted.append(future)
+        return asyncio.wrap_future(future)
+
+    async def run():
+        text, page_count = await submit(_extract_small, source, max_pages, PDF_PARALLEL_MIN_PAGES)
+        if text is not None:
+            return text
+        chunk = -(-page_count // PDF_WORKERS)
+        parts = await asyncio.gather(*(
+            submit(_extract_range, source, start, min(start + chunk, page_count))
+            for start in range(0, page_count, chunk)
+        ))
+        return " ".join(parts)
+
+    try:
+        return await asyncio.wait_for(run(), timeout + PDF_TIMEOUT_GRACE)
+    except PDFWorkerTimeout:
+        raise PDFExtractionError(f"PDF extraction timed out after {timeout:.0f}s")
+    except asyncio.TimeoutError:
+        PDFPool.retire(executor, [future for future in submitted if not future.done()])
+        raise PDFExtractionError(f"PDF extraction timed out after {timeout:.0f}s")
+    except PDFExtractionError:
+        raise
+    except BrokenProcessPool as e:
+        PDFPool.shutdown()  # a worker died (e.g. OOM on a hostile PDF); start fresh next time
+        raise PDFExtractionError(f"PDF Error: {e}")
+    except Exception as e:
+        raise PDFExtractionError(f"PDF Error: {e}")
+
+
+async def extract_upload_text(file) -> str:
+    """Spools an UploadFile and extracts its text without blocking the event loop."""
+    spooled = await spool_upload(file)
+    try:
+        return await extract_pdf_text(spooled.source())
+    finally:
+        spooled.close()
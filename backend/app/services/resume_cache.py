@@ -0,0 +1,24 @@
+import hashlib
+import os
+
+from ..ai_client import MODEL_NAME
+from ..utils.ttl_cache import TTLCache
+from ..utils.metrics import register_cache
+from .ai_resume import PROMPT_VERSION
+
+RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", 5000))
+RESUME_CACHE_TTL = float(os.getenv("RESUME_CACHE_TTL", 7 * 24 * 3600))
+
+# Only authoritative (AI-parsed) results are stored here
+resume_analysis_cache = TTLCache(maxsize=RESUME_CACHE_SIZE, ttl=RESUME_CACHE_TTL)
+register_cache("resume_analysis", resume_analysis_cache)
+
+
+def resume_cache_key(text: str) -> str:
+    """Hash of the whitespace-normalized resume text plus the prompt and model version."""
+    normalized = " ".join(text.split())
+    digest = hashlib.sha256()
+    for part in (MODEL_NAME, PROMPT_VERSION, normalized):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
@@ -0,0 +1,77 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.ttl_cache import TTLCache
+from ..utils.metrics import register_cache
+from ..utils.skill_taxonomy import SkillScope, get_taxonomy, missing_mask
+
+ROADMAP_ROLE_CACHE_SIZE = int(os.getenv("ROADMAP_ROLE_CACHE_SIZE", 1000))
+ROADMAP_SKILL_CACHE_SIZE = int(os.getenv("ROADMAP_SKILL_CACHE_SIZE", 10000))
+ROADMAP_CACHE_TTL = float(os.getenv("ROADMAP_CACHE_TTL", 7 * 24 * 3600))
+
+
+def normalize_key(value: str) -> str:
+    return " ".join(value.lower().split())
+
+
+def skill_cache_key(skill: str) -> str:
+    """Aliases share one cache entry ("k8s", "Kubernetes")."""
+    return get_taxonomy().canonical(skill)
+
+
+def missing_skills_for(required_skills: List[str], user_skills: List[str]) -> List[str]:
+    """
+    Required skills the user lacks, compared as taxonomy ids (so "JS" covers "javascript").
+    Skills outside the taxonomy get ids local to this call, so they still match each other.
+    """
+    scope = SkillScope(get_taxonomy())
+    missing = missing_mask(scope.id_array(required_skills), scope.ids(user_skills))
+    return [skill for skill, lacking in zip(required_skills, missing.tolist()) if lacking]
+
+
+class RoadmapCache:
+    """
+    Two-level cache for AI roadmaps: required skills per normalized job role, and learning
+    resources per canonical skill. Roadmaps are assembled from cached parts so Gemini is only
+    asked about skills nobody has requested yet.
+    """
+
+    def __init__(self, role_size: int = ROADMAP_ROLE_CACHE_SIZE, skill_size: int = ROADMAP_SKILL_CACHE_SIZE, ttl: float = ROADMAP_CACHE_TTL):
+        self.roles = TTLCache(maxsize=role_size, ttl=ttl)
+        self.skills = TTLCache(maxsize=skill_size, ttl=ttl)
+
+    def required_skills(self, job_role: str) -> Optional[List[str]]:
+        return self.roles.get(normalize_key(job_role))
+
+    def store_required_skills(self, job_role: str, required_skills: List[str]):
+        if required_skills:
+            self.roles.set(normalize_key(job_role), list(required_skills))
+
+    def resources_for(self, skills: List[str]) -> Tuple[Dict[str, dict], List[str]]:
+        """Returns ({skill: resources} for cached skills, [skills not cached])."""
+        found, uncached = {}, []
+        for skill in skills:
+            resources = self.skills.get(skill_cache_key(skill))
+            if resources is None:
+                uncached.append(skill)
+            else:
+                found[skill] = resources
+        return found, uncached
+
+    def store_resources(self, skill: str, resources: dict):
+        if isinstance(resources, dict) and resources:
+            self.skills.set(skill_cache_key(skill), resources)
+
+    def store(self, job_role: str, result: dict):
+        """Splits a full AI roadmap result into its cacheable parts."""
+        self.store_required_skills(job_role, result.get("required_skills", []))
+        for skill, resources in (result.get("learning_roadmap") or {}).items():
+            self.store_resources(skill, resources)
+
+    def stats(self) -> dict:
+        return {"roles": self.roles.stats(), "skills": self.skills.stats()}
+
+
+roadmap_cache = RoadmapCache()
+register_cache("roadmap_roles", roadmap_cache.roles)
+register_cache("roadmap_skills", roadmap_cache.skills)
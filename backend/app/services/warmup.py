@@ -0,0 +1,48 @@
+import asyncio
+import os
+import time
+
+# "background" (default): warm up after startup without delaying readiness
+# "blocking": finish warming up before the app accepts requests
+# "off": pay every cost on first use
+APP_WARMUP = os.getenv("APP_WARMUP", "background").lower()
+
+
+def warm_up():
+    """
+    Loads what the first requests would otherwise pay for: the Gemini client (google.genai),
+    passlib/argon2, jose, PyPDF2 in the PDF pool workers, the skill taxonomy automaton and
+    the skill name embeddings used for related-skill credit.
+    """
+    from ..ai_client import get_ai_client
+    from ..auth_utils import get_pwd_context
+    from ..utils.skill_taxonomy import EMPTY_IDS, SkillScope, get_taxonomy
+    from .job_scoring import skill_vectors
+    from .pdf_extractor import PDFPool
+
+    steps = [
+        ("gemini client", get_ai_client),
+        ("password hashing", lambda: get_pwd_context().handler("argon2").get_backend()),
+        ("jwt", lambda: __import__("jose.jwt")),
+        ("skill taxonomy", lambda: get_taxonomy().matcher()),
+        ("skill embeddings", lambda: skill_vectors(EMPTY_IDS, SkillScope(get_taxonomy()))),
+        ("pdf workers", PDFPool.warm_up),
+    ]
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+            print(f"DEBUG: Warm-up {name}: {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            print(f"WARNING: Warm-up {name} failed: {e}")
+
+
+async def start_warmup():
+    """Runs `warm_up` per APP_WARMUP; returns the background task, if any."""
+    if APP_WARMUP == "off":
+        return None
+    task = asyncio.ensure_future(asyncio.to_thread(warm_up))
+    if APP_WARMUP == "blocking":
+        await task
+        return None
+    return task
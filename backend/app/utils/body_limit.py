@@ -0,0 +1,47 @@
+import json
+from typing import Dict
+
+from fastapi import HTTPException
+
+
+class BodySizeLimitMiddleware:
+    """
+    Rejects request bodies over a per-path byte limit before they are buffered (Starlette
+    spools a whole multipart body before the route runs): at once from Content-Length, and
+    as soon as the bytes received pass the limit, for chunked or understated bodies.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body exceeds the {limit / (1024 * 1024):.1f} MB limit"
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            body = json.dumps({"detail": detail}).encode()
+            await send({"type": "http.response.start", "status": 413, "headers": [
+                (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised while the route parses its body; FastAPI re-raises HTTPExceptions from there
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,107 @@
+import json
+from typing import Iterable, List, Tuple
+
+
+class StreamingJSONParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    `feed()` accepts arbitrary text chunks and returns the top-level members that became
+    complete, as (path, value) pairs. Members whose key is in `expand` are not returned
+    whole; their own members are returned one by one instead, e.g. with
+    expand={"learning_roadmap"} each ("learning_roadmap", skill) entry is emitted as soon
+    as it is closed. Text before the first "{" (such as a markdown fence) is ignored.
+    """
+
+    def __init__(self, expand: Iterable[str] = ()):
+        self.expand = set(expand)
+        self.buf = ""
+        self.pos = 0
+        self.stack: List[dict] = []
+        self.started = False
+        self.done = False
+        self.in_string = False
+        self.escape = False
+        self.string_start = 0
+
+    def _wanted(self, path: tuple) -> bool:
+        if len(path) == 1:
+            return path[0] not in self.expand
+        return len(path) == 2 and path[0] in self.expand
+
+    def _complete_value(self, frame: dict, end: int, out: list):
+        path = frame["path"] + (frame["key"],)
+        if self._wanted(path):
+            out.append((path, json.loads(self.buf[frame["value_start"]:end].strip())))
+        frame["value_start"] = None
+        frame["expect"] = "comma"
+
+    def feed(self, chunk: str) -> List[Tuple[tuple, object]]:
+        out = []
+        self.buf += chunk
+        buf = self.buf
+        i = self.pos
+        while i < len(buf) and not self.done:
+            c = buf[i]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    top = self.stack[-1]
+                    if top["kind"] == "obj":
+                        if top["expect"] == "key":
+                            top["key"] = json.loads(buf[self.string_start:i + 1])
+                            top["expect"] = "colon"
+                        elif top["expect"] == "value" and top["value_start"] == self.string_start:
+                            self._complete_value(top, i + 1, out)
+                i += 1
+                continue
+
+            if not self.started:
+                if c == "{":
+                    self.started = True
+                    self.stack.append({"kind": "obj", "path": (), "expect": "key", "key": None, "value_start": None})
+                i += 1
+                continue
+
+            top = self.stack[-1]
+            if c == '"':
+                self.in_string = True
+                self.string_start = i
+                if top["kind"] == "obj" and top["expect"] == "value" and top["value_start"] is None:
+                    top["value_start"] = i
+            elif c == ":":
+                if top["kind"] == "obj":
+                    top["expect"] = "value"
+            elif c in "{[":
+                child_path = top["path"] + ((top["key"],) if top["kind"] == "obj" else ("[]",))
+                if top["kind"] == "obj" and top["expect"] == "value":
+                    top["value_start"] = i
+                self.stack.append({
+                    "kind": "obj" if c == "{" else "arr",
+                    "path": child_path, "expect": "key", "key": None, "value_start": None,
+                })
+            elif c in "}]":
+                if top["kind"] == "obj" and top["expect"] == "value" and top["value_start"] is not None:
+                    self._complete_value(top, i, out)  # trailing scalar member
+                self.stack.pop()
+                if not self.stack:
+                    self.done = True
+                else:
+                    parent = self.stack[-1]
+                    if parent["kind"] == "obj" and parent["expect"] == "value":
+                        self._complete_value(parent, i + 1, out)
+            elif c == ",":
+                if top["kind"] == "obj":
+                    if top["expect"] == "value" and top["value_start"] is not None:
+                        self._complete_value(top, i, out)
+                    top["expect"] = "key"
+            elif not c.isspace():
+                if top["kind"] == "obj" and top["expect"] == "value" and top["value_start"] is None:
+                    top["value_start"] = i  # start of a number/true/false/null
+            i += 1
+        self.pos = i
+        return out
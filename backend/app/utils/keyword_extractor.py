@@ -1,5 +1,7 @@
 import re
 import json
+from functools import lru_cache
+from .skill_taxonomy import bitset, get_taxonomy
 
 class KeywordExtractor:
     # Skill Dictionaries
@@ -30,6 +32,13 @@ class KeywordExtractor:
     # Flattened list for quick lookup
     ALL_SKILLS = set(skill for skills in SKILLS_DB.values() for skill in skills)
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def role_bitsets():
+        """SKILLS_DB as {role: bitset of taxonomy ids}; aliases like "golang"/"go" count once."""
+        taxonomy = get_taxonomy()
+        return {role: bitset(taxonomy.ids(skills).tolist()) for role, skills in KeywordExtractor.SKILLS_DB.items()}
+
     @staticmethod
     def extract_email(text):
         email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
@@ -45,30 +54,19 @@ class KeywordExtractor:
 
     @classmethod
     def extract_skills(cls, text):
-        found_skills = set()
-        text_lower = text.lower()
-        
-        # Simple string matching for now (could use regex for boundary checking)
-        for skill in cls.ALL_SKILLS:
-            # Check for word boundaries to avoid partial matches (e.g., "go" in "google")
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.add(skill)
-        
-        return list(found_skills)
+        # Single linear pass over the text with a precompiled automaton over every taxonomy
+        # spelling; aliases are reported under their canonical name ("k8s" -> "kubernetes").
+        # Word boundaries are respected (e.g., "go" does not match in "google")
+        return get_taxonomy().find(text)
 
     @classmethod
     def infer_role(cls, skills):
         max_count = 0
         best_role = "Backend Developer" # Default fallback
         
-        scores = {role: 0 for role in cls.SKILLS_DB}
-        
-        # Calculate scores based on matched skills
-        for skill in skills:
-            for role, role_skills in cls.SKILLS_DB.items():
-                if skill in role_skills:
-                    scores[role] += 1
+        # Score = size of the overlap between the skill bitset and each role's bitset
+        skill_bits = bitset(get_taxonomy().ids(skills).tolist())
+        scores = {role: (skill_bits & role_bits).bit_count() for role, role_bits in cls.role_bitsets().items()}
         
         # Handle Full Stack Logic (if high frontend AND backend scores)
         if scores["Frontend Developer"] > 2 and scores["Backend Developer"] > 2:
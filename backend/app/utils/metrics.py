@@ -0,0 +1,309 @@
+import asyncio
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from pymongo import monitoring
+
+from .tracing import record_span, span
+
+# Latency buckets in seconds, from sub-millisecond Mongo lookups to slow Gemini calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LOOP_LAG_INTERVAL = float(os.getenv("METRICS_LOOP_LAG_INTERVAL", 0.5))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram. `observe` is a bisect plus two additions under a lock."""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[tuple, list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        bounds = self.buckets + (float("inf"),)
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    Holds metrics and renders them in the Prometheus text exposition format.
+    Collectors are callables returning extra lines, evaluated at scrape time (e.g. cache stats).
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests handled, by route template and status", ("method", "route", "status"))
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streamed bodies", ("method", "route"))
+dependency_requests = registry.counter(
+    "dependency_requests_total", "Calls to external dependencies, by outcome", ("dependency", "operation", "outcome"))
+dependency_duration = registry.histogram(
+    "dependency_request_duration_seconds", "Latency of calls to external dependencies", ("dependency", "operation"))
+ai_results = registry.counter(
+    "ai_results_total", "Which generator produced a result (AI or a fallback)", ("feature", "source"))
+single_flight_calls = registry.counter(
+    "single_flight_calls_total", "Calls started through a SingleFlight", ("operation",))
+single_flight_coalesced = registry.counter(
+    "single_flight_coalesced_total", "Calls that joined an identical in-flight call instead of starting one", ("operation",))
+loop_lag = registry.histogram(
+    "event_loop_lag_seconds", "How late a periodic event-loop timer fired",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+
+
+@contextmanager
+def track_dependency(dependency: str, operation: str):
+    """
+    Times a dependency call, counts it as ok or error (the exception still propagates) and,
+    in traced requests, records it as a span.
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        with span(f"{dependency}.{operation}"):
+            yield
+    except (GeneratorExit, asyncio.CancelledError):
+        outcome = "cancelled"  # the caller went away, e.g. a client closed a stream
+        raise
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        dependency_duration.observe(time.perf_counter() - start, dependency, operation)
+        dependency_requests.inc(dependency, operation, outcome)
+
+
+def record_dependency(dependency: str, operation: str, seconds: float, ok: bool):
+    dependency_duration.observe(seconds, dependency, operation)
+    dependency_requests.inc(dependency, operation, "ok" if ok else "error")
+
+
+# --------------------------
+# CACHES
+# --------------------------
+_caches: Dict[str, object] = {}
+
+
+def register_cache(name: str, cache):
+    """Exposes a TTLCache's counters at scrape time; nothing is added to the cache's hot path."""
+    _caches[name] = cache
+
+
+def _collect_caches() -> List[str]:
+    fields = [
+        ("cache_hits_total", "counter", "Fresh cache hits", "hits"),
+        ("cache_stale_hits_total", "counter", "Stale entries served while refreshing", "stale_hits"),
+        ("cache_misses_total", "counter", "Cache misses", "misses"),
+        ("cache_evictions_total", "counter", "Entries evicted to stay within maxsize", "evictions"),
+        ("cache_entries", "gauge", "Entries currently cached", "size"),
+        ("cache_hit_ratio", "gauge", "(hits + stale hits) / lookups since start", "hit_ratio"),
+    ]
+    stats = {name: cache.stats() for name, cache in sorted(_caches.items())}
+    lines = []
+    for metric, kind, help, key in fields:
+        lines += [f"# HELP {metric} {help}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{cache="{name}"}} {_number(values[key])}' for name, values in stats.items()]
+    return lines
+
+
+registry.add_collector(_collect_caches)
+
+
+# --------------------------
+# EVENT LOOP LAG
+# --------------------------
+class LoopLagMonitor:
+    """Sleeps for a fixed interval and records how much later than requested it woke up."""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL):
+        self.interval = interval
+        self.last_lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, loop.time() - start - self.interval)
+            loop_lag.observe(self.last_lag)
+
+    def collect(self) -> List[str]:
+        return [
+            "# HELP event_loop_lag_last_seconds Lag of the most recent event-loop timer",
+            "# TYPE event_loop_lag_last_seconds gauge",
+            f"event_loop_lag_last_seconds {_number(self.last_lag)}",
+        ]
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+loop_lag_monitor = LoopLagMonitor()
+registry.add_collector(loop_lag_monitor.collect)
+
+
+# --------------------------
+# HTTP
+# --------------------------
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware (no per-request task or body buffering, unlike BaseHTTPMiddleware).
+    Requests are labelled with the matched route template, e.g. /jobs/matched/{profile_id},
+    so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_request_duration.observe(time.perf_counter() - start, method, template)
+            http_requests.inc(method, template, str(status))
+
+
+# --------------------------
+# MONGO
+# --------------------------
+class MongoCommandListener(monitoring.CommandListener):
+    """pymongo command events; durations come from the driver, so no extra timing is done here."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record_dependency("mongo", event.command_name, event.duration_micros / 1e6, True)
+        record_span(f"mongo.{event.command_name}", event.duration_micros / 1e6)
+
+    def failed(self, event):
+        record_dependency("mongo", event.command_name, event.duration_micros / 1e6, False)
+        record_span(f"mongo.{event.command_name}", event.duration_micros / 1e6, error=str(event.failure)[:500])
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Optional
+
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.005))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", 60))
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", 20))
+
+_active: ContextVar[Optional["SamplingProfiler"]] = ContextVar("profiler", default=None)
+_factory_loops = weakref.WeakSet()
+
+finished_profiles: "deque[SamplingProfiler]" = deque(maxlen=PROFILE_BUFFER_SIZE)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _install_task_factory(loop):
+    """Tasks created while a profiled request runs (e.g. a streamed body) are profiled too."""
+    if loop in _factory_loops:
+        return
+    previous = loop.get_task_factory()
+
+    def factory(loop, coro, **kwargs):
+        task = previous(loop, coro, **kwargs) if previous else asyncio.Task(coro, loop=loop, **kwargs)
+        profiler = _active.get()
+        if profiler is not None:
+            profiler.tasks.add(task)
+        return task
+
+    loop.set_task_factory(factory)
+    _factory_loops.add(loop)
+
+
+class SamplingProfiler:
+    """
+    Samples the event-loop thread's Python stack every `interval` seconds from a background
+    thread. Full stacks are kept only while one of this request's tasks is running; time spent
+    idle or running other requests is counted under "(awaiting I/O)" / "(other requests)", so
+    concurrent requests on the same loop do not pollute the graph. Work handed to executor
+    threads or the PDF process pool shows up as awaiting time, not as its own stacks.
+    """
+
+    def __init__(self, name: str, interval: float = PROFILE_INTERVAL):
+        self.profile_id = uuid.uuid4().hex
+        self.name = name
+        self.interval = interval
+        self.tasks = weakref.WeakSet()
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self._start = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._token = None
+
+    def _sample_loop(self, loop, thread_id: int):
+        deadline = time.monotonic() + PROFILE_MAX_SECONDS
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            self.samples += 1
+            task = asyncio.current_task(loop)
+            if task is None:
+                # Off-CPU time (awaiting Gemini, Mongo, the PDF pool...) keeps the graph proportional to wall time
+                self.stacks["(awaiting I/O)"] += 1
+                continue
+            if task not in self.tasks:
+                self.stacks["(other requests)"] += 1
+                continue
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None and frame.f_code.co_filename == __file__:
+                continue  # the request is finishing and waiting in stop()
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        """Must be called from the request's task on the event-loop thread."""
+        loop = asyncio.get_running_loop()
+        _install_task_factory(loop)
+        self.tasks.add(asyncio.current_task())
+        self._token = _active.set(self)
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._sample_loop, args=(loop, threading.get_ident()), daemon=True, name="profiler"
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._start
+        try:
+            _active.reset(self._token)
+        except ValueError:
+            pass
+        finished_profiles.append(self)
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format; feed to flamegraph.pl or speedscope."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def to_dict(self) -> dict:
+        return {
+            "profile_id": self.profile_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "cpu_samples": self.samples - self.stacks["(awaiting I/O)"] - self.stacks["(other requests)"],
+            "stacks": [{"stack": stack.split(";"), "count": count} for stack, count in self.stacks.most_common()],
+        }
+
+
+def get_profile(profile_id: str) -> Optional[SamplingProfiler]:
+    return next((p for p in finished_profiles if p.profile_id == profile_id), None)
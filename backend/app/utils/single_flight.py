@@ -0,0 +1,38 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from .metrics import single_flight_calls, single_flight_coalesced
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for `key` is in flight, further
+    callers await it instead of starting their own, and all of them get its result or its
+    exception. Nothing is kept once the call finishes (caching is the caller's job).
+
+    The call runs as its own task, so a caller that is cancelled (e.g. a client that went
+    away) does not cancel it for the others.
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]):
+        task = self._calls.get(key)
+        if task is not None:
+            single_flight_coalesced.inc(self.operation)
+        else:
+            single_flight_calls.inc(self.operation)
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t: self._finished(key, t))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here too, in case every caller was cancelled meanwhile
@@ -0,0 +1,104 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercases and collapses whitespace so multi-word skills match across line breaks."""
+    return _WHITESPACE.sub(" ", text.lower())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a skill vocabulary.
+
+    Scans a text once in linear time and reports every skill occurrence. Boundaries are
+    only enforced on word-character edges of a skill, so "go" does not match inside
+    "google", while punctuated skills like "c#" and ".net" still match next to punctuation.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self.skills: List[str] = []
+        self._goto = [{}]   # node -> {char: node}
+        self._fail = [0]
+        self._out = [()]    # node -> ids of skills ending here (including via fail links)
+
+        for skill in dict.fromkeys(normalize_text(s).strip() for s in skills):
+            if skill:
+                self._add(skill)
+        self._build_fail_links()
+
+    def _add(self, skill: str):
+        node = 0
+        for ch in skill:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        self._out[node] = self._out[node] + (len(self.skills),)
+        self.skills.append(skill)
+
+    def _build_fail_links(self):
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                if self._out[self._fail[child]]:
+                    self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self):
+        return len(self.skills)
+
+    def iter_matches(self, text: str, normalized: bool = False) -> Iterable[Tuple[int, int, str]]:
+        """Yields (start, end, skill) for each boundary-respecting match in the normalized text."""
+        if not normalized:
+            text = normalize_text(text)
+        goto, fail, out, skills = self._goto, self._fail, self._out, self.skills
+        n = len(text)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            for skill_id in out[node]:
+                skill = skills[skill_id]
+                start = i - len(skill) + 1
+                if _is_word_char(skill[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(skill[-1]) and i + 1 < n and _is_word_char(text[i + 1]):
+                    continue
+                yield start, i + 1, skill
+
+    def find(self, text: str) -> List[str]:
+        """Returns the distinct skills found in `text`, in order of first appearance."""
+        return list(dict.fromkeys(skill for _, _, skill in self.iter_matches(text)))
+
+
+@lru_cache(maxsize=1024)
+def _cached_matcher(skills: frozenset) -> SkillMatcher:
+    return SkillMatcher(sorted(skills))
+
+
+def get_skill_matcher(skills: Iterable[str]) -> SkillMatcher:
+    """Returns a shared, precompiled matcher for this skill set (built once per distinct set)."""
+    return _cached_matcher(frozenset(skills))
@@ -0,0 +1,266 @@
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .skill_matcher import SkillMatcher
+
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(__file__), "..", "data", "skill_taxonomy.json")
+)
+
+EMPTY_IDS = np.empty(0, dtype=np.int32)
+# Below this many items, per-item Python work beats numpy's fixed per-call overhead
+VECTORIZE_MIN = 32
+# Hot spellings resolved through a bounded dict instead of a hash-table search
+SKILL_LOOKUP_CACHE_SIZE = int(os.getenv("SKILL_LOOKUP_CACHE_SIZE", 4096))
+
+
+def skill_key(skill: str) -> str:
+    """Lookup form of a skill spelling: lowercase, single spaces (same as the matcher's)."""
+    return " ".join(skill.lower().split())
+
+
+def _unique_in_order(ids: np.ndarray) -> np.ndarray:
+    if len(ids) < VECTORIZE_MIN:
+        return np.array(list(dict.fromkeys(ids.tolist())), dtype=np.int32)
+    _, first = np.unique(ids, return_index=True)
+    return ids[np.sort(first)]
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills and their aliases ("k8s" -> kubernetes, "js" -> javascript), each
+    canonical skill interned to a dense int32 id.
+
+    Skills loaded from the data file are kept in flat arrays instead of per-spelling Python
+    objects: a sorted int64 array of spelling hashes with the id of each, and the canonical
+    names / spellings as newline-joined strings, plus where each spelling starts so hash hits
+    are confirmed against it. That is ~35 bytes per spelling versus ~100 for a
+    {spelling: name} dict (50k skills with two aliases each: 5.0 MB vs 14.4 MB, see
+    benchmarks.bench_skill_taxonomy). The table is read-only: skills outside it (free-form
+    profile entries, Gemini output) only get ids inside a request's SkillScope.
+
+    Ids are only meaningful inside one process: store skill names, not ids.
+    """
+
+    def __init__(self, skills: Dict[str, Iterable[str]]):
+        names: List[str] = []
+        spellings: Dict[str, int] = {}
+        for canonical, aliases in skills.items():
+            key = skill_key(canonical)
+            if not key or key in spellings:
+                continue
+            skill_id = len(names)
+            names.append(key)
+            spellings[key] = skill_id
+            for alias in aliases:
+                spellings.setdefault(skill_key(alias), skill_id)
+        spellings.pop("", None)
+
+        self.static_size = len(names)
+        self._names = "\n".join(names)
+        self._offsets = np.cumsum([0] + [len(name) + 1 for name in names], dtype=np.int64)
+        # Spellings are grouped by id (ids only grow while they are added), so each id's
+        # spellings are one slice of the joined string
+        self._spellings = "\n".join(spellings)
+        spelling_chars = np.zeros(len(names) + 1, dtype=np.int64)
+        np.add.at(spelling_chars, np.fromiter(spellings.values(), dtype=np.int64, count=len(spellings)) + 1,
+                  np.fromiter((len(key) + 1 for key in spellings), dtype=np.int64, count=len(spellings)))
+        self._spelling_offsets = np.cumsum(spelling_chars)
+
+        hashes = np.fromiter((hash(key) for key in spellings), dtype=np.int64, count=len(spellings))
+        order = np.argsort(hashes, kind="stable")
+        self._hashes = hashes[order]
+        self._hash_ids = np.fromiter(spellings.values(), dtype=np.int32, count=len(spellings))[order]
+        # Where each spelling starts in _spellings, so a hash hit is confirmed against the
+        # spelling itself (equal hashes are adjacent and scanned in turn)
+        starts = np.cumsum([0] + [len(key) + 1 for key in spellings], dtype=np.int64)[:-1]
+        self._hash_starts = starts[order].astype(np.int32 if len(self._spellings) < 2**31 else np.int64)
+
+        self._matcher: Optional[SkillMatcher] = None
+        # The static table never changes, so its answers can be cached (by raw spelling,
+        # which also skips normalizing hot inputs)
+        self._static_id = lru_cache(maxsize=SKILL_LOOKUP_CACHE_SIZE)(lambda skill: self._search(skill_key(skill)))
+
+    @classmethod
+    def load(cls, path: str = SKILL_TAXONOMY_PATH) -> "SkillTaxonomy":
+        """Loads {"skills": {canonical: [aliases...]}} from a JSON file."""
+        with open(path) as f:
+            return cls(json.load(f)["skills"])
+
+    def __len__(self):
+        return self.static_size
+
+    def is_static(self, skill_id: int) -> bool:
+        return 0 <= skill_id < self.static_size
+
+    # --------------------------
+    # LOOKUP
+    # --------------------------
+    def _spelling_at(self, start: int, key: str) -> bool:
+        """Whether the spelling starting at `start` in the joined spellings is `key`."""
+        end = start + len(key)
+        return self._spellings.startswith(key, start) and self._spellings[end:end + 1] in ("\n", "")
+
+    def _search(self, key: str) -> int:
+        h = hash(key)
+        i = int(self._hashes.searchsorted(h))
+        while i < len(self._hashes) and self._hashes[i] == h:
+            if self._spelling_at(int(self._hash_starts[i]), key):
+                return int(self._hash_ids[i])
+            i += 1
+        return -1
+
+    def lookup(self, skill: str) -> int:
+        """Id of a canonical skill or alias, or -1 if unknown."""
+        return self._static_id(skill)
+
+    def id_array(self, skills: Iterable[str], scope: Optional["SkillScope"] = None) -> np.ndarray:
+        """
+        Ids aligned with `skills`: -1 for blank and, without a `scope`, unknown entries; with
+        one, unknown skills get the scope's local ids.
+        Static spellings are resolved with one vectorized search over the hash table.
+        """
+        skills = list(skills)
+        if not skills:
+            return EMPTY_IDS
+        if len(skills) < VECTORIZE_MIN:
+            ids = [self._static_id(skill) for skill in skills]
+            if scope is not None:
+                ids = [skill_id if skill_id >= 0 else scope.intern_key(skill_key(skill))
+                       for skill, skill_id in zip(skills, ids)]
+            return np.array(ids, dtype=np.int32)
+        keys = [skill_key(skill) for skill in skills]
+        ids = np.full(len(keys), -1, dtype=np.int32)
+        if len(self._hashes):
+            hashes = np.fromiter((hash(key) for key in keys), dtype=np.int64, count=len(keys))
+            pos = np.minimum(self._hashes.searchsorted(hashes), len(self._hashes) - 1)
+            found = np.flatnonzero(self._hashes[pos] == hashes)
+            ids[found] = self._hash_ids[pos[found]]
+            for i, start in zip(found.tolist(), self._hash_starts[pos[found]].tolist()):
+                if not self._spelling_at(start, keys[i]):
+                    ids[i] = self._search(keys[i])  # another spelling with the same hash
+        if scope is not None:
+            for i in np.flatnonzero(ids < 0).tolist():
+                ids[i] = scope.intern_key(keys[i])
+        return ids
+
+    def ids(self, skills: Iterable[str], scope: Optional["SkillScope"] = None) -> np.ndarray:
+        """Distinct ids of `skills` in order of first appearance; aliases collapse to one id."""
+        ids = self.id_array(skills, scope)
+        return _unique_in_order(ids[ids >= 0])
+
+    # --------------------------
+    # NAMES
+    # --------------------------
+    def name(self, skill_id: int) -> str:
+        return self._names[self._offsets[skill_id]:self._offsets[skill_id + 1] - 1]
+
+    def names(self, ids: Iterable[int]) -> List[str]:
+        return [self.name(skill_id) for skill_id in ids]
+
+    def spellings(self, skill_id: int) -> List[str]:
+        """Canonical name and aliases of a skill."""
+        return self._spellings[self._spelling_offsets[skill_id]:self._spelling_offsets[skill_id + 1] - 1].split("\n")
+
+    def canonical(self, skill: str) -> str:
+        """Canonical name of a known skill or alias; unknown skills are only normalized."""
+        skill_id = self.lookup(skill)
+        return self.name(skill_id) if skill_id >= 0 else skill_key(skill)
+
+    # --------------------------
+    # TEXT
+    # --------------------------
+    def matcher(self) -> SkillMatcher:
+        """Aho-Corasick automaton over every static spelling, built on first use."""
+        if self._matcher is None:
+            self._matcher = SkillMatcher(self._spellings.split("\n"))
+        return self._matcher
+
+    def find_ids(self, text: str) -> np.ndarray:
+        """Distinct ids of the static skills mentioned in `text`, in order of first appearance."""
+        return self.ids(self.matcher().find(text))
+
+    def find(self, text: str) -> List[str]:
+        """Canonical names of the skills mentioned in `text`."""
+        return self.names(self.find_ids(text).tolist())
+
+
+class SkillScope:
+    """
+    Request-local ids for skills outside the taxonomy, numbered after its static ids, so
+    unknown skills can be compared alongside known ones without growing the shared table.
+    Create one per request (or per JobScoringEngine) and drop it afterwards.
+    """
+
+    def __init__(self, taxonomy: SkillTaxonomy):
+        self.taxonomy = taxonomy
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+
+    def __len__(self):
+        return self.taxonomy.static_size + len(self._names)
+
+    def intern_key(self, key: str) -> int:
+        """Local id of a normalized skill the taxonomy does not know (-1 for blank input)."""
+        if not key:
+            return -1
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            skill_id = self._ids[key] = self.taxonomy.static_size + len(self._names)
+            self._names.append(key)
+        return skill_id
+
+    def is_static(self, skill_id: int) -> bool:
+        return self.taxonomy.is_static(skill_id)
+
+    def ids(self, skills: Iterable[str]) -> np.ndarray:
+        return self.taxonomy.ids(skills, self)
+
+    def id_array(self, skills: Iterable[str]) -> np.ndarray:
+        return self.taxonomy.id_array(skills, self)
+
+    def name(self, skill_id: int) -> str:
+        if skill_id < self.taxonomy.static_size:
+            return self.taxonomy.name(skill_id)
+        return self._names[skill_id - self.taxonomy.static_size]
+
+    def names(self, ids: Iterable[int]) -> List[str]:
+        return [self.name(skill_id) for skill_id in ids]
+
+    def spellings(self, skill_id: int) -> List[str]:
+        if skill_id < self.taxonomy.static_size:
+            return self.taxonomy.spellings(skill_id)
+        return [self.name(skill_id)]
+
+
+# --------------------------
+# SET OPERATIONS ON ID ARRAYS / BITSETS
+# --------------------------
+def missing_mask(required: np.ndarray, have: np.ndarray) -> np.ndarray:
+    """Which entries of `required` are absent from `have` (-1 entries always are)."""
+    if len(required) < VECTORIZE_MIN and len(have) < VECTORIZE_MIN:
+        have_set = set(have.tolist())
+        return np.array([skill_id < 0 or skill_id not in have_set for skill_id in required.tolist()], dtype=bool)
+    return ~np.isin(required, have) | (required < 0)
+
+
+def bitset(ids: Iterable[int]) -> int:
+    """
+    Skill ids as a Python int bitset; `(a & b).bit_count()` is the overlap size. Only for
+    static taxonomy ids: the cost grows with the highest id.
+    """
+    bits = 0
+    for skill_id in ids:
+        if skill_id >= 0:
+            bits |= 1 << skill_id
+    return bits
+
+
+@lru_cache(maxsize=1)
+def get_taxonomy() -> SkillTaxonomy:
+    """The process-wide taxonomy from SKILL_TAXONOMY_PATH, loaded on first use."""
+    return SkillTaxonomy.load(SKILL_TAXONOMY_PATH)
@@ -0,0 +1,112 @@
+import os
+from functools import lru_cache
+from typing import Iterable, List
+
+import numpy as np
+
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", 256))
+# Hash buckets for n-gram document frequencies; n-grams are folded into EMBEDDING_DIM afterwards
+EMBEDDING_IDF_BUCKETS = 1 << 18
+EMBEDDING_NGRAMS = (3, 4, 5)
+# Long descriptions are cut here; the opening of a posting carries most of its signal
+EMBEDDING_MAX_CHARS = int(os.getenv("EMBEDDING_MAX_CHARS", 2000))
+
+# Everything but [a-z0-9+#.] becomes a word break ("c#", "c++" and "node.js" stay intact)
+_TOKEN_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789+#.")
+_WORD_BREAKS = str.maketrans({chr(c): " " for c in range(128) if chr(c) not in _TOKEN_CHARS})
+_PRIME = np.uint32(16777619)
+
+
+def _fmix32(h: np.ndarray) -> np.ndarray:
+    """MurmurHash3 finalizer, in place: spreads n-gram hashes over all 32 bits."""
+    h ^= h >> np.uint32(16)
+    h *= np.uint32(0x85EBCA6B)
+    h ^= h >> np.uint32(13)
+    h *= np.uint32(0xC2B2AE35)
+    h ^= h >> np.uint32(16)
+    return h
+
+
+@lru_cache(maxsize=4)
+def _bucket_tables(buckets: int, dim: int):
+    """Output dimension and sign of every bucket; shared by embedders and built on first use."""
+    bucket_hash = _fmix32(np.arange(buckets, dtype=np.uint32) ^ np.uint32(0x9E3779B9))
+    dims = (bucket_hash % np.uint32(dim)).astype(np.int64)
+    signs = np.where(bucket_hash >> np.uint32(31), -1.0, 1.0).astype(np.float32)
+    return dims, signs
+
+
+class HashingEmbedder:
+    """
+    Character n-gram TF-IDF vectors with the hashing trick: no vocabulary, no model files,
+    deterministic across processes. "postgres" and "postgresql", or "react" and
+    "react native", share most of their n-grams and so land close together.
+
+    N-grams (3-5 chars, words padded with spaces) are hashed into EMBEDDING_IDF_BUCKETS
+    buckets, which carry the IDF weights; each bucket is folded into one of `dim` output
+    dimensions with a random sign. Vectors are L2-normalized, so a dot product is a cosine.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM, ngrams: Iterable[int] = EMBEDDING_NGRAMS,
+                 buckets: int = EMBEDDING_IDF_BUCKETS, max_chars: int = EMBEDDING_MAX_CHARS):
+        if buckets & (buckets - 1):
+            raise ValueError("buckets must be a power of two")
+        self.dim = dim
+        self.ngrams = tuple(ngrams)
+        self.buckets = buckets
+        self.max_chars = max_chars
+        self.idf = np.ones(buckets, dtype=np.float32)
+        self.documents = 0  # size of the corpus the IDF was fitted on
+
+    def _ngram_buckets(self, texts: List[str]):
+        """(doc index, bucket) of every n-gram occurrence, hashed for the whole batch at once."""
+        cleaned = [" " + " ".join(
+            text[:self.max_chars].lower().encode("ascii", "replace").decode("ascii").translate(_WORD_BREAKS).split()
+        ) + " " for text in texts]
+        chars = np.frombuffer("".join(cleaned).encode("ascii"), dtype=np.uint8).astype(np.uint32)
+        doc_of = np.repeat(np.arange(len(cleaned), dtype=np.int64), [len(text) for text in cleaned])
+        docs, hashes = [], []
+        h = chars.copy()
+        for n in range(2, max(self.ngrams) + 1):
+            if len(chars) < n:
+                break
+            h = h[:len(chars) - n + 1] * _PRIME + chars[n - 1:]
+            if n in self.ngrams:
+                # Texts are concatenated, so drop n-grams spanning two of them
+                inside = np.flatnonzero(doc_of[:len(h)] == doc_of[n - 1:])
+                docs.append(doc_of[inside])
+                hashes.append(h[inside] ^ np.uint32(n))
+        if not docs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        buckets = _fmix32(np.concatenate(hashes))
+        buckets &= np.uint32(self.buckets - 1)
+        return np.concatenate(docs), buckets.astype(np.int64)
+
+    def fit(self, texts: List[str], batch_size: int = 2000) -> "HashingEmbedder":
+        """Sets the IDF weights from a corpus (e.g. every indexed job posting)."""
+        df = np.zeros(self.buckets, dtype=np.int64)
+        for start in range(0, len(texts), batch_size):
+            docs, buckets = self._ngram_buckets(texts[start:start + batch_size])
+            # `docs` is one ascending run per n-gram size, so the stable sort is a cheap merge.
+            # `df[idx] += 1` counts repeated indices once: document frequencies without a unique()
+            order = np.argsort(docs, kind="stable")
+            docs, buckets = docs[order], buckets[order]
+            for part in np.split(buckets, np.flatnonzero(np.diff(docs)) + 1):
+                df[part] += 1
+        self.documents = len(texts)
+        self.idf = (np.log((1 + self.documents) / (1 + df)) + 1).astype(np.float32)
+        return self
+
+    def embed(self, texts: List[str], batch_size: int = 2000) -> np.ndarray:
+        """(len(texts), dim) float32 unit vectors (all-zero for texts without n-grams)."""
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        dims, signs = _bucket_tables(self.buckets, self.dim)
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            docs, buckets = self._ngram_buckets(batch)
+            # Summing per occurrence gives tf * idf per bucket without sorting
+            weights = self.idf[buckets] * signs[buckets]
+            flat = np.bincount(docs * self.dim + dims[buckets], weights=weights, minlength=len(batch) * self.dim)
+            out[start:start + len(batch)] = flat.reshape(len(batch), self.dim)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.maximum(norms, 1e-12)
@@ -0,0 +1,227 @@
+import os
+import random
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+from .profiler import SamplingProfiler
+
+# Fraction of requests traced; admins can also ask for a trace with "X-Trace: 1"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", 0.01))
+# Finished traces kept in memory for /admin/traces
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", 200))
+# Spans per trace; further spans are counted but not stored
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", 500))
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start", "end", "attributes", "error")
+
+    def __init__(self, name: str, parent_id: Optional[int], start: float, attributes: dict):
+        self.name = name
+        self.span_id = 0
+        self.parent_id = parent_id
+        self.start = start
+        self.end = None
+        self.attributes = attributes
+        self.error = None
+
+
+class Trace:
+    """Spans of one request. Times are perf_counter seconds; exported as ms from the trace start."""
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self.profile_id = None
+
+    def add(self, span: Span) -> Span:
+        # list.append is atomic, so spans may be added from executor threads (e.g. Mongo events)
+        if len(self.spans) >= TRACE_MAX_SPANS:
+            self.dropped += 1
+        else:
+            span.span_id = len(self.spans) + 1
+            self.spans.append(span)
+        return span
+
+    def to_dict(self) -> dict:
+        def ms(t):
+            return round((t - self.origin) * 1000, 3)
+
+        root = self.spans[0] if self.spans else None
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": ms(root.end) if root and root.end else None,
+            "dropped_spans": self.dropped,
+            "profile_id": self.profile_id,
+            "spans": [
+                {
+                    "span_id": s.span_id,
+                    "parent_id": s.parent_id,
+                    "name": s.name,
+                    "start_ms": ms(s.start),
+                    "duration_ms": round((s.end - s.start) * 1000, 3) if s.end else None,
+                    "attributes": s.attributes,
+                    "error": s.error,
+                }
+                for s in self.spans
+            ],
+        }
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_parent: ContextVar[Optional[int]] = ContextVar("trace_parent", default=None)
+
+finished_traces: "deque[Trace]" = deque(maxlen=TRACE_BUFFER_SIZE)
+
+
+def current_trace() -> Optional[Trace]:
+    return _trace.get()
+
+
+def should_sample(forced: bool = False) -> bool:
+    return forced or (TRACE_SAMPLE_RATE > 0 and random.random() < TRACE_SAMPLE_RATE)
+
+
+class _NoSpan:
+    """Shared no-op context for untraced requests."""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ("trace", "name", "attributes", "span", "token")
+
+    def __init__(self, trace: Trace, name: str, attributes: dict):
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> Span:
+        self.span = self.trace.add(Span(self.name, _parent.get(), time.perf_counter(), self.attributes))
+        self.token = _parent.set(self.span.span_id) if self.span.span_id else None
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.end = time.perf_counter()
+        if exc is not None:
+            self.span.error = f"{exc_type.__name__}: {exc}"[:500]
+        if self.token is not None:
+            try:
+                _parent.reset(self.token)
+            except ValueError:
+                pass  # closed from another context (e.g. an abandoned async generator)
+        return False
+
+
+def span(name: str, **attributes):
+    """
+    Context manager recording a nested span when the current request is traced; otherwise
+    a shared no-op. Works in sync and async code (the parent follows the context).
+    """
+    trace = _trace.get()
+    if trace is None:
+        return _NO_SPAN
+    return _ActiveSpan(trace, name, attributes)
+
+
+def record_span(name: str, duration: float, error: Optional[str] = None, **attributes):
+    """Adds an already-finished span ending now, e.g. from a driver event that reports its duration."""
+    trace = _trace.get()
+    if trace is None:
+        return
+    end = time.perf_counter()
+    finished = trace.add(Span(name, _parent.get(), end - duration, attributes))
+    finished.end = end
+    finished.error = error
+
+
+@contextmanager
+def start_trace(name: str, **attributes):
+    """Makes a new trace current for the enclosed code and files it in `finished_traces` afterwards."""
+    trace = Trace(name)
+    trace_token = _trace.set(trace)
+    try:
+        with span(name, **attributes) as root:
+            yield trace, root
+    finally:
+        _trace.reset(trace_token)
+        finished_traces.append(trace)
+
+
+def get_trace(trace_id: str) -> Optional[Trace]:
+    return next((t for t in finished_traces if t.trace_id == trace_id), None)
+
+
+def recent_traces(limit: int = 50, min_duration_ms: float = 0) -> List[Dict]:
+    traces = [t.to_dict() for t in reversed(finished_traces)]
+    return [t for t in traces if (t["duration_ms"] or 0) >= min_duration_ms][:limit]
+
+
+class TracingMiddleware:
+    """
+    Traces a sample of requests (TRACE_SAMPLE_RATE) and returns the id in an X-Trace-Id
+    response header. "X-Trace: 1" forces a trace and "X-Profile: 1" also runs the request
+    under the SamplingProfiler (profile id in X-Profile-Id), both only with an admin bearer
+    token: traces cost a span per Mongo command and fill the bounded trace buffer.
+    """
+
+    def __init__(self, app, is_admin: Callable[[Optional[str]], bool] = lambda authorization: False):
+        self.app = app
+        self.is_admin = is_admin
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        wants_trace = headers.get(b"x-trace") == b"1"
+        wants_profile = headers.get(b"x-profile") == b"1"
+        admin = (wants_trace or wants_profile) and self.is_admin(headers.get(b"authorization", b"").decode())
+        profile = wants_profile and admin
+        if not (profile or should_sample(wants_trace and admin)):
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{scope.get('method', '')} {scope.get('path', '')}"
+        with start_trace(name, method=scope.get("method"), path=scope.get("path")) as (trace, root):
+            profiler = SamplingProfiler(name) if profile else None
+            if profiler is not None:
+                trace.profile_id = profiler.profile_id
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    root.attributes["status"] = message["status"]
+                    extra = [(b"x-trace-id", trace.trace_id.encode())]
+                    if profiler is not None:
+                        extra.append((b"x-profile-id", profiler.profile_id.encode()))
+                    message = {**message, "headers": [*message.get("headers", []), *extra]}
+                await send(message)
+
+            if profiler is not None:
+                profiler.start()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if profiler is not None:
+                    profiler.stop()
+                route = scope.get("route")
+                if route is not None:
+                    root.attributes["route"] = route.path
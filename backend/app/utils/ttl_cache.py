@@ -0,0 +1,125 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from .single_flight import SingleFlight
+
+
+class TTLCache:
+    """
+    Bounded in-process cache with TTL expiry and LRU eviction.
+
+    Entries older than `ttl` are stale; for another `stale_ttl` seconds they can still be
+    served by `get_or_load` while a single background refresh replaces them. Concurrent
+    misses for one key share a single load; `name` labels those loads in the metrics.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300, stale_ttl: float = 0, name: str = "ttl_cache"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (stored_at, value)
+        self._refreshing = {}  # key -> background refresh task
+        self._loads = SingleFlight(name)
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self._lookup(key)[0] == "fresh"
+
+    def _lookup(self, key):
+        """Returns (state, value) where state is 'fresh', 'stale' or 'missing'."""
+        entry = self._data.get(key)
+        if entry is None:
+            return "missing", None
+        age = time.monotonic() - entry[0]
+        if age <= self.ttl:
+            state = "fresh"
+        elif age <= self.ttl + self.stale_ttl:
+            state = "stale"
+        else:
+            del self._data[key]
+            return "missing", None
+        self._data.move_to_end(key)
+        return state, entry[1]
+
+    def get(self, key, default=None):
+        """Returns a fresh value or `default`. Stale entries count as misses here."""
+        state, value = self._lookup(key)
+        if state == "fresh":
+            self.hits += 1
+            return value
+        self.misses += 1
+        return default
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    async def get_or_load(self, key, loader: Callable[[], Awaitable[Any]]):
+        """
+        Returns the cached value for `key`, calling `loader()` on a miss (once for all
+        concurrent callers missing the same key). Stale values are returned immediately
+        while one background refresh runs. Loader exceptions propagate and are never cached.
+        """
+        state, value = self._lookup(key)
+        if state == "fresh":
+            self.hits += 1
+            return value
+        if state == "stale":
+            self.stale_hits += 1
+            self._schedule_refresh(key, loader)
+            return value
+
+        self.misses += 1
+
+        async def load():
+            value = await loader()
+            self.set(key, value)
+            return value
+
+        return await self._loads.do(key, load)
+
+    def _schedule_refresh(self, key, loader):
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                self.set(key, await loader())
+                self.refreshes += 1
+            except Exception as e:
+                print(f"Cache refresh failed for {key!r}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.ensure_future(refresh())
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "refreshes": self.refreshes,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,89 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class VectorIndex:
+    """
+    Exact nearest-neighbour search over unit vectors by inner product (cosine).
+
+    Vectors live in one growable float32 matrix, so a batch of queries is a single matrix
+    product against every row (BLAS) followed by a top-k partition: ~100k rows x 256 dims
+    is 100 MB and answers a batch in tens of milliseconds without any approximate structure.
+    Each row carries an integer group (e.g. a location) that searches can be restricted to.
+    Removed rows are recycled by later adds.
+    """
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._groups = np.full(capacity, -1, dtype=np.int32)  # -1 marks a free row
+        self._keys: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, key: str):
+        return key in self._rows
+
+    def keys(self) -> List[str]:
+        return list(self._rows)
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        row = len(self._keys)
+        if row == len(self._vectors):
+            capacity = 2 * len(self._vectors)
+            self._vectors = np.resize(self._vectors, (capacity, self.dim))
+            self._groups = np.concatenate([self._groups, np.full(capacity - len(self._groups), -1, dtype=np.int32)])
+        self._keys.append(None)
+        return row
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray, groups: Optional[Sequence[int]] = None):
+        """Inserts or replaces the vector of each key."""
+        for i, key in enumerate(keys):
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = self._allocate()
+                self._keys[row] = key
+            self._vectors[row] = vectors[i]
+            self._groups[row] = groups[i] if groups is not None else 0
+
+    def remove(self, key: str):
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._keys[row] = None
+            self._groups[row] = -1
+            self._free.append(row)
+
+    def vectors_for(self, keys: Sequence[str]) -> np.ndarray:
+        """(len(keys), dim) stored vectors; zeros for unknown keys."""
+        out = np.zeros((len(keys), self.dim), dtype=np.float32)
+        found = [(i, self._rows[key]) for i, key in enumerate(keys) if key in self._rows]
+        if found:
+            positions, rows = zip(*found)
+            out[list(positions)] = self._vectors[list(rows)]
+        return out
+
+    def search(self, queries: np.ndarray, k: int, group: Optional[int] = None) -> List[List[Tuple[str, float]]]:
+        """For each query row, the k best (key, score) pairs, best first."""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        n = len(self._keys)
+        if n == 0 or k <= 0:
+            return [[] for _ in queries]
+        scores = queries @ self._vectors[:n].T  # (Q, n)
+        invalid = self._groups[:n] < 0 if group is None else self._groups[:n] != group
+        scores[:, invalid] = -np.inf
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < n else np.broadcast_to(np.arange(n), (len(queries), n))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top, top_scores = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+        keys = self._keys
+        return [
+            [(keys[row], float(score)) for row, score in zip(rows.tolist(), row_scores.tolist()) if score != -np.inf]
+            for rows, row_scores in zip(top, top_scores)
+        ]
@@ -0,0 +1,127 @@
+"""
+Latency comparison: blocking `requests` Adzuna fetch vs. the pooled async JobSourceClient.
+
+Runs against a local stub Adzuna server (no network, no API quota):
+
+    python -m benchmarks.bench_adzuna_client --concurrency 20 --delay 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_stub_handler(delay: float, results_per_page: int):
+    class StubAdzunaHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def do_GET(self):
+            time.sleep(delay)
+            page = int(self.path.split("?")[0].rstrip("/").split("/")[-1])
+            body = json.dumps({
+                "results": [
+                    {
+                        "id": f"{page}-{i}",
+                        "title": "Backend Developer",
+                        "description": "python fastapi docker sql " * 20,
+                        "company": {"display_name": "Stub Corp"},
+                        "location": {"display_name": "Remote"},
+                        "category": {"label": "IT Jobs"},
+                    }
+                    for i in range(results_per_page)
+                ]
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StubAdzunaHandler
+
+
+class StubServer(ThreadingHTTPServer):
+    request_queue_size = 256  # the default backlog of 5 drops bursts of concurrent connects
+    daemon_threads = True
+
+
+def start_stub_server(delay: float, results_per_page: int):
+    server = StubServer(("127.0.0.1", 0), make_stub_handler(delay, results_per_page))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def legacy_fetch(base_url: str, query: str):
+    """The previous implementation: one blocking page-1 request per call."""
+    import requests
+    response = requests.get(f"{base_url}/in/search/1", params={"what": query}, timeout=10)
+    response.raise_for_status()
+    return response.json().get("results", [])
+
+
+async def run_concurrent(handler, concurrency: int):
+    """Fires `concurrency` simultaneous calls; latency is measured from the common arrival time."""
+    latencies = []
+    wall_start = time.perf_counter()
+
+    async def one_request():
+        await handler()
+        latencies.append(time.perf_counter() - wall_start)
+
+    await asyncio.gather(*(one_request() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - wall_start
+
+
+def report(label: str, latencies, wall: float):
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{label:<28} wall={wall * 1000:8.1f} ms  "
+        f"p50={statistics.median(ordered) * 1000:8.1f} ms  p95={p95 * 1000:8.1f} ms"
+    )
+
+
+async def main(args):
+    server = start_stub_server(args.delay, args.results_per_page)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["ADZUNA_BASE_URL"] = base_url
+
+    from app.services import job_source
+    job_source.ADZUNA_BASE_URL = base_url
+
+    async def legacy_handler():
+        # Blocking call made directly on the event loop, as the old route did
+        legacy_fetch(base_url, "backend developer")
+
+    async def pooled_handler():
+        await job_source.fetch_adzuna_jobs("backend developer", pages=args.pages)
+
+    # Warm up imports and the connection pool so only steady-state latency is compared
+    await legacy_handler()
+    await pooled_handler()
+
+    print(f"stub delay={args.delay * 1000:.0f} ms, concurrency={args.concurrency}, pages={args.pages}")
+    report("legacy requests (1 page)", *await run_concurrent(legacy_handler, args.concurrency))
+    job_source.job_search_cache.clear()
+    report(f"pooled httpx ({args.pages} pages)", *await run_concurrent(pooled_handler, args.concurrency))
+    report("pooled httpx, warm cache", *await run_concurrent(pooled_handler, args.concurrency))
+    print(f"cache stats: {job_source.job_search_cache.stats()}")
+
+    await job_source.JobSourceClient.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.2, help="Stub server latency per request (seconds)")
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--results-per-page", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
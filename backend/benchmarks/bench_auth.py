@@ -0,0 +1,78 @@
+"""
+Authenticated-request throughput for GET /auth/me, before and after principal caching.
+
+Needs a reachable MongoDB (a throwaway local mongod is fine):
+
+    python -m benchmarks.bench_auth --mongo-uri mongodb://localhost:27017 --requests 5000 --concurrency 50
+
+Modes:
+  no-cache       every request decodes the JWT and reads the user from Mongo (previous behaviour)
+  cache          resolved users are served from the TTL principal cache
+  token-claims   tokens carry a uid claim that is trusted without a DB read
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+BENCH_DB = "career_agent_bench"
+
+
+async def setup(mongo_uri: str):
+    from beanie import init_beanie
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from app.models import Profile, JobApplication, User
+    from app.auth_utils import create_access_token, get_password_hash
+
+    client = AsyncIOMotorClient(mongo_uri)
+    await client.drop_database(BENCH_DB)
+    await init_beanie(database=client[BENCH_DB], document_models=[Profile, JobApplication, User])
+    user = User(email="bench@example.com", password_hash=get_password_hash("benchmark-password"))
+    await user.insert()
+    token = create_access_token({"sub": user.email, "uid": str(user.id)})
+    return client, token
+
+
+async def run_mode(app, token: str, mode: str, requests: int, concurrency: int) -> float:
+    from app import auth_utils
+
+    auth_utils.AUTH_TRUST_TOKEN_CLAIMS = mode == "token-claims"
+    auth_utils.principal_cache.clear()
+    headers = {"Authorization": f"Bearer {token}"}
+    remaining = iter(range(requests))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def worker():
+            for _ in remaining:
+                if mode == "no-cache":
+                    auth_utils.principal_cache.clear()
+                response = await client.get("/auth/me", headers=headers)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+async def main(args):
+    # The ASGI transport does not run the lifespan, so the app never touches the real database
+    from app.main import app
+
+    client, token = await setup(args.mongo_uri)
+    try:
+        print(f"{args.requests} requests, concurrency {args.concurrency}")
+        for mode in ("no-cache", "cache", "token-claims"):
+            rps = await run_mode(app, token, mode, args.requests, args.concurrency)
+            print(f"  {mode:<13} {rps:9.0f} req/s")
+    finally:
+        await client.drop_database(BENCH_DB)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,118 @@
+"""
+Email sending throughput: one SMTP connection per email (previous /apply/email behaviour)
+versus the outbox's pooled SMTPSender, which reuses a single connection for a batch.
+
+Runs against a local SMTP sink that simulates network round trips, so no real mail is sent:
+
+    python -m benchmarks.bench_email_outbox --emails 200 --rtt-ms 20 --connect-ms 60
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+from app.services import email_service
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP server that accepts everything; every reply is delayed by one round trip."""
+
+    def reply(self, line: str):
+        time.sleep(self.server.rtt)
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        time.sleep(self.server.connect_delay)  # TCP + TLS setup on a real server
+        self.reply("220 sink ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith("EHLO"):
+                self.reply("250-sink\r\n250 AUTH PLAIN LOGIN")
+            elif command.startswith("AUTH"):
+                self.reply("235 authenticated")
+            elif command == "DATA":
+                self.reply("354 end with .")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.delivered += 1
+                self.reply("250 queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 256
+
+    def __init__(self, rtt: float, connect_delay: float):
+        super().__init__(("127.0.0.1", 0), SMTPSinkHandler)
+        self.rtt = rtt
+        self.connect_delay = connect_delay
+        self.delivered = 0
+
+
+def per_email(count: int):
+    for i in range(count):
+        result = email_service.send_job_application_email(
+            company_email=f"hr{i}@example.com",
+            job_title="Backend Engineer",
+            company_name="Bench Corp",
+            applicant_name="Bench User",
+            applicant_email="bench@example.com",
+            applicant_skills=["python", "fastapi"],
+        )
+        assert result["success"], result["message"]
+
+
+def pooled(count: int, batch_size: int):
+    sender = email_service.SMTPSender()
+    subject, body = email_service.build_application_email(
+        "Backend Engineer", "Bench Corp", "Bench User", "bench@example.com", ["python", "fastapi"]
+    )
+    messages = [(f"hr{i}@example.com", subject, body) for i in range(count)]
+    for start in range(0, count, batch_size):
+        errors = sender.send_batch(messages[start:start + batch_size])
+        assert not any(errors), errors
+    sender.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=email_service.OUTBOX_BATCH_SIZE)
+    parser.add_argument("--rtt-ms", type=float, default=20, help="delay before every SMTP reply")
+    parser.add_argument("--connect-ms", type=float, default=60, help="extra delay when a connection opens")
+    args = parser.parse_args()
+
+    sink = SMTPSink(args.rtt_ms / 1000, args.connect_ms / 1000)
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+
+    email_service.SMTP_HOST, email_service.SMTP_PORT = sink.server_address
+    email_service.SMTP_STARTTLS = False
+    email_service.SMTP_EMAIL = "bench@example.com"
+    email_service.SMTP_PASSWORD = "bench"
+
+    print(f"{args.emails} emails, rtt {args.rtt_ms:.0f} ms, connect {args.connect_ms:.0f} ms")
+    for name, run in (
+        ("per-email connection", lambda: per_email(args.emails)),
+        (f"pooled (batch {args.batch_size})", lambda: pooled(args.emails, args.batch_size)),
+    ):
+        delivered = sink.delivered
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        sent = sink.delivered - delivered
+        print(f"{name:24s} {elapsed * 1000:9.0f} ms  {sent / elapsed:8.1f} emails/s")
+
+    sink.shutdown()
+
+
+if __name__ == "__main__":
+    main()
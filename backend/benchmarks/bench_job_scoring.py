@@ -0,0 +1,76 @@
+"""
+Batch scoring benchmark: per-job Python loop (previous get_matched_jobs logic) vs. JobScoringEngine.
+
+    python -m benchmarks.bench_job_scoring --profiles 200 --jobs 1000 --top-k 20
+"""
+import argparse
+import random
+import time
+
+from app.services.job_scoring import JobScoringEngine, job_text
+from app.utils.keyword_extractor import KeywordExtractor
+
+
+def synthetic_data(n_profiles: int, n_jobs: int, seed: int = 3):
+    rng = random.Random(seed)
+    vocab = sorted(KeywordExtractor.ALL_SKILLS)
+    profiles = [rng.sample(vocab, rng.randint(3, 12)) for _ in range(n_profiles)]
+    jobs = [
+        {
+            "title": rng.choice(["Backend Developer", "Data Scientist", "DevOps Engineer"]),
+            "description": " ".join(rng.sample(vocab, 15)) + " team player with strong communication",
+            "category": "IT Jobs",
+        }
+        for _ in range(n_jobs)
+    ]
+    return profiles, jobs
+
+
+def legacy_rank(profiles, jobs, top_k):
+    results = []
+    for skills in profiles:
+        user_skills = [s.lower() for s in skills]
+        scored = []
+        for idx, job in enumerate(jobs):
+            text = job_text(job).lower()
+            matching = [s for s in user_skills if s in text]
+            pct = int(len(matching) / len(user_skills) * 100) if user_skills else 0
+            scored.append({"job_index": idx, "match_percentage": pct, "matching_skills": matching,
+                           "missing_skills": list(set(user_skills) - set(matching))})
+        scored.sort(key=lambda x: x["match_percentage"], reverse=True)
+        results.append(scored[:top_k])
+    return results
+
+
+def main(args):
+    profiles, jobs = synthetic_data(args.profiles, args.jobs)
+
+    start = time.perf_counter()
+    legacy_rank(profiles, jobs, args.top_k)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = JobScoringEngine(profiles)
+    job_matrix = engine.job_incidence(jobs)
+    incidence_s = time.perf_counter() - start
+    scores = engine.score_matrix(job_matrix)
+    engine.top_k(scores, args.top_k)
+    matrix_s = time.perf_counter() - start - incidence_s
+
+    start = time.perf_counter()
+    engine.rank(jobs, args.top_k)
+    total_s = time.perf_counter() - start
+
+    print(f"{args.profiles} profiles x {args.jobs} jobs, top-{args.top_k}")
+    print(f"  legacy per-job loop     {legacy_s * 1000:9.1f} ms")
+    print(f"  engine job incidence    {incidence_s * 1000:9.1f} ms")
+    print(f"  engine score + top-k    {matrix_s * 1000:9.1f} ms")
+    print(f"  engine rank, end to end {total_s * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=20)
+    main(parser.parse_args())
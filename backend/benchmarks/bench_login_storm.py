@@ -0,0 +1,88 @@
+"""
+Login storm: latency of an unrelated endpoint while a burst of logins is being processed.
+
+Compares argon2 running inline on the event loop (previous behaviour) with the bounded
+hashing executor. Needs a reachable MongoDB for the login lookups:
+
+    python -m benchmarks.bench_login_storm --mongo-uri mongodb://localhost:27017 --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from .bench_auth import BENCH_DB, setup
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def storm(app, logins: int, concurrency: int, probe_interval: float):
+    probe_latencies = []
+    remaining = iter(range(logins))
+    form = {"username": "bench@example.com", "password": "benchmark-password"}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get("/openapi.json")  # build the schema once so probes only measure the loop
+        done = asyncio.Event()
+
+        async def login_worker():
+            for _ in remaining:
+                response = await client.post("/auth/login", data=form)
+                response.raise_for_status()
+
+        async def probe():
+            while not done.is_set():
+                # Measured from when the probe was due, so time spent waiting for a blocked loop counts
+                due = time.perf_counter() + probe_interval
+                await asyncio.sleep(probe_interval)
+                await client.get("/openapi.json")
+                probe_latencies.append(time.perf_counter() - due)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    return elapsed, probe_latencies
+
+
+async def main(args):
+    from app import auth_utils
+    from app.main import app
+
+    client, _ = await setup(args.mongo_uri)
+    executor_task = auth_utils.run_password_task
+
+    async def inline_task(fn, *fn_args):
+        return fn(*fn_args)
+
+    try:
+        print(f"{args.logins} logins, concurrency {args.concurrency}, "
+              f"argon2 t={auth_utils.ARGON2_TIME_COST} m={auth_utils.ARGON2_MEMORY_COST} p={auth_utils.ARGON2_PARALLELISM}")
+        for label, runner in (("inline (old)", inline_task), ("executor", executor_task)):
+            auth_utils.run_password_task = runner
+            elapsed, latencies = await storm(app, args.logins, args.concurrency, args.probe_interval)
+            print(
+                f"  {label:<13} logins/s={args.logins / elapsed:7.1f}  unrelated endpoint: "
+                f"p50={percentile(latencies, 50) * 1000:7.1f} ms  p99={percentile(latencies, 99) * 1000:7.1f} ms  "
+                f"(n={len(latencies)})"
+            )
+    finally:
+        auth_utils.run_password_task = executor_task
+        await client.drop_database(BENCH_DB)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probe-interval", type=float, default=0.005)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,73 @@
+"""
+Scaling benchmark for the Aho-Corasick SkillMatcher vs. the previous regex-per-skill scan.
+
+    python -m benchmarks.bench_skill_matcher --sizes 100 10000 100000
+"""
+import argparse
+import random
+import re
+import string
+import time
+
+from app.utils.skill_matcher import SkillMatcher
+from app.utils.keyword_extractor import KeywordExtractor
+
+
+def synthetic_vocabulary(size: int, seed: int = 7):
+    rng = random.Random(seed)
+    vocab = set(KeywordExtractor.ALL_SKILLS)
+    while len(vocab) < size:
+        words = rng.randint(1, 3)
+        vocab.add(" ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(words)
+        ))
+    return sorted(vocab)[:size]
+
+
+def synthetic_resume(vocab, words: int = 1500, seed: int = 11):
+    rng = random.Random(seed)
+    filler = ["built", "scalable", "services", "team", "google", "using", "and", "with", "the", "led"]
+    tokens = []
+    for _ in range(words):
+        tokens.append(rng.choice(vocab) if rng.random() < 0.05 else rng.choice(filler))
+    return " ".join(tokens)
+
+
+def legacy_extract(skills, text):
+    text_lower = text.lower()
+    return [s for s in skills if re.search(r"\b" + re.escape(s) + r"\b", text_lower)]
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(args):
+    print(f"{'vocab':>8} {'build ms':>10} {'scan ms':>9} {'regex ms':>10} {'found':>6}")
+    for size in args.sizes:
+        vocab = synthetic_vocabulary(size)
+        text = synthetic_resume(vocab, args.words)
+
+        build_s, matcher = timed(lambda: SkillMatcher(vocab), 1)
+        scan_s, found = timed(lambda: matcher.find(text), args.repeat)
+        if size <= args.regex_limit:
+            regex_s, _ = timed(lambda: legacy_extract(vocab, text), 1)
+            regex_ms = f"{regex_s * 1000:10.1f}"
+        else:
+            regex_ms = f"{'skipped':>10}"
+        print(f"{size:>8} {build_s * 1000:10.1f} {scan_s * 1000:9.2f} {regex_ms} {len(found):>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--words", type=int, default=1500, help="Words in the synthetic resume")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--regex-limit", type=int, default=10000, help="Largest vocabulary to time the regex scan on")
+    main(parser.parse_args())
@@ -0,0 +1,95 @@
+"""
+Scaling benchmark for SkillTaxonomy: build time, memory and lookup cost at large vocabularies,
+against a plain {spelling: id} dict.
+
+    python -m benchmarks.bench_skill_taxonomy --sizes 1000 50000 200000 --aliases 2
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import string
+import tempfile
+import time
+import tracemalloc
+
+from app.utils.skill_taxonomy import SkillTaxonomy, skill_key
+
+
+def synthetic_taxonomy(size: int, aliases: int, seed: int = 5):
+    rng = random.Random(seed)
+
+    def word():
+        return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+
+    skills = {}
+    while len(skills) < size:
+        skills[" ".join(word() for _ in range(rng.randint(1, 3)))] = [word() + rng.choice(["js", ".net", " 2", "-x"]) for _ in range(aliases)]
+    return skills
+
+
+def traced(fn):
+    """(result, bytes still allocated by `fn`'s result, seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, seconds
+
+
+def dict_baseline(skills):
+    """The straightforward table: {spelling: canonical name}."""
+    table = {}
+    for canonical, aliases in skills.items():
+        name = table.setdefault(skill_key(canonical), skill_key(canonical))
+        for alias in aliases:
+            table.setdefault(skill_key(alias), name)
+    return table
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args):
+    print(f"{'skills':>8} {'spellings':>10} {'load ms':>8} {'MB':>6} {'dict MB':>8} "
+          f"{'lookup us':>10} {'dict us':>8} {'ids(1k) ms':>11}")
+    for size in args.sizes:
+        skills = synthetic_taxonomy(size, args.aliases)
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"version": 1, "skills": skills}, f)
+        try:
+            taxonomy, taxonomy_bytes, _ = traced(lambda: SkillTaxonomy(skills))
+            load_s = timed(lambda: SkillTaxonomy.load(f.name), 1)
+        finally:
+            os.unlink(f.name)
+        table, dict_bytes, _ = traced(lambda: dict_baseline(skills))
+
+        rng = random.Random(9)
+        spellings = [rng.choice([canonical, *aliases]) for canonical, aliases in rng.sample(list(skills.items()), 1000)]
+        queries = [s.upper() for s in spellings]  # distinct from the cached raw spellings
+        lookup_s = timed(lambda: [taxonomy._search(skill_key(q)) for q in queries], args.repeat) / len(queries)
+        dict_s = timed(lambda: [table.get(skill_key(q)) for q in queries], args.repeat) / len(queries)
+        bulk_s = timed(lambda: taxonomy.ids(queries), args.repeat)
+        assert all(taxonomy.canonical(s) == table[skill_key(s)] for s in spellings)
+
+        print(f"{size:8d} {len(table):10d} {load_s * 1000:8.1f} {taxonomy_bytes / 2**20:6.1f} {dict_bytes / 2**20:8.1f} "
+              f"{lookup_s * 1e6:10.2f} {dict_s * 1e6:8.2f} {bulk_s * 1000:11.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 50000, 200000])
+    parser.add_argument("--aliases", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,77 @@
+"""
+Scaling benchmark for semantic job matching: HashingEmbedder fit/embed throughput and
+VectorIndex search latency (single query and batches) over synthetic postings.
+
+    python -m benchmarks.bench_vector_index --sizes 10000 100000 --batch 32
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.services.job_index import embedding_text
+from app.utils.text_embedding import HashingEmbedder
+from app.utils.vector_index import VectorIndex
+
+from . import corpus
+
+SIMILAR_PAIRS = [("postgres", "postgresql"), ("react", "react native"), ("spring boot", "spring"),
+                 ("java", "javascript"), ("tensorflow", "pytorch")]
+
+
+def latency(fn, repeat: int):
+    """Median seconds of `fn()` over `repeat` calls."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(args):
+    embedder = HashingEmbedder()
+    names = [name for pair in SIMILAR_PAIRS for name in pair]
+    vectors = dict(zip(names, embedder.embed(names)))
+    for a, b in SIMILAR_PAIRS:
+        print(f"cosine({a!r}, {b!r}) = {float(vectors[a] @ vectors[b]):.2f}")
+    print()
+
+    profiles = [f"{title} {' '.join(skills)}" for title, skills in
+                zip(corpus.JOB_TITLES * args.batch, corpus.make_skill_sets(args.batch))]
+    print(f"{'postings':>9} {'fit us/doc':>11} {'embed us/doc':>13} {'MB':>6} "
+          f"{'query ms':>9} {f'batch{args.batch} ms':>11} {'per query ms':>13}")
+    for size in args.sizes:
+        texts = [embedding_text(job) for job in corpus.make_jobs(size)]
+        start = time.perf_counter()
+        embedder = HashingEmbedder().fit(texts)
+        fit_s = time.perf_counter() - start
+        start = time.perf_counter()
+        matrix = embedder.embed(texts)
+        embed_s = time.perf_counter() - start
+
+        index = VectorIndex(embedder.dim, capacity=size)
+        index.add([str(i) for i in range(size)], matrix, [i % 2 for i in range(size)])
+        queries = embedder.embed(profiles)
+        query_s = latency(lambda: index.search(queries[:1], args.k), args.repeat)
+        batch_s = latency(lambda: index.search(queries, args.k), args.repeat)
+
+        # The index is exact: its top-k must equal a full sort
+        expected = np.argsort(-(matrix @ queries[0]), kind="stable")[:args.k]
+        found = [int(key) for key, _ in index.search(queries[0], args.k)[0]]
+        assert np.allclose((matrix @ queries[0])[found], (matrix @ queries[0])[expected], atol=1e-5)
+        assert all(int(key) % 2 == 1 for key, _ in index.search(queries[0], args.k, group=1)[0])
+
+        print(f"{size:9d} {fit_s / size * 1e6:11.1f} {embed_s / size * 1e6:13.1f} "
+              f"{index._vectors.nbytes / 2**20:6.1f} {query_s * 1000:9.2f} {batch_s * 1000:11.2f} "
+              f"{batch_s / len(queries) * 1000:13.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--batch", type=int, default=32, help="queries per batched search")
+    parser.add_argument("-k", type=int, default=200, help="neighbours per query (the route's JOB_INDEX_CANDIDATES)")
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,123 @@
+"""
+Deterministic synthetic corpus for the benchmarks: resumes, job postings, profiles and PDFs.
+
+Everything is generated from a seed, so two runs with the same parameters measure the same input.
+"""
+import random
+
+from app.utils.keyword_extractor import KeywordExtractor
+
+FIRST_NAMES = ["aarav", "priya", "john", "maria", "wei", "fatima", "lucas", "ananya", "omar", "sofia"]
+LAST_NAMES = ["sharma", "smith", "garcia", "chen", "khan", "silva", "iyer", "müller", "okafor", "rossi"]
+FILLER = [
+    "built", "scalable", "services", "for", "the", "team", "using", "and", "with", "led", "improved",
+    "latency", "by", "designed", "deployed", "customer", "facing", "platform", "google", "internal",
+    "reduced", "costs", "migrated", "legacy", "system", "to", "cloud", "mentored", "engineers",
+]
+PROJECT_HEADERS = ["Projects", "Key Projects", "Academic Projects", "Technical Projects"]
+OTHER_HEADERS = ["Experience", "Education", "Certifications", "Achievements"]
+JOB_TITLES = [
+    "Backend Developer", "Frontend Developer", "Full Stack Developer",
+    "Data Scientist", "DevOps Engineer", "Mobile Developer",
+]
+
+
+def skill_vocabulary():
+    return sorted(KeywordExtractor.ALL_SKILLS)
+
+
+def sentence(rng: random.Random, vocab, words: int, skill_rate: float = 0.15) -> str:
+    return " ".join(rng.choice(vocab) if rng.random() < skill_rate else rng.choice(FILLER) for _ in range(words))
+
+
+def make_resume(rng: random.Random, vocab, paragraphs: int) -> str:
+    """A plain-text resume with the sections KeywordExtractor looks for."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}".title()
+    lines = [
+        name,
+        f"{name.split()[0].lower()}.{rng.randint(1, 999)}@example.com | +91 98{rng.randint(10000000, 99999999)}",
+        "",
+        "Skills",
+        ", ".join(rng.sample(vocab, rng.randint(5, 15))),
+        "",
+        "Experience",
+    ]
+    for _ in range(paragraphs):
+        lines.append(f"- {sentence(rng, vocab, rng.randint(12, 30)).capitalize()}.")
+    lines += ["", rng.choice(PROJECT_HEADERS)]
+    for i in range(rng.randint(2, 6)):
+        lines.append(f"Project {i + 1}: {sentence(rng, vocab, rng.randint(6, 14))}")
+    for header in rng.sample(OTHER_HEADERS, 2):
+        lines += ["", header, sentence(rng, vocab, rng.randint(8, 20), skill_rate=0.05)]
+    return "\n".join(lines)
+
+
+def make_resumes(count: int, paragraphs: int = 8, seed: int = 18):
+    rng = random.Random(seed)
+    vocab = skill_vocabulary()
+    return [make_resume(rng, vocab, rng.randint(paragraphs // 2, paragraphs * 2)) for _ in range(count)]
+
+
+def make_jobs(count: int, seed: int = 19):
+    """Job dicts shaped like the normalized Adzuna postings in the job index."""
+    rng = random.Random(seed)
+    vocab = skill_vocabulary()
+    return [
+        {
+            "id": str(100000 + i),
+            "title": rng.choice(JOB_TITLES),
+            "company": f"Company {rng.randint(1, 200)}",
+            "location": "Bengaluru, Karnataka",
+            "description": sentence(rng, vocab, rng.randint(60, 200), skill_rate=0.1),
+            "category": "IT Jobs",
+            "salary_min": rng.choice([None, 600000]),
+            "salary_max": rng.choice([None, 1800000]),
+        }
+        for i in range(count)
+    ]
+
+
+def make_skill_sets(count: int, seed: int = 20):
+    rng = random.Random(seed)
+    vocab = skill_vocabulary()
+    return [rng.sample(vocab, rng.randint(3, 12)) for _ in range(count)]
+
+
+def _pdf_escape(text: str) -> str:
+    return text.encode("latin-1", "replace").decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages) -> bytes:
+    """Builds a minimal uncompressed PDF; `pages` is a list of pages, each a list of text lines."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>")
+    font = 3 + 2 * len(pages)
+    for i, lines in enumerate(pages):
+        body = " T* ".join(f"({_pdf_escape(line)}) Tj" for line in lines)
+        content = f"BT /F1 10 Tf 12 TL 50 750 Td {body} ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {4 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+def make_resume_pdf(resume: str, pages: int = 1, lines_per_page: int = 55) -> bytes:
+    """Lays a text resume out over `pages` pages, repeating it to fill them."""
+    lines = [line for line in resume.split("\n") if line]
+    total = pages * lines_per_page
+    lines = (lines * (total // len(lines) + 1))[:total]
+    return make_pdf([lines[i:i + lines_per_page] for i in range(0, total, lines_per_page)])
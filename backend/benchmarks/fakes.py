@@ -0,0 +1,244 @@
+"""
+Local stand-ins for the external services, for load tests and benchmarks.
+
+- FakeGemini speaks enough of the Gemini REST API (generateContent / streamGenerateContent)
+  for google-genai; point the app at it with GEMINI_BASE_URL.
+- FakeAdzuna serves /{country}/search/{page}; point the app at it with ADZUNA_BASE_URL.
+- SMTP is covered by benchmarks.bench_email_outbox.SMTPSink.
+
+Each fake runs in a background thread and injects latency and errors drawn from a LatencyModel.
+"""
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from app.utils.keyword_extractor import KeywordExtractor
+
+from . import corpus
+
+
+class LatencyModel:
+    """
+    Latency distribution parsed from a spec (milliseconds):
+    "const:50", "uniform:20:80" or "lognormal:200:0.5" (median, sigma).
+    """
+
+    def __init__(self, spec: str, seed: int = 0):
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        self.spec = spec
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        if kind not in ("const", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        """One latency in seconds."""
+        with self._lock:
+            if self.kind == "const":
+                ms = self.params[0]
+            elif self.kind == "uniform":
+                ms = self._rng.uniform(*self.params)
+            else:
+                median, sigma = self.params
+                ms = self._rng.lognormvariate(0, sigma) * median
+        return ms / 1000
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+    def __init__(self, handler, latency: str, error_rate: float = 0.0, error_status: int = 503, seed: int = 0):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.latency = LatencyModel(latency, seed)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed + 1)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            failed = self._rng.random() < self.error_rate
+            self.errors += failed
+        return failed
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "errors": self.errors, "latency": self.latency.spec}
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def injected_failure(self) -> bool:
+        time.sleep(self.server.latency.sample())
+        if self.server.should_fail():
+            status = self.server.error_status
+            self.send_json(status, {"error": {"code": status, "message": "Injected failure", "status": "UNAVAILABLE"}})
+            return True
+        return False
+
+
+# --------------------------
+# GEMINI
+# --------------------------
+def fake_resume(prompt: str) -> dict:
+    skills = KeywordExtractor.extract_skills(prompt.split("Required JSON Structure")[0])
+    return {
+        "name": "Load Test Candidate",
+        "email": "candidate@example.com",
+        "technical_skills": skills,
+        "soft_skills": ["communication", "teamwork"],
+        "projects": ["Built a synthetic project for load testing"],
+        "experience": "Synthetic experience summary.",
+        "job_role": KeywordExtractor.infer_role(skills),
+    }
+
+
+def fake_resources(skills) -> dict:
+    return {
+        skill: {
+            "roadmap": [f"Step 1: {skill} basics", f"Step 2: {skill} project", f"Step 3: advanced {skill}"],
+            "websites": [f"https://example.com/learn/{skill.replace(' ', '-')}"],
+            "youtube": [f"https://www.youtube.com/results?search_query={skill.replace(' ', '+')}+course - {skill} Full Course"],
+        }
+        for skill in skills
+    }
+
+
+def fake_roadmap(prompt: str) -> dict:
+    role = re.search(r'role of: "(.*?)"', prompt)
+    role = role.group(1).lower() if role else ""
+    current = re.search(r"Current Technical Skills: (.*)", prompt)
+    current = {s.strip().lower() for s in current.group(1).split(",")} if current else set()
+    required = next((skills for name, skills in KeywordExtractor.SKILLS_DB.items() if name.lower() == role and skills),
+                    ["python", "sql", "docker", "git", "linux", "aws"])[:8]
+    missing = [skill for skill in required if skill not in current]
+    return {"required_skills": required, "missing_skills": missing, "learning_roadmap": fake_resources(missing)}
+
+
+def fake_completion(prompt: str) -> str:
+    if "Resume Parser" in prompt:
+        return json.dumps(fake_resume(prompt))
+    learn = re.search(r"needs to learn these skills: (.*)", prompt)
+    if learn:
+        skills = [s.strip() for s in learn.group(1).split(",") if s.strip()]
+        return json.dumps({"learning_roadmap": fake_resources(skills)})
+    return json.dumps(fake_roadmap(prompt))
+
+
+def gemini_response(text: str) -> dict:
+    return {
+        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP", "index": 0}],
+        "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": len(text) // 4},
+    }
+
+
+class GeminiHandler(FakeHandler):
+    STREAM_CHUNKS = 8
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.injected_failure():
+            return
+        prompt = " ".join(
+            part.get("text", "") for content in request.get("contents", []) for part in content.get("parts", [])
+        )
+        text = fake_completion(prompt)
+
+        if ":streamGenerateContent" not in self.path:
+            self.send_json(200, gemini_response(text))
+            return
+
+        # Server-sent events, one candidate chunk per event
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        step = max(1, len(text) // self.STREAM_CHUNKS)
+        for start in range(0, len(text), step):
+            self.wfile.write(f"data: {json.dumps(gemini_response(text[start:start + step]))}\r\n\r\n".encode())
+            self.wfile.flush()
+            time.sleep(0.01)
+        self.close_connection = True
+
+
+class FakeGemini(FakeServer):
+    def __init__(self, latency: str = "lognormal:800:0.4", error_rate: float = 0.0, error_status: int = 503, seed: int = 0):
+        super().__init__(GeminiHandler, latency, error_rate, error_status, seed)
+
+
+# --------------------------
+# ADZUNA
+# --------------------------
+def adzuna_results(query: str, page: int, per_page: int) -> list:
+    seed = zlib.crc32(f"{query}|{page}".encode())
+    jobs = corpus.make_jobs(per_page, seed=seed)
+    return [
+        {
+            "id": f"{seed % 100000}{page:03d}{i:03d}",
+            "title": job["title"],
+            "company": {"display_name": job["company"]},
+            "location": {"display_name": job["location"]},
+            "description": job["description"],
+            "redirect_url": "https://example.com/jobs",
+            "salary_min": job["salary_min"],
+            "salary_max": job["salary_max"],
+            "category": {"label": job["category"]},
+            "created": "2026-01-01T00:00:00Z",
+        }
+        for i, job in enumerate(jobs)
+    ]
+
+
+class AdzunaHandler(FakeHandler):
+    def do_GET(self):
+        if self.injected_failure():
+            return
+        url = urlparse(self.path)
+        match = re.search(r"/search/(\d+)$", url.path)
+        if not match:
+            self.send_json(404, {"error": "not found"})
+            return
+        params = parse_qs(url.query)
+        query = params.get("what", [""])[0]
+        per_page = int(params.get("results_per_page", ["20"])[0])
+        page = int(match.group(1))
+        results = adzuna_results(query, page, per_page) if page <= 5 else []
+        self.send_json(200, {"results": results, "count": 5 * per_page})
+
+
+class FakeAdzuna(FakeServer):
+    def __init__(self, latency: str = "lognormal:250:0.3", error_rate: float = 0.0, error_status: int = 503, seed: int = 0):
+        super().__init__(AdzunaHandler, latency, error_rate, error_status, seed)
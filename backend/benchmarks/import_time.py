@@ -0,0 +1,107 @@
+"""
+Cold-start report: `python -X importtime -c "import app.main"` in fresh interpreters.
+
+Fails (exit code 1) when a dependency that must load lazily is imported eagerly, when the
+import exceeds --budget-ms, or, with --compare, when it got slower than the baseline by
+more than --threshold:
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 7 --top 30 --output imports.json
+    python -m benchmarks.import_time --compare imports.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use / by the lifespan warm-up; importing app.main must not pull them in
+DEFERRED_MODULES = ["google.genai", "PyPDF2", "passlib.context", "jose.jwt"]
+IMPORT_BUDGET_MS = 1000
+DEFAULT_THRESHOLD = 0.20
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure_once(target: str):
+    """Returns {module: (self_us, cumulative_us, depth)} for one cold import."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {target} failed:\n{result.stderr[-2000:]}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON to check against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    runs = [measure_once(args.target) for _ in range(args.runs)]
+    totals = [run[args.target][1] / 1000 for run in runs]
+    best = runs[totals.index(min(totals))]
+
+    print(f"import {args.target}: min {min(totals):.0f} ms, median {statistics.median(totals):.0f} ms "
+          f"over {args.runs} cold runs (budget {args.budget_ms:.0f} ms)")
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module (top-level packages of the fastest run)")
+    top_level = sorted(
+        ((name, t) for name, t in best.items() if t[2] <= 1 and name != args.target),
+        key=lambda item: item[1][1], reverse=True,
+    )
+    for name, (self_us, cumulative_us, depth) in top_level[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {'  ' * depth}{name}")
+
+    failures = []
+    eager = [name for name in DEFERRED_MODULES if name in best]
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(eager)}")
+    if min(totals) > args.budget_ms:
+        failures.append(f"import took {min(totals):.0f} ms, budget is {args.budget_ms:.0f} ms")
+
+    results = {
+        "target": args.target,
+        "python": sys.version.split()[0],
+        "runs_ms": totals,
+        "min_ms": min(totals),
+        "median_ms": statistics.median(totals),
+        "modules": {name: {"self_ms": s / 1000, "cumulative_ms": c / 1000} for name, (s, c, _) in top_level[:args.top]},
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        change = results["min_ms"] / baseline["min_ms"] - 1
+        print(f"\nvs baseline: {baseline['min_ms']:.0f} ms -> {results['min_ms']:.0f} ms ({change:+.1%}, limit {args.threshold:.0%})")
+        if change > args.threshold:
+            failures.append(f"import got {change:.0%} slower than the baseline")
+
+    if failures:
+        print("\nFAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+End-to-end load test: boots the FastAPI app against local stand-ins for Gemini, Adzuna, SMTP and
+MongoDB, replays a weighted mix of user traffic and reports RPS plus p50/p95/p99 per route.
+
+Nothing external is contacted. Mongo is either --mongo-uri or a throwaway mongod started from
+--mongod (found on PATH by default); the test database is dropped afterwards.
+
+    python -m benchmarks.loadtest --users 50 --duration 60
+    python -m benchmarks.loadtest --llm-latency lognormal:1500:0.6 --llm-error-rate 0.05 --output run.json
+    python -m benchmarks.loadtest --mix jobs.matched=50,roadmap.generate=50 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+from . import corpus
+from .bench_email_outbox import SMTPSink
+from .fakes import FakeAdzuna, FakeGemini
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = {
+    "auth.login": 5,
+    "auth.me": 10,
+    "resume.analyze": 10,
+    "roadmap.generate": 15,
+    "roadmap.stream": 5,
+    "jobs.matched": 25,
+    "apply": 10,
+    "apply.status": 10,
+    "apply.email": 5,
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(ordered, pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for item in spec.split(","):
+        name, weight = item.split("=")
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown route in --mix: {name} (choose from {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight)
+    return mix
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+
+    def record(self, route: str, seconds: float, status):
+        self.latencies[route].append(seconds)
+        self.statuses[route][status] += 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors[route] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {}
+        for route in sorted(self.latencies):
+            ordered = sorted(self.latencies[route])
+            routes[route] = {
+                "requests": len(ordered),
+                "errors": self.errors[route],
+                "rps": len(ordered) / elapsed,
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p95_ms": percentile(ordered, 95) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+                "statuses": {str(k): v for k, v in self.statuses[route].items()},
+            }
+        total = sum(r["requests"] for r in routes.values())
+        return {
+            "elapsed_s": elapsed,
+            "requests": total,
+            "errors": sum(r["errors"] for r in routes.values()),
+            "rps": total / elapsed if elapsed else 0.0,
+            "routes": routes,
+        }
+
+
+class VirtualUser:
+    """One signed-up user with a saved profile, issuing requests from the traffic mix."""
+
+    def __init__(self, index: int, run_id: str, rng: random.Random):
+        self.email = f"load-{run_id}-{index}@example.com"
+        self.password = "load-test-password"
+        self.rng = rng
+        resume = corpus.make_resumes(1, seed=index)[0]
+        self.resume_pdf = corpus.make_resume_pdf(resume)
+        self.skills = rng.sample(corpus.skill_vocabulary(), rng.randint(3, 10))
+        self.role = rng.choice(corpus.JOB_TITLES)
+        self.token = None
+        self.profile_id = None
+        self.seen_jobs = []
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    async def setup(self, client: httpx.AsyncClient, recorder: Recorder):
+        response = await timed(recorder, "auth.register", client.post(
+            "/auth/register", json={"email": self.email, "password": self.password}))
+        self.token = response.json()["access_token"]
+        response = await timed(recorder, "profile.save", client.post("/profile/save", headers=self.headers, json={
+            "name": self.email.split("@")[0],
+            "email": self.email,
+            "technical_skills": self.skills,
+            "soft_skills": ["communication"],
+            "projects": "Load test project",
+            "experience": "Load test experience",
+            "job_role": self.role,
+        }))
+        self.profile_id = response.json()["profile_id"]
+
+    def request(self, client: httpx.AsyncClient, route: str):
+        if route == "auth.login":
+            return client.post("/auth/login", data={"username": self.email, "password": self.password})
+        if route == "auth.me":
+            return client.get("/auth/me", headers=self.headers)
+        if route == "resume.analyze":
+            files = {"file": ("resume.pdf", self.resume_pdf, "application/pdf")}
+            return client.post("/resume/analyze", headers=self.headers, files=files)
+        if route == "roadmap.generate":
+            return client.post("/roadmap/generate", headers=self.headers,
+                               json={"job_role": self.role, "technical_skills": self.skills})
+        if route == "roadmap.stream":
+            return client.post("/roadmap/generate/stream", headers=self.headers,
+                               json={"job_role": self.role, "technical_skills": self.skills})
+        if route == "jobs.matched":
+            return client.get(f"/jobs/matched/{self.profile_id}", headers=self.headers, params={"limit": 20})
+        if route == "apply":
+            job_ids = self.rng.sample(self.seen_jobs, min(3, len(self.seen_jobs))) or [f"synthetic-{self.rng.randint(0, 10**6)}"]
+            return client.post("/apply/", headers=self.headers, json={"job_ids": job_ids})
+        if route == "apply.status":
+            return client.get("/apply/status", headers=self.headers, params={"limit": 100})
+        if route == "apply.email":
+            return client.post("/apply/email", headers=self.headers, json={
+                "job_id": self.rng.choice(self.seen_jobs) if self.seen_jobs else "synthetic-email",
+                "company_email": "hr@example.com",
+                "job_title": self.role,
+                "company_name": "Load Test Corp",
+            })
+        raise ValueError(route)
+
+    def observe(self, route: str, response: httpx.Response):
+        if route == "jobs.matched" and response.status_code == 200:
+            body = response.json()
+            if isinstance(body, list):
+                self.seen_jobs = [job["id"] for job in body if "id" in job][:20]
+
+
+async def timed(recorder: Recorder, route: str, request) -> httpx.Response:
+    start = time.perf_counter()
+    try:
+        response = await request
+        await response.aread()
+        recorder.record(route, time.perf_counter() - start, response.status_code)
+        return response
+    except httpx.HTTPError as e:
+        recorder.record(route, time.perf_counter() - start, type(e).__name__)
+        raise
+
+
+async def run_load(args, base_url: str, run_id: str) -> dict:
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    routes, weights = list(mix), list(mix.values())
+    rng = random.Random(args.seed)
+    users = [VirtualUser(i, run_id, random.Random(args.seed + i)) for i in range(args.users)]
+    limits = httpx.Limits(max_connections=args.users * 2, max_keepalive_connections=args.users * 2)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        setup = Recorder()
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(20)  # keep sign-up (argon2) from dominating the start
+
+        async def setup_user(user):
+            async with semaphore:
+                await user.setup(client, setup)
+
+        await asyncio.gather(*(setup_user(user) for user in users))
+        setup_summary = setup.summary(time.perf_counter() - start)
+        print(f"Set up {len(users)} users in {setup_summary['elapsed_s']:.1f}s")
+
+        recorder = Recorder()
+        measuring = asyncio.Event()
+        deadline = time.perf_counter() + args.warmup + args.duration
+
+        async def user_loop(user: VirtualUser):
+            while time.perf_counter() < deadline:
+                route = rng.choices(routes, weights)[0]
+                target = recorder if measuring.is_set() else Recorder()
+                try:
+                    response = await timed(target, route, user.request(client, route))
+                    user.observe(route, response)
+                except httpx.HTTPError:
+                    pass
+                if args.think_ms:
+                    await asyncio.sleep(user.rng.uniform(0, 2 * args.think_ms) / 1000)
+
+        async def start_measuring():
+            await asyncio.sleep(args.warmup)
+            measuring.set()
+            return time.perf_counter()
+
+        measure_task = asyncio.create_task(start_measuring())
+        await asyncio.gather(*(user_loop(user) for user in users))
+        elapsed = time.perf_counter() - await measure_task
+
+    return {"setup": setup_summary, "load": recorder.summary(elapsed), "mix": mix}
+
+
+def print_summary(summary: dict):
+    print(f"\n{'route':20s} {'reqs':>7} {'err':>5} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for route, r in summary["routes"].items():
+        print(f"{route:20s} {r['requests']:7d} {r['errors']:5d} {r['rps']:8.1f} "
+              f"{r['p50_ms']:9.1f} {r['p95_ms']:9.1f} {r['p99_ms']:9.1f} {r['max_ms']:9.1f}")
+    print(f"{'total':20s} {summary['requests']:7d} {summary['errors']:5d} {summary['rps']:8.1f}")
+
+
+def start_mongod(binary: str, workdir: str):
+    path = shutil.which(binary)
+    if not path:
+        raise SystemExit("No mongod found; pass --mongo-uri or --mongod /path/to/mongod")
+    port = free_port()
+    dbpath = os.path.join(workdir, "mongo")
+    os.makedirs(dbpath)
+    process = subprocess.Popen(
+        [path, "--dbpath", dbpath, "--port", str(port), "--bind_ip", "127.0.0.1"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return process, f"mongodb://127.0.0.1:{port}"
+
+
+def wait_for(check, what: str, timeout: float, process=None):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"{what} exited with code {process.returncode}")
+        try:
+            if check():
+                return
+        except Exception:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Timed out waiting for {what}")
+
+
+def mongo_ready(uri: str) -> bool:
+    from pymongo import MongoClient
+    client = MongoClient(uri, serverSelectionTimeoutMS=500)
+    try:
+        return bool(client.admin.command("ping"))
+    finally:
+        client.close()
+
+
+def drop_database(uri: str, name: str):
+    from pymongo import MongoClient
+    client = MongoClient(uri, serverSelectionTimeoutMS=2000)
+    try:
+        client.drop_database(name)
+    except Exception as e:
+        print(f"Could not drop {name}: {type(e).__name__}")
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds of traffic before measuring")
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause between a user's requests")
+    parser.add_argument("--mix", help="route weights, e.g. jobs.matched=25,roadmap.generate=15")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=19)
+    parser.add_argument("--llm-latency", default="lognormal:800:0.4", help="const:MS | uniform:LO:HI | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-error-status", type=int, default=503)
+    parser.add_argument("--adzuna-latency", default="lognormal:250:0.3")
+    parser.add_argument("--adzuna-error-rate", type=float, default=0.0)
+    parser.add_argument("--adzuna-error-status", type=int, default=503)
+    parser.add_argument("--smtp-rtt-ms", type=float, default=20)
+    parser.add_argument("--mongo-uri", help="use this MongoDB instead of starting a mongod")
+    parser.add_argument("--mongod", default="mongod", help="mongod binary to start when --mongo-uri is not given")
+    parser.add_argument("--keep-db", action="store_true", help="do not drop the load-test database afterwards")
+    parser.add_argument("--app", default="app.main:app", help="ASGI app for uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--app-log", help="write the app's stdout/stderr here")
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args()
+
+    run_id = time.strftime("%Y%m%d%H%M%S")
+    db_name = f"loadtest_{run_id}"
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    mongod = app = None
+
+    gemini = FakeGemini(args.llm_latency, args.llm_error_rate, args.llm_error_status, seed=args.seed).start()
+    adzuna = FakeAdzuna(args.adzuna_latency, args.adzuna_error_rate, args.adzuna_error_status, seed=args.seed).start()
+    smtp = SMTPSink(args.smtp_rtt_ms / 1000, 0)
+    threading.Thread(target=smtp.serve_forever, daemon=True).start()
+
+    try:
+        mongo_uri = args.mongo_uri
+        if not mongo_uri:
+            mongod, mongo_uri = start_mongod(args.mongod, workdir)
+            wait_for(lambda: mongo_ready(mongo_uri), "mongod", 30, mongod)
+
+        port = free_port()
+        smtp_host, smtp_port = smtp.server_address
+        env = {
+            **os.environ,
+            "GEMINI_API_KEY": "load-test",
+            "GEMINI_BASE_URL": gemini.url,
+            "ADZUNA_BASE_URL": adzuna.url,
+            "SMTP_EMAIL": "load-test@example.com",
+            "SMTP_PASSWORD": "load-test",
+            "SMTP_HOST": smtp_host,
+            "SMTP_PORT": str(smtp_port),
+            "SMTP_STARTTLS": "false",
+            "MONGODB_URI": mongo_uri,
+            "MONGODB_DB": db_name,
+            "JOB_INDEX_PATH": os.path.join(workdir, "job_index.json"),
+        }
+        log = open(args.app_log, "w") if args.app_log else subprocess.DEVNULL
+        app = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", args.app, "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(args.workers), "--no-access-log"],
+            cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        wait_for(lambda: httpx.get(f"{base_url}/openapi.json").status_code == 200, "the app", 60, app)
+
+        print(f"{args.users} users, {args.warmup:.0f}s warm-up + {args.duration:.0f}s measured; "
+              f"LLM {args.llm_latency} ({args.llm_error_rate:.0%} errors), Adzuna {args.adzuna_latency} "
+              f"({args.adzuna_error_rate:.0%} errors)")
+        results = asyncio.run(run_load(args, base_url, run_id))
+        print_summary(results["load"])
+
+        time.sleep(1)  # let the email outbox drain what was queued
+        results["dependencies"] = {
+            "gemini": gemini.stats(),
+            "adzuna": adzuna.stats(),
+            "smtp": {"delivered": smtp.delivered},
+        }
+        print(f"\nGemini {gemini.requests} calls ({gemini.errors} failed), "
+              f"Adzuna {adzuna.requests} calls ({adzuna.errors} failed), {smtp.delivered} emails delivered")
+
+        if args.output:
+            results["config"] = vars(args)
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"Results written to {args.output}")
+    finally:
+        if app is not None:
+            app.terminate()
+            app.wait(timeout=30)
+        if mongo_uri and not args.keep_db and mongod is None:
+            drop_database(mongo_uri, db_name)
+        if mongod is not None:
+            mongod.terminate()
+            mongod.wait(timeout=30)
+        for server in (gemini, adzuna, smtp):
+            server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Microbenchmarks for the pure-CPU hot paths, on a deterministic synthetic corpus.
+
+Results are written as JSON so runs can be compared; with --compare the run fails (exit code 1)
+when a benchmark's median time per item regresses past its threshold:
+
+    python -m benchmarks.microbench --output baseline.json
+    python -m benchmarks.microbench --compare baseline.json --output current.json
+    python -m benchmarks.microbench --filter keyword. --repeat 9
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from . import corpus
+
+# Allowed slowdown of the median before a benchmark counts as a regression (0.15 = 15% slower)
+DEFAULT_THRESHOLD = 0.15
+THRESHOLDS = {
+    "pdf.extract_small.1p": 0.25,  # PyPDF2 allocates heavily; run-to-run noise is higher
+    "pdf.extract_small.5p": 0.25,
+}
+
+
+class Benchmark:
+    """`fn` processes `items` inputs per call; timings are reported per item."""
+
+    def __init__(self, name: str, fn, items: int):
+        self.name = name
+        self.fn = fn
+        self.items = items
+
+
+def build_benchmarks(args):
+    from app.utils.keyword_extractor import KeywordExtractor
+    from app.services.job_index import JobIndex
+    from app.services.job_scoring import JobScoringEngine
+    from app.utils.skill_taxonomy import get_taxonomy
+    from app.routes.roadmap import generate_manual_roadmap, JOB_SKILLS
+    from app.services.pdf_extractor import PDF_MAX_PAGES, PDF_PARALLEL_MIN_PAGES, _extract_small
+
+    resumes = corpus.make_resumes(args.resumes)
+    skill_lists = [KeywordExtractor.extract_skills(text) for text in resumes]
+    jobs = corpus.make_jobs(args.jobs)
+    profiles = corpus.make_skill_sets(args.profiles)
+    roles = [*JOB_SKILLS, "unknown role"]
+    pdfs = {pages: corpus.make_resume_pdf(resumes[0], pages) for pages in (1, 5)}
+
+    def each(fn, inputs):
+        return lambda: [fn(x) for x in inputs]
+
+    def match_profiles():
+        # The scoring step of GET /jobs/matched: one profile ranked against the candidate jobs
+        for skills in profiles:
+            JobScoringEngine([skills]).rank(jobs, top_k=20)
+
+    # The same candidates with skill ids resolved at ingest, as served from the JobIndex
+    index = JobIndex(path=None)
+    index.upsert_many({**job, "id": str(i)} for i, job in enumerate(jobs))
+    indexed_jobs = list(index.postings.values())
+    indexed_ids = index.skill_ids_for(indexed_jobs)
+
+    def match_profiles_indexed():
+        for skills in profiles:
+            JobScoringEngine([skills]).rank(indexed_jobs, top_k=20, job_skill_ids=indexed_ids)
+
+    index.refit_embeddings()
+    profile_vectors = [index.embed_query(" ".join(skills)) for skills in profiles]
+
+    def match_profiles_semantic():
+        # Vector candidates plus similarity re-ranking, as in GET /jobs/matched
+        for skills, vector in zip(profiles, profile_vectors):
+            similar = index.semantic_search(vector, limit=200)[0]
+            JobScoringEngine([skills]).rank(similar, top_k=20, job_skill_ids=index.skill_ids_for(similar),
+                                            similarity=index.similarities(vector, similar))
+
+    def roadmaps():
+        for role in roles:
+            for skills in profiles:
+                generate_manual_roadmap(role, skills)
+
+    return [
+        Benchmark("keyword.extract_skills", each(KeywordExtractor.extract_skills, resumes), len(resumes)),
+        Benchmark("keyword.infer_role", each(KeywordExtractor.infer_role, skill_lists), len(skill_lists)),
+        Benchmark("keyword.extract_projects", each(KeywordExtractor.extract_projects, resumes), len(resumes)),
+        Benchmark("keyword.process_resume", each(KeywordExtractor.process_resume, resumes), len(resumes)),
+        Benchmark("jobs.match_scoring", match_profiles, len(profiles)),
+        Benchmark("jobs.match_scoring_indexed", match_profiles_indexed, len(profiles)),
+        Benchmark("jobs.match_scoring_semantic", match_profiles_semantic, len(profiles)),
+        Benchmark("taxonomy.ids", each(get_taxonomy().ids, profiles), len(profiles)),
+        Benchmark("roadmap.generate_manual_roadmap", roadmaps, len(roles) * len(profiles)),
+        *(
+            # What a pool worker runs for an upload (in process, without the IPC round trip)
+            Benchmark(f"pdf.extract_small.{pages}p",
+                      lambda data=data: _extract_small(data, PDF_MAX_PAGES, PDF_PARALLEL_MIN_PAGES), 1)
+            for pages, data in pdfs.items()
+        ),
+    ]
+
+
+def measure(bench: Benchmark, repeat: int, min_time: float) -> dict:
+    """timeit-style: calibrate loops so one sample takes at least `min_time`, then take `repeat` samples."""
+    bench.fn()  # warm caches (compiled patterns, matcher automaton)
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            bench.fn()
+        if time.perf_counter() - start >= min_time:
+            break
+        loops *= 2
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                bench.fn()
+            samples.append((time.perf_counter() - start) / (loops * bench.items) * 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "items": bench.items,
+        "loops": loops,
+        "repeat": repeat,
+        "median_us": statistics.median(samples),
+        "min_us": min(samples),
+        "max_us": max(samples),
+        "stdev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(results: dict, baseline: dict, default_threshold: float) -> list:
+    """Prints the comparison table and returns the names of regressed benchmarks."""
+    regressions = []
+    print(f"\n{'benchmark':40s} {'baseline us':>12} {'current us':>12} {'change':>8} {'limit':>7}")
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            print(f"{name:40s} {'-':>12} {current['median_us']:12.2f}      new")
+            continue
+        change = current["median_us"] / previous["median_us"] - 1
+        limit = THRESHOLDS.get(name, default_threshold)
+        flag = "  REGRESSION" if change > limit else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:40s} {previous['median_us']:12.2f} {current['median_us']:12.2f} {change:+8.1%} {limit:7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--jobs", type=int, default=200, help="candidate jobs per match (JOB_INDEX_CANDIDATES)")
+    parser.add_argument("--profiles", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per sample")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON to check against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed median slowdown for benchmarks without their own threshold")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "corpus": {"resumes": args.resumes, "jobs": args.jobs, "profiles": args.profiles},
+        },
+        "benchmarks": {},
+    }
+
+    print(f"{'benchmark':40s} {'median us':>12} {'min us':>10} {'stdev':>8} {'loops':>6}")
+    for bench in build_benchmarks(args):
+        if args.filter not in bench.name:
+            continue
+        stats = measure(bench, args.repeat, args.min_time)
+        results["benchmarks"][bench.name] = stats
+        print(f"{bench.name:40s} {stats['median_us']:12.2f} {stats['min_us']:10.2f} "
+              f"{stats['stdev_us']:8.2f} {stats['loops']:6d}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("corpus") != results["meta"]["corpus"]:
+            print("WARNING: baseline was recorded with a different corpus; times are not comparable")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
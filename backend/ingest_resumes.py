@@ -0,0 +1,236 @@
+"""
+Bulk resume ingestion: PDFs from a directory or archive -> parsed Profiles in MongoDB.
+
+Three concurrent stages connected by bounded queues:
+  1. extraction  - PDF text in the process pool (app.services.pdf_extractor)
+  2. parsing     - AIResumeParser with bounded LLM concurrency, KeywordExtractor fallback
+  3. writing     - Profile documents inserted in batches with insert_many
+
+Progress is checkpointed after every written batch, so an interrupted run can be
+restarted with the same arguments and skips resumes that were already imported.
+
+    python ingest_resumes.py cohort_2026.zip --llm-concurrency 4 --batch-size 200
+    python ingest_resumes.py ./resumes --no-ai
+"""
+import argparse
+import asyncio
+import os
+import tarfile
+import time
+import zipfile
+
+from dotenv import load_dotenv
+from pymongo.errors import BulkWriteError
+
+from app.database import init_db
+from app.models import Profile
+from app.services.ai_resume import AIResumeParser
+from app.services.pdf_extractor import PDF_WORKERS, PDFPool, extract_pdf_text
+from app.utils.keyword_extractor import KeywordExtractor
+
+load_dotenv()
+
+_DONE = object()  # end-of-stream marker passed between stages
+
+
+def discover(source: str):
+    """
+    Yields (key, load) pairs; `load()` returns the PDF as bytes or a file path.
+
+    Loaders run concurrently in threads. A ZipFile serializes member reads itself, but a
+    TarFile shares one file offset (and a gzip stream can only be read in order), so tar
+    members are read here, one at a time, as the producer advances.
+    """
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if name.lower().endswith(".pdf"):
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, source), (lambda p=path: p)
+    elif zipfile.is_zipfile(source):
+        archive = zipfile.ZipFile(source)
+        for member in archive.namelist():
+            if member.lower().endswith(".pdf"):
+                yield member, (lambda m=member: archive.read(m))
+    elif tarfile.is_tarfile(source):
+        archive = tarfile.open(source)
+        for member in archive.getmembers():
+            if member.isfile() and member.name.lower().endswith(".pdf"):
+                data = archive.extractfile(member).read()
+                yield member.name, (lambda d=data: d)
+    else:
+        raise SystemExit(f"Not a directory or a zip/tar archive: {source}")
+
+
+def load_checkpoint(path: str) -> set:
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def to_profile(parsed: dict) -> Profile:
+    projects = parsed.get("projects")
+    email = parsed.get("email")
+    return Profile(
+        name=parsed.get("name") or "Candidate",
+        email=email if email and email != "Not Found" else None,
+        # The keyword fallback reports "skills" rather than "technical_skills"
+        technical_skills=parsed.get("technical_skills") or parsed.get("skills") or [],
+        soft_skills=parsed.get("soft_skills") or [],
+        projects="\n".join(projects) if isinstance(projects, list) else projects,
+        experience=parsed.get("experience"),
+        job_role=parsed.get("job_role") or "developer",
+    )
+
+
+class Stats:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.extracted = 0
+        self.parsed = {"ai": 0, "keyword": 0}
+        self.written = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def report(self):
+        elapsed = time.perf_counter() - self.start
+        rate = self.written / elapsed if elapsed else 0.0
+        print(
+            f"Imported {self.written} resumes in {elapsed:.1f}s ({rate:.1f} resumes/sec) | "
+            f"AI: {self.parsed['ai']}, keyword fallback: {self.parsed['keyword']}, "
+            f"failed: {self.failed}, skipped (checkpoint): {self.skipped}"
+        )
+
+
+async def extract_stage(items: asyncio.Queue, texts: asyncio.Queue, stats: Stats):
+    while True:
+        item = await items.get()
+        if item is _DONE:
+            await items.put(_DONE)  # let sibling workers see it too
+            return
+        key, load = item
+        try:
+            text = await extract_pdf_text(await asyncio.to_thread(load))
+            if not text.strip():
+                raise ValueError("no text")
+            stats.extracted += 1
+            await texts.put((key, text))
+        except Exception as e:
+            stats.failed += 1
+            print(f"Extraction failed for {key}: {e}")
+
+
+async def parse_stage(texts: asyncio.Queue, profiles: asyncio.Queue, stats: Stats, use_ai: bool):
+    while True:
+        item = await texts.get()
+        if item is _DONE:
+            await texts.put(_DONE)
+            return
+        key, text = item
+        parsed = None
+        if use_ai:
+            try:
+                parsed = await AIResumeParser.parse_resume(text)
+                stats.parsed["ai"] += 1
+            except Exception as e:
+                print(f"AI parsing failed for {key} ({e}), using keyword extraction")
+        if parsed is None:
+            parsed = KeywordExtractor.process_resume(text)
+            stats.parsed["keyword"] += 1
+        await profiles.put((key, to_profile(parsed)))
+
+
+async def write_stage(profiles: asyncio.Queue, stats: Stats, batch_size: int, checkpoint_path: str):
+    batch = []
+
+    async def flush():
+        if not batch:
+            return
+        rejected = set()
+        try:
+            await Profile.insert_many([profile for _, profile in batch], ordered=False)
+        except BulkWriteError as e:
+            # Unordered: every document not listed in writeErrors was inserted
+            rejected = {error["index"] for error in e.details.get("writeErrors", [])}
+            for error in e.details.get("writeErrors", []):
+                print(f"Insert failed for {batch[error['index']][0]}: {error.get('errmsg')}")
+        inserted = [key for i, (key, _) in enumerate(batch) if i not in rejected]
+        with open(checkpoint_path, "a") as f:
+            f.writelines(f"{key}\n" for key in inserted)
+        stats.written += len(inserted)
+        stats.failed += len(rejected)
+        batch.clear()
+        stats.report()
+
+    while True:
+        item = await profiles.get()
+        if item is _DONE:
+            await flush()
+            return
+        batch.append(item)
+        if len(batch) >= batch_size:
+            await flush()
+
+
+async def run_stage_group(workers, downstream: asyncio.Queue):
+    await asyncio.gather(*workers)
+    await downstream.put(_DONE)
+
+
+async def main(args):
+    await init_db()
+    checkpoint_path = args.checkpoint or f"{os.path.abspath(args.source).rstrip(os.sep)}.ingest-checkpoint"
+    done = load_checkpoint(checkpoint_path)
+    stats = Stats()
+
+    # Parsing is bounded by the LLM gateway's semaphore; keep the worker count in step
+    if args.llm_concurrency:
+        os.environ["LLM_MAX_CONCURRENCY"] = str(args.llm_concurrency)
+        from app.services import llm_gateway
+        llm_gateway.LLM_MAX_CONCURRENCY = args.llm_concurrency
+
+    items = asyncio.Queue(maxsize=args.queue_size)
+    texts = asyncio.Queue(maxsize=args.queue_size)
+    profiles = asyncio.Queue(maxsize=args.queue_size)
+
+    extractors = [extract_stage(items, texts, stats) for _ in range(PDF_WORKERS * 2)]
+    parsers = [parse_stage(texts, profiles, stats, not args.no_ai) for _ in range(args.llm_concurrency or 8)]
+
+    async def produce():
+        for key, load in discover(args.source):
+            if key in done:
+                stats.skipped += 1
+                continue
+            await items.put((key, load))
+        await items.put(_DONE)
+
+    # The producer runs alongside the stages: if any of them fails (e.g. Mongo is
+    # unreachable), the rest would block forever on full queues, so all are cancelled
+    tasks = [
+        asyncio.create_task(produce()),
+        asyncio.create_task(run_stage_group(extractors, texts)),
+        asyncio.create_task(run_stage_group(parsers, profiles)),
+        asyncio.create_task(write_stage(profiles, stats, args.batch_size, checkpoint_path)),
+    ]
+    try:
+        done_tasks, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done_tasks:
+            task.result()  # re-raises the first failure
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        PDFPool.shutdown()
+    stats.report()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Directory of PDFs, or a .zip/.tar(.gz) archive")
+    parser.add_argument("--batch-size", type=int, default=200, help="Profiles per insert_many")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="Max concurrent Gemini calls")
+    parser.add_argument("--no-ai", action="store_true", help="Only use KeywordExtractor")
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <source>.ingest-checkpoint)")
+    asyncio.run(main(parser.parse_args()))
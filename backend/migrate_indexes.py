@@ -0,0 +1,92 @@
+"""
+One-off migration for databases created before the unique indexes were declared
+(users.email_unique, job_applications.user_job_unique). Run it once, before deploying
+or restarting the API, with the same MONGODB_URI / MONGODB_DB:
+
+  1. duplicate users (same email): the earliest account is kept; profiles, applications
+     and queued emails of the others are moved to it, then the others are deleted
+  2. duplicate applications (same user_id, job_id): the earliest is kept
+  3. the superseded non-unique users "email_1" index is dropped
+  4. the declared indexes are built
+
+Until it has run, the API starts without building its indexes (see app.database.init_db).
+
+    python migrate_indexes.py --dry-run
+    python migrate_indexes.py
+"""
+import argparse
+import asyncio
+
+from beanie import init_beanie
+from dotenv import load_dotenv
+
+from app.database import document_models, get_database
+
+load_dotenv()
+
+SUPERSEDED_INDEXES = {"users": ["email_1"]}
+
+
+async def duplicates(collection, key: dict, order: dict):
+    """Yields the _ids of each group of documents sharing `key`, earliest first."""
+    pipeline = [
+        {"$sort": order},
+        {"$group": {"_id": key, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    async for group in collection.aggregate(pipeline, allowDiskUse=True):
+        yield group["_id"], group["ids"]
+
+
+async def dedup_users(db, dry_run: bool) -> int:
+    removed = 0
+    async for email, ids in duplicates(db.users, "$email", {"created_at": 1, "_id": 1}):
+        keep, others = ids[0], ids[1:]
+        print(f"users: {email}: keeping {keep}, merging {len(others)} duplicate(s)")
+        if not dry_run:
+            for name in ("profiles", "job_applications", "email_outbox"):
+                await db[name].update_many({"user_id": {"$in": others}}, {"$set": {"user_id": keep}})
+            await db.users.delete_many({"_id": {"$in": others}})
+        removed += len(others)
+    return removed
+
+
+async def dedup_applications(db, dry_run: bool) -> int:
+    removed = 0
+    key = {"user_id": "$user_id", "job_id": "$job_id"}
+    async for group, ids in duplicates(db.job_applications, key, {"applied_at": 1, "_id": 1}):
+        print(f"job_applications: user {group.get('user_id')} job {group.get('job_id')!r}: "
+              f"keeping {ids[0]}, removing {len(ids) - 1}")
+        if not dry_run:
+            await db.job_applications.delete_many({"_id": {"$in": ids[1:]}})
+        removed += len(ids) - 1
+    return removed
+
+
+async def drop_superseded_indexes(db, dry_run: bool):
+    for name, indexes in SUPERSEDED_INDEXES.items():
+        existing = await db[name].index_information()
+        for index in indexes:
+            if index in existing:
+                print(f"{name}: dropping index {index}")
+                if not dry_run:
+                    await db[name].drop_index(index)
+
+
+async def main(args):
+    db = get_database()
+    # Users first: merging accounts can create new duplicate applications
+    users = await dedup_users(db, args.dry_run)
+    applications = await dedup_applications(db, args.dry_run)
+    await drop_superseded_indexes(db, args.dry_run)
+    if args.dry_run:
+        print(f"Dry run: would remove {users} users and {applications} applications")
+        return
+    await init_beanie(database=db, document_models=document_models())
+    print(f"Removed {users} duplicate users and {applications} duplicate applications; indexes built")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    asyncio.run(main(parser.parse_args()))
@@ -28,7 +28,7 @@ async def test_parsing():
     """
     
     try:
-        data = AIResumeParser.parse_resume(sample_resume)
+        data = await AIResumeParser.parse_resume(sample_resume)
         print("\n--- Parsing Result ---")
         print(data)
         
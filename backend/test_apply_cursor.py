@@ -0,0 +1,39 @@
+import base64
+from datetime import datetime
+
+import pytest
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+
+from app.models import ApplicationStatusView
+from app.routes.apply import decode_cursor, encode_cursor, job_id_values
+
+
+def test_cursor_round_trip():
+    application = ApplicationStatusView.model_construct(
+        id=PydanticObjectId(), job_id="42", status="Applied", applied_at=datetime(2024, 5, 1, 12, 30, 15, 250000)
+    )
+    assert decode_cursor(encode_cursor(application)) == (application.applied_at, application.id)
+
+
+@pytest.mark.parametrize("raw", [
+    "not a cursor",
+    "2024-05-01T12:30:15",                              # no id
+    "2024-05-01T12:30:15|not-an-object-id",
+    "yesterday|" + str(PydanticObjectId()),
+    "2024-05-01T12:30:15|" + str(PydanticObjectId()) + "|extra",
+])
+def test_malformed_cursor_is_a_400(raw):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(base64.urlsafe_b64encode(raw.encode()).decode())
+    assert error.value.status_code == 400
+
+
+def test_cursor_that_is_not_base64_is_a_400():
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("%%%")
+    assert error.value.status_code == 400
+
+
+def test_job_id_lookup_matches_int_and_string_ids():
+    assert job_id_values(["42", "abc-7"]) == ["42", 42, "abc-7"]
@@ -0,0 +1,82 @@
+import asyncio
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+import ingest_resumes
+from app.services.pdf_extractor import PDF_WORKERS
+
+
+@pytest.fixture
+def resumes():
+    # Distinct, incompressible payloads of uneven sizes, so interleaved reads would show
+    return {f"cohort/resume_{i:03d}.pdf": os.urandom(20000 + 997 * i) for i in range(60)}
+
+
+def write_tar(path, files, mode):
+    with tarfile.open(path, mode) as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+        info = tarfile.TarInfo("cohort/notes.txt")
+        info.size = 2
+        archive.addfile(info, io.BytesIO(b"hi"))
+
+
+def write_zip(path, files, mode=None):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+
+
+def extract_all(source, monkeypatch):
+    """Runs the extraction stage the way main() does and returns {key: bytes it received}."""
+    received = {}
+
+    async def fake_extract(data):
+        received_bytes = data if isinstance(data, bytes) else open(data, "rb").read()
+        return received_bytes.hex()
+
+    monkeypatch.setattr(ingest_resumes, "extract_pdf_text", fake_extract)
+
+    async def run():
+        items, texts = asyncio.Queue(maxsize=8), asyncio.Queue()
+        stats = ingest_resumes.Stats()
+        workers = [ingest_resumes.extract_stage(items, texts, stats) for _ in range(PDF_WORKERS * 2)]
+
+        async def produce():
+            for item in ingest_resumes.discover(source):
+                await items.put(item)
+            await items.put(ingest_resumes._DONE)
+
+        await asyncio.gather(produce(), *workers)
+        while not texts.empty():
+            key, text = texts.get_nowait()
+            received[key] = bytes.fromhex(text)
+        assert stats.failed == 0
+
+    asyncio.run(run())
+    return received
+
+
+@pytest.mark.parametrize("write, name, mode", [
+    (write_tar, "resumes.tar", "w"),
+    (write_tar, "resumes.tar.gz", "w:gz"),
+    (write_zip, "resumes.zip", None),
+])
+def test_archive_members_reach_extraction_intact(tmp_path, monkeypatch, resumes, write, name, mode):
+    source = str(tmp_path / name)
+    write(source, resumes, mode)
+    assert extract_all(source, monkeypatch) == resumes
+
+
+def test_directory_source(tmp_path, monkeypatch, resumes):
+    for name, data in resumes.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    assert extract_all(str(tmp_path), monkeypatch) == resumes
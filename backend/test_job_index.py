@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from app.services import job_index as job_index_module
+from app.services import job_source
+from app.services.job_index import JobIndex, JobIngestor
+
+
+def job(job_id, title="Python Developer", description="python fastapi docker"):
+    return {"id": job_id, "title": title, "company": "Acme", "location": "London",
+            "description": description, "category": "IT Jobs"}
+
+
+class CountingSource:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, query, location):
+        self.calls.append(query)
+        return [job(f"{query}-{i}") for i in range(3)]
+
+
+def test_refresh_is_capped_to_the_most_recent_hot_queries(monkeypatch):
+    monkeypatch.setattr(job_index_module, "JOB_INDEX_REFRESH_QUERIES", 5)
+    index = JobIndex(path=None)
+    for i in range(50):
+        index.record_query(f"query {i}", "in")
+    source = CountingSource()
+    ingestor = JobIngestor(index, {"test": source})
+
+    async def refresh():
+        await ingestor.refresh()
+        await ingestor.stop()
+
+    asyncio.run(refresh())
+    assert source.calls == [f"query {i}" for i in range(45, 50)]
+
+
+def test_one_process_owns_the_snapshot_and_the_others_reload_it(tmp_path):
+    path = str(tmp_path / "job_index.json")
+    owner_index, follower_index = JobIndex(path=path), JobIndex(path=path)
+    owner_source, follower_source = CountingSource(), CountingSource()
+    owner = JobIngestor(owner_index, {"test": owner_source})
+    follower = JobIngestor(follower_index, {"test": follower_source})
+    owner_index.record_query("python", "in")
+    follower_index.record_query("golang", "in")
+
+    async def run():
+        await owner.refresh()
+        await follower.refresh()
+        assert await follower_index.reload_async() == 0  # snapshot unchanged since
+        await follower.stop()
+        await owner.stop()
+
+    assert owner.owns_snapshot() and not follower.owns_snapshot()
+    asyncio.run(run())
+    assert owner_source.calls == ["python"] and follower_source.calls == []
+    assert sorted(follower_index.postings) == sorted(owner_index.postings)
+    assert len(follower_index.vectors) == len(owner_index.postings)
+    # Once the owner has stopped, the lock is free for another process
+    assert follower.owns_snapshot()
+    follower._release_snapshot()
+
+
+def test_reload_keeps_postings_seen_more_recently_here(tmp_path):
+    path = str(tmp_path / "job_index.json")
+    saved = JobIndex(path=path)
+    saved.upsert(job("1", title="Old title"), "test", seen_at=time.time() - 100)
+    saved.upsert(job("2"), "test")
+    saved.save()
+
+    index = JobIndex(path=path)
+    index.upsert(job("1", title="New title"), "test")
+    assert asyncio.run(index.reload_async()) == 1
+    assert index.postings["test:1"]["title"] == "New title"
+    assert "test:2" in index.postings and "test:2" in index.vectors
+
+
+def test_fresh_fetch_bypasses_stale_cache_entries(monkeypatch):
+    calls = []
+
+    async def fetch_page(query, location, page, results_per_page):
+        calls.append(page)
+        return [{"id": f"{query}-{page}-{len(calls)}"}]
+
+    monkeypatch.setattr(job_source, "fetch_adzuna_page", fetch_page)
+    monkeypatch.setattr(job_source, "job_search_cache", job_source.TTLCache(maxsize=16, ttl=0, stale_ttl=3600))
+
+    async def run():
+        await job_source.fetch_adzuna_jobs("python", pages=2)          # fills the cache
+        stale = await job_source.fetch_adzuna_jobs("python", pages=2)  # served stale (ttl=0)
+        fresh = await job_source.fetch_adzuna_jobs("python", pages=2, fresh=True)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(run())
+    assert [j["id"] for j in stale] == ["python-1-1", "python-2-2"]
+    assert {j["id"] for j in fresh}.isdisjoint(j["id"] for j in stale)
@@ -0,0 +1,67 @@
+import json
+
+from app.utils.json_stream import StreamingJSONParser
+
+ROADMAP = {
+    "required_skills": ["Python", "SQL"],
+    "missing_skills": ["SQL"],
+    "learning_roadmap": {
+        "SQL": [{"title": "SQL \"basics\", part {1}", "url": "https://example.com/sql?a=[1]"}],
+        "Docker": [],
+    },
+    "score": 0.5,
+    "done": True,
+}
+
+
+def feed_all(parser, text, size):
+    members = []
+    for start in range(0, len(text), size):
+        members.extend(parser.feed(text[start:start + size]))
+    return members
+
+
+def test_members_in_order_for_any_chunking():
+    text = "```json\n" + json.dumps(ROADMAP, indent=2) + "\n```"
+    expected = [
+        (("required_skills",), ["Python", "SQL"]),
+        (("missing_skills",), ["SQL"]),
+        (("learning_roadmap", "SQL"), ROADMAP["learning_roadmap"]["SQL"]),
+        (("learning_roadmap", "Docker"), []),
+        (("score",), 0.5),
+        (("done",), True),
+    ]
+    for size in (1, 2, 7, len(text)):
+        parser = StreamingJSONParser(expand={"learning_roadmap"})
+        assert feed_all(parser, text, size) == expected
+        assert parser.done
+
+
+def test_member_is_emitted_as_soon_as_it_closes():
+    parser = StreamingJSONParser()
+    assert parser.feed('{"a": [1, 2') == []
+    assert parser.feed("]") == [(("a",), [1, 2])]
+    assert parser.feed(', "b": "x') == []
+    assert parser.feed('"') == [(("b",), "x")]
+    assert not parser.done
+
+
+def test_trailing_scalar_and_escapes():
+    parser = StreamingJSONParser()
+    members = parser.feed('{"quote": "a \\" } b", "n": 12}')
+    assert members == [(("quote",), 'a " } b'), (("n",), 12)]
+    assert parser.done
+
+
+def test_incomplete_stream_is_not_done():
+    parser = StreamingJSONParser(expand={"learning_roadmap"})
+    members = parser.feed('{"required_skills": ["Go"], "learning_roadmap": {"Go": [')
+    assert members == [(("required_skills",), ["Go"])]
+    assert not parser.done
+
+
+def test_text_after_the_object_is_ignored():
+    parser = StreamingJSONParser()
+    assert parser.feed('{"a": 1} {"b": 2}') == [(("a",), 1)]
+    assert parser.done
+    assert parser.feed('{"c": 3}') == []
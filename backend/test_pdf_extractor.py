@@ -0,0 +1,109 @@
+import asyncio
+import signal
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, File, UploadFile
+
+from app.services import pdf_extractor
+from app.services.pdf_extractor import PDFExtractionError, PDFPool, extract_pdf_text
+from app.utils.body_limit import BodySizeLimitMiddleware
+
+LIMIT = 64 * 1024
+
+
+def upload_app():
+    app = FastAPI()
+    app.state.handled = 0
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        app.state.handled += 1
+        return {"size": len(await file.read())}
+
+    app.add_middleware(BodySizeLimitMiddleware, limits={"/upload": LIMIT})
+    return app
+
+
+def post(app, **kwargs):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/upload", **kwargs)
+    return asyncio.run(run())
+
+
+def multipart(size):
+    boundary = "limit-test"
+    head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.pdf\"\r\n"
+            f"Content-Type: application/pdf\r\n\r\n").encode()
+    return head + b"x" * size + f"\r\n--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
+
+
+def test_body_under_the_limit_reaches_the_route():
+    app = upload_app()
+    response = post(app, files={"file": ("a.pdf", b"x" * 1000, "application/pdf")})
+    assert response.status_code == 200 and response.json() == {"size": 1000}
+
+
+def test_declared_oversized_body_is_refused_unread():
+    app = upload_app()
+    response = post(app, files={"file": ("a.pdf", b"x" * (LIMIT * 2), "application/pdf")})
+    assert response.status_code == 413 and app.state.handled == 0
+
+
+def test_streamed_oversized_body_is_cut_off():
+    app = upload_app()
+    body, content_type = multipart(LIMIT * 4)
+    sent = 0
+
+    async def chunks():
+        nonlocal sent
+        for start in range(0, len(body), 8192):
+            sent += 8192
+            yield body[start:start + 8192]
+
+    # No Content-Length: only the bytes actually received can be counted
+    response = post(app, content=chunks(), headers={"content-type": content_type})
+    assert response.status_code == 413 and app.state.handled == 0
+    assert sent < len(body) / 2
+
+
+# Replace the worker function; pickled by reference, so spawned workers import this module
+def fake_extract_small(source, max_pages, parallel_min_pages):
+    if source == b"stuck":
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})  # like a parser stuck in C code
+        time.sleep(60)
+    time.sleep(4)  # still running when the stuck request gives up
+    return source.decode(), 1
+
+
+@pytest.mark.skipif(not hasattr(signal, "pthread_sigmask"), reason="needs POSIX signals")
+def test_stuck_worker_does_not_fail_other_extractions(monkeypatch):
+    monkeypatch.setattr(pdf_extractor, "_extract_small", fake_extract_small)
+    monkeypatch.setattr(pdf_extractor, "PDF_WORKERS", 2)
+    monkeypatch.setattr(pdf_extractor, "PDF_TIMEOUT_GRACE", 0.5)
+    PDFPool.shutdown()
+    PDFPool.warm_up()
+    executor = PDFPool.get_executor()
+    processes = list(executor._processes.values())
+
+    async def run():
+        return await asyncio.gather(
+            extract_pdf_text(b"stuck", timeout=2),
+            extract_pdf_text(b"other user's resume", timeout=15),
+            return_exceptions=True,
+        )
+
+    try:
+        stuck, other = asyncio.run(run())
+        assert isinstance(stuck, PDFExtractionError) and "timed out" in str(stuck)
+        assert other == "other user's resume"
+        assert PDFPool.get_executor() is not executor
+        for _ in range(50):  # the old pool's workers are killed once its other work is done
+            if not any(process.is_alive() for process in processes):
+                break
+            time.sleep(0.1)
+        assert not any(process.is_alive() for process in processes)
+    finally:
+        PDFPool.shutdown()
@@ -0,0 +1,134 @@
+"""
+Query-plan regression check: runs the routes' MongoDB query shapes through explain()
+against a real mongod (MONGODB_TEST_URI, default mongodb://localhost:27017) and fails if
+any of them is not served by an index. Skipped when no mongod is reachable.
+
+The filters come from the same helpers and Beanie expressions the routes use, so the
+check follows the code.
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+MONGO_URI = os.getenv("MONGODB_TEST_URI", "mongodb://localhost:27017")
+TEST_DB = "career_agent_query_plans"
+USERS = 300
+
+
+def plan_stages(plan: dict):
+    """Yields every stage name in an explain() winning plan tree."""
+    if not isinstance(plan, dict):
+        return
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from plan_stages(child)
+
+
+def route_queries(user, profile, job_ids, cursor):
+    """label -> (model, filter, sort) for each hot query shape in the routes."""
+    from beanie.operators import In
+    from app.models import JobApplication, OutboxEmail, Profile, User
+    from app.routes.apply import status_query
+    from app.services.email_service import CLAIM_SORT, claimable_filter
+
+    def shape(query):
+        return query.get_filter_query(), [(field, int(direction)) for field, direction in query.sort_expressions]
+
+    return {
+        "auth: user by email": (User, User.find(User.email == user.email).get_filter_query(), None),
+        "profile: by user_id": (Profile, Profile.find(Profile.user_id == user.id).get_filter_query(), None),
+        "jobs: profile by _id": (Profile, {"_id": profile.id}, None),
+        "apply: existing $in": (JobApplication, JobApplication.find(
+            JobApplication.user_id == user.id, In(JobApplication.job_id, job_ids)
+        ).get_filter_query(), None),
+        "apply/email: by user+job": (JobApplication, JobApplication.find(
+            JobApplication.user_id == user.id, JobApplication.job_id == job_ids[0]
+        ).get_filter_query(), None),
+        "apply/status: first page": (JobApplication, *shape(status_query(user.id))),
+        "apply/status: keyset page": (JobApplication, *shape(status_query(user.id, cursor))),
+        "apply/status: by job ids": (JobApplication, *shape(status_query(user.id, job_ids=job_ids))),
+        "outbox: claim batch": (OutboxEmail, claimable_filter(datetime.utcnow()), CLAIM_SORT),
+    }
+
+
+async def seed():
+    from app.models import JobApplication, OutboxEmail, Profile, User
+    from app.routes.apply import encode_cursor, status_query
+
+    await User.insert_many([User(email=f"user{i}@example.com", password_hash="x") for i in range(USERS)])
+    users = await User.find_all().to_list()
+    await Profile.insert_many([Profile(user_id=u.id, name=f"User {i}") for i, u in enumerate(users)])
+    start = datetime(2024, 1, 1)
+    await JobApplication.insert_many([
+        JobApplication(user_id=users[i % USERS].id, job_id=f"job-{i}", applied_at=start + timedelta(minutes=i))
+        for i in range(USERS * 10)
+    ])
+    now = datetime.utcnow()
+    await OutboxEmail.insert_many([
+        OutboxEmail(to=f"hr{i}@example.com", subject="s", body="b", status=status,
+                    next_attempt_at=now - timedelta(seconds=i % 600),
+                    claimed_at=now - timedelta(seconds=i % 600) if status == "sending" else None)
+        for i, status in enumerate(["sent"] * 800 + ["queued"] * 150 + ["sending"] * 30 + ["failed"] * 20)
+    ])
+
+    target = users[USERS // 2]
+    profile = await Profile.find_one(Profile.user_id == target.id)
+    page = await status_query(target.id).limit(5).to_list()
+    job_ids = [f"job-{USERS // 2}", f"job-{USERS // 2 + USERS}"]
+    return target, profile, job_ids, encode_cursor(page[-1])
+
+
+async def explain_all():
+    from beanie import init_beanie
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from app.database import document_models
+
+    client = AsyncIOMotorClient(MONGO_URI)
+    await client.drop_database(TEST_DB)
+    try:
+        await init_beanie(database=client[TEST_DB], document_models=document_models())
+        plans = {}
+        for label, (model, query, sort) in route_queries(*await seed()).items():
+            cursor = model.get_pymongo_collection().find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            explain = await cursor.explain()
+            plans[label] = list(plan_stages(explain["queryPlanner"]["winningPlan"]))
+        return plans
+    finally:
+        await client.drop_database(TEST_DB)
+        client.close()
+
+
+@pytest.fixture(scope="module")
+def plans():
+    try:
+        MongoClient(MONGO_URI, serverSelectionTimeoutMS=1000).admin.command("ping")
+    except PyMongoError:
+        pytest.skip(f"no mongod reachable at {MONGO_URI}")
+    return asyncio.run(explain_all())
+
+
+@pytest.mark.parametrize("label", [
+    "auth: user by email",
+    "profile: by user_id",
+    "jobs: profile by _id",
+    "apply: existing $in",
+    "apply/email: by user+job",
+    "apply/status: first page",
+    "apply/status: keyset page",
+    "apply/status: by job ids",
+    "outbox: claim batch",
+])
+def test_query_is_served_by_an_index(plans, label):
+    stages = plans[label]
+    assert "COLLSCAN" not in stages, f"{label}: {' <- '.join(stages)}"
+    assert "IXSCAN" in stages or "IDHACK" in stages or "EXPRESS_IXSCAN" in stages, f"{label}: {' <- '.join(stages)}"
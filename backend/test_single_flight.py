@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def load(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return {"value": value}
+
+    async def main():
+        results = await asyncio.gather(*(flight.do("key", lambda: load(1)) for _ in range(5)),
+                                       flight.do("other", lambda: load(2)))
+        assert len(flight) == 0
+        # Nothing is cached: the next call runs again
+        assert await flight.do("key", lambda: load(3)) == {"value": 3}
+        return results
+
+    results = asyncio.run(main())
+    assert calls == [1, 2, 3]
+    assert results == [{"value": 1}] * 5 + [{"value": 2}]
+
+
+def test_failure_is_shared_and_not_kept():
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("model unavailable")
+
+    async def main():
+        results = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+        assert calls == 1
+        assert all(isinstance(error, ValueError) for error in results)
+        with pytest.raises(ValueError):
+            await flight.do("key", fail)
+        assert calls == 2 and len(flight) == 0
+
+    asyncio.run(main())
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight("test")
+
+    async def load():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        first = asyncio.create_task(flight.do("key", load))
+        second = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(main())
+
+
+def test_call_finishes_after_every_caller_is_cancelled():
+    flight = SingleFlight("test")
+    finished = []
+
+    async def load():
+        await asyncio.sleep(0.02)
+        finished.append(True)
+        raise ValueError("nobody is waiting")
+
+    async def main():
+        caller = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0.005)
+        caller.cancel()
+        await asyncio.sleep(0.05)
+        assert finished == [True] and len(flight) == 0
+        # The next caller starts a fresh call rather than getting the abandoned one
+        with pytest.raises(ValueError):
+            await flight.do("key", load)
+        assert finished == [True, True]
+
+    asyncio.run(main())
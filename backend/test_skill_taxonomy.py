@@ -0,0 +1,75 @@
+import numpy as np
+
+from app.utils import skill_taxonomy
+from app.utils.skill_taxonomy import VECTORIZE_MIN, SkillScope, SkillTaxonomy, missing_mask
+
+SKILLS = {
+    "JavaScript": ["js", "ECMAScript"],
+    "Kubernetes": ["k8s"],
+    "Go": ["golang"],
+    "Rust": [],
+    "Node.js": ["node", "nodejs"],
+}
+
+
+def test_aliases_resolve_to_the_canonical_id():
+    taxonomy = SkillTaxonomy(SKILLS)
+    assert taxonomy.lookup("k8s") == taxonomy.lookup("Kubernetes") >= 0
+    assert taxonomy.canonical("  ECMAScript ") == "javascript"
+    assert taxonomy.canonical("Haskell") == "haskell"
+    assert taxonomy.lookup("haskell") == -1
+    assert taxonomy.spellings(taxonomy.lookup("node")) == ["node.js", "node", "nodejs"]
+    assert taxonomy.names(taxonomy.ids(["JS", "javascript", "golang", "", "haskell"]).tolist()) == ["javascript", "go"]
+
+
+def test_small_and_vectorized_paths_agree():
+    taxonomy = SkillTaxonomy(SKILLS)
+    skills = ["js", "K8S", "rust", "", "unknown", "Node"] * VECTORIZE_MIN
+    small = [int(taxonomy.id_array([skill])[0]) for skill in skills]
+    assert taxonomy.id_array(skills).tolist() == small
+
+
+def test_hash_clash_is_resolved_by_spelling(monkeypatch):
+    # Force "go", "rust" and the unknown "cobol" onto one 64-bit hash
+    clashing = {"go", "rust", "cobol"}
+    monkeypatch.setattr(skill_taxonomy, "hash", lambda key: 7 if key in clashing else hash(key), raising=False)
+    taxonomy = SkillTaxonomy(SKILLS)
+    go, rust = taxonomy.lookup("go"), taxonomy.lookup("Rust")
+    assert go != rust and taxonomy.names([go, rust]) == ["go", "rust"]
+    assert taxonomy.lookup("golang") == go
+    for skills in (["go", "rust"], ["go", "rust"] * VECTORIZE_MIN):
+        assert taxonomy.id_array(skills).tolist()[:2] == [go, rust]
+    # An unknown spelling with the same hash must not be mistaken for either
+    assert taxonomy.lookup("cobol") == -1
+    assert taxonomy.id_array(["cobol"] * VECTORIZE_MIN).tolist() == [-1] * VECTORIZE_MIN
+    assert SkillScope(taxonomy).id_array(["cobol"] * VECTORIZE_MIN).tolist() == [taxonomy.static_size] * VECTORIZE_MIN
+
+
+def test_hash_hit_is_confirmed_against_the_spelling(monkeypatch):
+    # An unknown spelling sharing the hash of exactly one known spelling
+    monkeypatch.setattr(skill_taxonomy, "hash", lambda key: hash("k8s") if key == "haskell" else hash(key),
+                        raising=False)
+    taxonomy = SkillTaxonomy(SKILLS)
+    assert taxonomy.lookup("haskell") == -1 and taxonomy.lookup("k8s") >= 0
+    assert taxonomy.id_array(["haskell", "k8s"] * VECTORIZE_MIN).tolist()[:2] == [-1, taxonomy.lookup("k8s")]
+
+
+def test_scope_ids_are_local_and_do_not_grow_the_taxonomy():
+    taxonomy = SkillTaxonomy(SKILLS)
+    scope = SkillScope(taxonomy)
+    ids = scope.id_array(["Haskell", "js", "haskell ", "", "Elm"])
+    haskell, elm = ids[0], ids[4]
+    assert ids[1] == taxonomy.lookup("js") and ids[2] == haskell and ids[3] == -1
+    assert haskell >= taxonomy.static_size and elm == haskell + 1
+    assert not scope.is_static(haskell) and scope.names([haskell, elm]) == ["haskell", "elm"]
+    assert len(taxonomy) == len(SKILLS) and taxonomy.lookup("haskell") == -1
+    # Another scope numbers its unknown skills independently
+    assert SkillScope(taxonomy).id_array(["Elm"])[0] == haskell
+
+
+def test_missing_mask_treats_unknown_as_missing():
+    for size in (3, VECTORIZE_MIN * 2):
+        required = np.arange(-1, size - 1, dtype=np.int32)
+        have = np.array([0, 2], dtype=np.int32)
+        expected = [skill_id < 0 or skill_id not in (0, 2) for skill_id in required.tolist()]
+        assert missing_mask(required, have).tolist() == expected
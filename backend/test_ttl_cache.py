@@ -0,0 +1,45 @@
+import asyncio
+
+from app.utils.ttl_cache import TTLCache
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache(maxsize=16, ttl=60)
+    calls = []
+
+    async def load(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def main():
+        results = await asyncio.gather(*(cache.get_or_load("key", lambda: load(1)) for _ in range(10)),
+                                       cache.get_or_load("other", lambda: load(2)))
+        # Now cached: no further load
+        assert await cache.get_or_load("key", lambda: load(3)) == 1
+        return results
+
+    results = asyncio.run(main())
+    assert calls == [1, 2]
+    assert results == [1] * 10 + [2]
+    assert cache.stats()["misses"] == 11 and cache.stats()["hits"] == 1
+
+
+def test_failed_load_is_shared_and_not_cached():
+    cache = TTLCache(maxsize=16, ttl=60)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def main():
+        results = await asyncio.gather(*(cache.get_or_load("key", failing) for _ in range(3)),
+                                       return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert "key" not in cache
+        return await cache.get_or_load("key", lambda: asyncio.sleep(0, result="ok"))
+
+    assert asyncio.run(main()) == "ok"
+    assert calls == [1]
@@ -0,0 +1,79 @@
+import asyncio
+
+import numpy as np
+
+from app.services.job_index import JobIndex, embedding_text
+from app.utils.vector_index import VectorIndex
+
+
+def unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_search_is_exact_and_best_first():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = VectorIndex(8, capacity=4)  # grows while adding
+    index.add([str(i) for i in range(50)], vectors)
+    queries = vectors[:3]
+    for query, results in zip(queries, index.search(queries, 5)):
+        expected = np.argsort(-(vectors @ query), kind="stable")[:5]
+        assert [key for key, _ in results] == [str(i) for i in expected]
+        assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+    assert len(index.search(queries[0], 500)[0]) == 50
+
+
+def test_removed_rows_are_recycled_and_never_returned():
+    index = VectorIndex(2, capacity=2)
+    index.add(["a", "b", "c"], np.stack([unit(1, 0), unit(0, 1), unit(1, 1)]))
+    index.remove("a")
+    index.remove("missing")
+    assert "a" not in index and len(index) == 2
+    assert [key for key, _ in index.search(unit(1, 0), 3)[0]] == ["c", "b"]
+
+    index.add(["d"], unit(1, 0)[None])
+    assert len(index._keys) == 3  # took the freed row instead of a new one
+    assert [key for key, _ in index.search(unit(1, 0), 1)[0]] == ["d"]
+    assert np.allclose(index.vectors_for(["d", "a"]), [unit(1, 0), [0, 0]])
+
+
+def test_re_adding_a_key_replaces_its_vector_and_group():
+    index = VectorIndex(2)
+    index.add(["a"], unit(1, 0)[None], [0])
+    index.add(["a"], unit(0, 1)[None], [3])
+    assert len(index) == 1
+    assert index.search(unit(0, 1), 1, group=3)[0][0][0] == "a"
+    assert index.search(unit(0, 1), 1, group=0) == [[]]
+
+
+def test_group_filter():
+    index = VectorIndex(2)
+    index.add(["x0", "y1", "z1", "w2"], np.stack([unit(1, 0), unit(1, 0.1), unit(0, 1), unit(1, 0)]), [0, 1, 1, 2])
+    assert [key for key, _ in index.search(unit(1, 0), 10, group=1)[0]] == ["y1", "z1"]
+    assert index.search(unit(1, 0), 10, group=7) == [[]]
+    index.remove("w2")
+    assert index.search(unit(1, 0), 10, group=2) == [[]]
+    assert VectorIndex(2).search(unit(1, 0), 3) == [[]]
+
+
+def job(job_id, title, description, location="London"):
+    return {"id": job_id, "title": title, "company": "Acme", "location": location,
+            "description": description, "category": "IT Jobs"}
+
+
+def test_refit_keeps_postings_changed_while_it_ran():
+    index = JobIndex(path=None)
+    index.upsert_many([job(str(i), f"Engineer {i}", "python sql docker") for i in range(50)])
+
+    async def refit_with_concurrent_upsert():
+        refit = asyncio.create_task(index.refit_embeddings_async())
+        await asyncio.sleep(0)  # the snapshot is taken, vectors are being built in a thread
+        index.upsert(job("0", "Underwater Basket Weaver", "weaving reeds underwater"))
+        await refit
+
+    asyncio.run(refit_with_concurrent_upsert())
+    (posting_id,) = [pid for pid, posting in index.postings.items() if posting["title"].startswith("Underwater")]
+    fresh = index.embedder.embed([embedding_text(index.postings[posting_id])])[0]
+    assert np.allclose(index.vectors.vectors_for([posting_id])[0], fresh)
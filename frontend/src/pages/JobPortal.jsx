@@ -2,19 +2,20 @@ import React, { useState, useEffect } from "react";
 import { useAuth } from "../context/AuthContext";
 import { API_ENDPOINTS } from '../config';
 
+// Job ids per /apply/status lookup
+const STATUS_LOOKUP_SIZE = 100;
+
 export default function JobPortal() {
     const { token } = useAuth();
     const [profileId, setProfileId] = useState(null);
     const [jobs, setJobs] = useState([]);
     const [selectedJobs, setSelectedJobs] = useState([]);
     const [appliedJobs, setAppliedJobs] = useState([]);
-    const [appliedJobsHistory, setAppliedJobsHistory] = useState([]);
     const [loading, setLoading] = useState(false);
 
     useEffect(() => {
         if (token) {
             loadUserProfileAndJobs();
-            loadAppliedJobs();
         }
     }, [token]);
 
@@ -48,7 +49,10 @@ export default function JobPortal() {
             });
             if (jobsRes.ok) {
                 const jobsData = await jobsRes.json();
-                if (Array.isArray(jobsData)) setJobs(jobsData);
+                if (Array.isArray(jobsData)) {
+                    setJobs(jobsData);
+                    loadAppliedJobs(jobsData.map(j => j.id));
+                }
             }
         } catch (e) {
             console.error("Error fetching jobs:", e);
@@ -65,18 +69,23 @@ export default function JobPortal() {
         }
     };
 
-    const loadAppliedJobs = async () => {
+    const loadAppliedJobs = async (jobIds = jobs.map(j => j.id)) => {
+        // Only the status of the jobs on screen is needed: look those up by id rather than
+        // paging through the whole application history
         try {
-            const response = await fetch(API_ENDPOINTS.APPLY_STATUS, {
-                headers: { "Authorization": `Bearer ${token}` }
-            });
-            const data = await response.json();
-            setAppliedJobsHistory(data.applications || []);
+            for (let i = 0; i < jobIds.length; i += STATUS_LOOKUP_SIZE) {
+                const params = new URLSearchParams({ limit: STATUS_LOOKUP_SIZE });
+                jobIds.slice(i, i + STATUS_LOOKUP_SIZE).forEach(id => params.append("job_ids", id));
+                const response = await fetch(`${API_ENDPOINTS.APPLY_STATUS}?${params}`, {
+                    headers: { "Authorization": `Bearer ${token}` }
+                });
+                const data = await response.json();
 
-            // Update local state for applied jobs based on history
-            if (data.applications) {
-                const historyIds = data.applications.map(app => app.job_id);
-                setAppliedJobs(prev => [...new Set([...prev, ...historyIds])]);
+                // Update local state for applied jobs based on history
+                if (data.applications) {
+                    const historyIds = data.applications.map(app => app.job_id);
+                    setAppliedJobs(prev => [...new Set([...prev, ...historyIds])]);
+                }
             }
         } catch (error) {
             console.error("Error loading applied jobs:", error);
@@ -208,7 +217,7 @@ export default function JobPortal() {
             const data = await response.json();
 
             if (data.success) {
-                alert("Application email sent successfully!");
+                alert("Application email queued for sending!");
                 setAppliedJobs((prev) => [...prev, job.id]);
                 loadAppliedJobs();
             } else {